@@ -7,9 +7,17 @@
 #SBATCH -p batch_ugrad
 #SBATCH -w aurora-g1
 #SBATCH -t 1-0
-#SBATCH -o logs/kirby-batch-infer-%A.out
+#SBATCH -o logs/kirby-batch-infer-%A_%a.out
 
+source /data/msj9518/repos/vcstream/run/timing.sh
+start_timing batch_infer
+
+# 작업 디렉토리 (separate.sh 참고)
+WORKSPACE="${VCSTREAM_WORKSPACE:-/data/msj9518/repos/vcstream/rvc}"
 SINGER_NAME="$1"
+# --combine: 추론이 끝나면 같은 작업 안에서 반주와 결합 (결합용 작업을 따로 기다리지 않음)
+COMBINE="$2"
+COMBINE_PY="/data/msj9518/repos/vcstream/run/combine.py"
 MODEL_DIR="/data/msj9518/repos/vcstream/rvc/models/${SINGER_NAME}"
 PTH_PATH="$MODEL_DIR/${SINGER_NAME}_best.pth"
 INDEX_PATH="$MODEL_DIR/${SINGER_NAME}.index"
@@ -18,9 +26,30 @@ if [ ! -f "$PTH_PATH" ]; then
   echo "[ERROR] Model file not found: $PTH_PATH"
   exit 1
 fi
+mkdir -p "$WORKSPACE/output"
+
+# job array로 제출된 경우 (곡 단위 파이프라인) tracks.txt의 해당 곡만 추론
+if [ -n "$SLURM_ARRAY_TASK_ID" ]; then
+  TRACK=$(sed -n "$((SLURM_ARRAY_TASK_ID + 1))p" "$WORKSPACE/input/tracks.txt")
+  python /data/msj9518/repos/rvc-cli/rvc_cli.py infer \
+  --input_path "$WORKSPACE/hidden/vocal/${TRACK}_vocal.wav" \
+  --output_path "$WORKSPACE/output/${TRACK}_vocal_output.wav" \
+  --pth_path "$PTH_PATH" \
+  --index_path "$INDEX_PATH" || exit $?
+  if [ "$COMBINE" = "--combine" ]; then
+    next_timing combine
+    python "$COMBINE_PY" "$SINGER_NAME" --only "$TRACK"
+  fi
+  exit $?
+fi
 
 python /data/msj9518/repos/rvc-cli/rvc_cli.py batch_infer \
---input_folder "/data/msj9518/repos/vcstream/rvc/hidden/vocal" \
---output_folder "/data/msj9518/repos/vcstream/rvc/output" \
+--input_folder "$WORKSPACE/hidden/vocal" \
+--output_folder "$WORKSPACE/output" \
 --pth_path "$PTH_PATH" \
---index_path "$INDEX_PATH" \
+--index_path "$INDEX_PATH" || exit $?
+
+if [ "$COMBINE" = "--combine" ]; then
+  next_timing combine
+  python "$COMBINE_PY" "$SINGER_NAME"
+fi
@@ -1,15 +1,29 @@
 #!/usr/bin/bash
 
+# 파일 삭제만 하므로 보통은 서버가 Slurm 없이 셸에서 바로 실행 (pipeline_service.run_cleanup)
 #SBATCH -J VC_cleanup
-#SBATCH --gres=gpu:1
-#SBATCH --cpus-per-gpu=8
-#SBATCH --mem-per-gpu=29G
-#SBATCH -p batch_ugrad
-#SBATCH -w aurora-g1
-#SBATCH -t 1-0
-
-rm -rf /data/msj9518/repos/vcstream/rvc/input/*
-rm -rf /data/msj9518/repos/vcstream/rvc/output/*
-rm -rf /data/msj9518/repos/vcstream/rvc/combined/*
-rm -rf /data/msj9518/repos/vcstream/rvc/hidden/inst/*
-rm -rf /data/msj9518/repos/vcstream/rvc/hidden/vocal/*
+#SBATCH --cpus-per-task=1
+#SBATCH --mem=1G
+#SBATCH -t 0-1
+
+RVC_DIR="/data/msj9518/repos/vcstream/rvc"
+
+# 변환 작업별 작업 디렉토리(rvc/runs/<작업 ID>)가 지정되면 그 디렉토리만 삭제
+# (동시에 진행 중인 다른 변환 작업의 디렉토리는 유지)
+if [ -n "$VCSTREAM_WORKSPACE" ]; then
+  case "$VCSTREAM_WORKSPACE" in
+    *..*) ;;
+    "$RVC_DIR"/runs/?*)
+      rm -rf "$VCSTREAM_WORKSPACE"
+      exit 0
+      ;;
+  esac
+  echo "[ERROR] Not a run workspace: $VCSTREAM_WORKSPACE"
+  exit 1
+fi
+
+rm -rf "$RVC_DIR"/input/*
+rm -rf "$RVC_DIR"/output/*
+rm -rf "$RVC_DIR"/combined/*
+rm -rf "$RVC_DIR"/hidden/inst/*
+rm -rf "$RVC_DIR"/hidden/vocal/*
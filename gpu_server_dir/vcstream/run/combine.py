@@ -1,45 +1,414 @@
 import os
 import sys
-from pydub import AudioSegment
+import struct
+import time
+import wave
+import tempfile
+from multiprocessing import Pool
+import numpy as np
+from segment import load_segments
 
-if len(sys.argv) < 2:
-    print("[ERROR] Usage: python combine.py <singer_name>")
-    exit(1)
+# 한 번에 읽고 섞는 프레임 수 (메모리 사용량은 이 값에만 비례)
+BLOCK_FRAMES = int(os.environ.get("COMBINE_BLOCK_FRAMES", 65536))
 
-singer_name = sys.argv[1]
 
-inst_dir = "/data/msj9518/repos/vcstream/rvc/hidden/inst"
-vocal_dir = "/data/msj9518/repos/vcstream/rvc/output"
-output_dir = "/data/msj9518/repos/vcstream/rvc/combined"
-os.makedirs(output_dir, exist_ok=True)
+class WavReader:
+    """
+    WAV 파일의 PCM 데이터를 메모리 맵으로 열어 블록 단위로 float32로 읽음
+    (PCM 16/24/32bit, float32/64, WAVE_FORMAT_EXTENSIBLE 지원)
+    """
 
-inst_files = [f for f in os.listdir(inst_dir) if f.endswith("_inst.wav")]
-inst_prefixes = {f.replace("_inst.wav", "") for f in inst_files}
+    def __init__(self, path):
+        self.path = path
+        fmt, data_offset, data_size = self._parse_chunks(path)
+        format_tag, self.channels, self.sample_rate, _, block_align, bits = fmt
+        self.sample_width = bits // 8
+        self.frames = data_size // block_align
+        if format_tag == 3:
+            dtype = {4: "<f4", 8: "<f8"}[self.sample_width]
+        elif self.sample_width == 3:
+            dtype = "u1"  # 24bit는 바이트 단위로 읽어서 변환
+        else:
+            dtype = {1: "u1", 2: "<i2", 4: "<i4"}[self.sample_width]
+        self.is_float = format_tag == 3
+        width = 3 if self.sample_width == 3 else 1
+        shape = (self.frames, self.channels * width)
+        if self.frames == 0:
+            self._data = np.zeros(shape, dtype=dtype)
+        else:
+            self._data = np.memmap(
+                path, dtype=dtype, mode="r", offset=data_offset, shape=shape
+            )
 
-vocal_files = [f for f in os.listdir(vocal_dir) if f.endswith("_vocal_output.wav")]
-vocal_prefixes = {f.replace("_vocal_output.wav", "") for f in vocal_files}
+    @staticmethod
+    def _parse_chunks(path):
+        with open(path, "rb") as f:
+            riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave_id != b"WAVE":
+                raise ValueError(f"WAV 파일이 아닙니다: {path}")
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    raise ValueError(f"data chunk가 없습니다: {path}")
+                chunk_id, chunk_size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    body = f.read(chunk_size)
+                    fmt = list(struct.unpack("<HHIIHH", body[:16]))
+                    if fmt[0] == 0xFFFE and len(body) >= 26:
+                        # WAVE_FORMAT_EXTENSIBLE: SubFormat GUID의 앞 2바이트가 실제 포맷
+                        fmt[0] = struct.unpack("<H", body[24:26])[0]
+                    if chunk_size % 2:
+                        f.read(1)
+                elif chunk_id == b"data":
+                    if fmt is None:
+                        raise ValueError(f"fmt chunk가 data보다 뒤에 있습니다: {path}")
+                    data_offset = f.tell()
+                    file_size = os.fstat(f.fileno()).st_size
+                    # 스트리밍으로 기록된 WAV는 크기 필드가 비어 있을 수 있음
+                    data_size = min(chunk_size, file_size - data_offset)
+                    return fmt, data_offset, data_size
+                else:
+                    f.seek(chunk_size + (chunk_size % 2), 1)
 
-common_prefixes = inst_prefixes & vocal_prefixes
+    def read(self, start, stop):
+        """
+        [start, stop) 프레임을 (frames, channels) float32 배열(-1.0 ~ 1.0)로 반환
+        """
+        start = max(start, 0)
+        stop = min(stop, self.frames)
+        if stop <= start:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        block = np.asarray(self._data[start:stop])
+        if self.is_float:
+            return block.astype(np.float32)
+        if self.sample_width == 3:
+            raw = block.reshape(-1, self.channels, 3).astype(np.int32)
+            ints = raw[..., 0] | (raw[..., 1] << 8) | (raw[..., 2] << 16)
+            ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+            return (ints / float(1 << 23)).astype(np.float32)
+        if self.sample_width == 1:
+            return ((block.astype(np.float32) - 128.0) / 128.0).astype(np.float32)
+        scale = float(1 << (8 * self.sample_width - 1))
+        return (block / scale).astype(np.float32)
 
-for prefix in common_prefixes:
-    inst_path = os.path.join(inst_dir, f"{prefix}_inst.wav")
-    vocal_path = os.path.join(vocal_dir, f"{prefix}_vocal_output.wav")
-    out_path = os.path.join(output_dir, f"{singer_name}_{prefix}.wav")
 
+def read_resampled(reader, start, count, target_rate, target_channels):
+    """
+    reader를 target_rate/target_channels 기준의 [start, start+count) 프레임으로 변환해 반환
+    (샘플레이트가 다르면 선형 보간, 채널 수가 다르면 모노↔스테레오 변환)
+    """
+    if reader.sample_rate == target_rate:
+        block = reader.read(start, start + count)
+    else:
+        ratio = reader.sample_rate / target_rate
+        positions = (np.arange(start, start + count) * ratio).astype(np.float64)
+        first = int(np.floor(positions[0])) if count else 0
+        last = int(np.floor(positions[-1])) + 2 if count else 0
+        source = reader.read(first, last)
+        valid = positions < reader.frames
+        positions = positions[valid]
+        block = np.empty((len(positions), reader.channels), dtype=np.float32)
+        if len(source):
+            src_index = np.arange(first, first + len(source))
+            for ch in range(reader.channels):
+                block[:, ch] = np.interp(positions, src_index, source[:, ch])
+    if len(block) < count:
+        block = np.concatenate(
+            [block, np.zeros((count - len(block), block.shape[1]), dtype=np.float32)]
+        )
+    if block.shape[1] == target_channels:
+        return block
+    if block.shape[1] == 1:
+        return np.repeat(block, target_channels, axis=1)
+    mono = block.mean(axis=1, keepdims=True)
+    return np.repeat(mono, target_channels, axis=1)
+
+
+def mix_to_wav(inst_path, vocal_path, out_path, block_frames=BLOCK_FRAMES):
+    """
+    반주와 보컬을 블록 단위로 읽어 더한 뒤 16bit WAV로 바로 기록
+    - 출력 길이/샘플레이트는 반주 기준 (pydub overlay와 동일)
+    - 합이 범위를 넘는 샘플은 잘라서(clip) 정수 오버플로를 막음
+    :return: 잘린 샘플 수
+    """
+    inst = WavReader(inst_path)
+    vocal = WavReader(vocal_path)
+    rate = inst.sample_rate
+    channels = max(inst.channels, vocal.channels)
+    clipped = 0
+    tmp_path = out_path + ".part"
     try:
-        inst = AudioSegment.from_wav(inst_path)
-    except Exception as e:
-        print(f"[ERROR] Failed to load inst file: {inst_path} - {e}")
-        continue
+        with wave.open(tmp_path, "wb") as out:
+            out.setnchannels(channels)
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            for start in range(0, inst.frames, block_frames):
+                count = min(block_frames, inst.frames - start)
+                mixed = read_resampled(inst, start, count, rate, channels)
+                mixed += read_resampled(vocal, start, count, rate, channels)
+                over = np.abs(mixed) > 1.0
+                if over.any():
+                    clipped += int(over.sum())
+                    np.clip(mixed, -1.0, 1.0, out=mixed)
+                out.writeframes((mixed * 32767.0).astype("<i2").tobytes())
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, out_path)
+    return clipped
+
+
+def default_workers():
+    """
+    병렬 결합에 사용할 프로세스 수
+    (COMBINE_WORKERS > Slurm이 할당한 CPU 수 > 사용 가능한 CPU 수)
+    """
+    for name in ("COMBINE_WORKERS", "SLURM_CPUS_ON_NODE"):
+        if os.environ.get(name):
+            return max(1, int(os.environ[name]))
+    return len(os.sched_getaffinity(0))
+
+
+def combine_pair(job):
+    """
+    (반주, 보컬) 한 쌍을 결합하는 작업자 함수
+    :param job: (prefix, inst_path, vocal_path, out_path)
+    :return: (prefix, out_path, 성공 여부, 소요 시간(초), 잘린 샘플 수, 에러 메시지)
+    """
+    prefix, inst_path, vocal_path, out_path = job
+    started = time.monotonic()
     try:
-        vocal = AudioSegment.from_wav(vocal_path)
+        clipped = mix_to_wav(inst_path, vocal_path, out_path)
+        return prefix, out_path, True, time.monotonic() - started, clipped, None
     except Exception as e:
-        print(f"[ERROR] Failed to load vocal file: {vocal_path} - {e}")
-        continue
+        return prefix, out_path, False, time.monotonic() - started, 0, str(e)
+
+
+def write_wav(out_path, samples, rate):
+    """
+    float32 (frames, channels) 배열을 16bit WAV로 기록 (임시 파일에 쓴 뒤 rename)
+    - 여러 task가 같은 파일을 동시에 기록해도 완성된 파일만 보임
+    :return: 잘린 샘플 수
+    """
+    over = np.abs(samples) > 1.0
+    clipped = int(over.sum())
+    if clipped:
+        samples = np.clip(samples, -1.0, 1.0)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(out_path)}.", dir=os.path.dirname(out_path)
+    )
     try:
-        combined = inst.overlay(vocal)
-        combined.export(out_path, format="wav")
-        print(f"[INFO] Successfully combined: {out_path}")
-    except Exception as e:
-        print(f"[ERROR] Failed to combine/export: {out_path} - {e}")
-    
\ No newline at end of file
+        with os.fdopen(fd, "wb") as f, wave.open(f, "wb") as out:
+            out.setnchannels(samples.shape[1])
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            out.writeframes((samples * 32767.0).astype("<i2").tobytes())
+        os.replace(tmp_path, out_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return clipped
+
+
+def mix_chunk(row, inst_dir, vocal_dir, start, duration, rate=None, channels=None):
+    """
+    변환된 구간(chunk)의 반주+보컬 중 곡 기준 시각 [start, start+duration)(초) 부분을 섞어 반환
+    :return: (frames, channels) float32 배열, 샘플레이트, 채널 수
+    """
+    inst = WavReader(os.path.join(inst_dir, f"{row['name']}_inst.wav"))
+    vocal = WavReader(os.path.join(vocal_dir, f"{row['name']}_vocal_output.wav"))
+    rate = rate or inst.sample_rate
+    channels = channels or max(inst.channels, vocal.channels)
+    offset = int(round((start - row["chunk_start"]) * rate))
+    count = int(round(duration * rate))
+    mixed = read_resampled(inst, offset, count, rate, channels)
+    mixed += read_resampled(vocal, offset, count, rate, channels)
+    return mixed, rate, channels
+
+
+def publish_segment(row, prev_row, inst_dir, vocal_dir, out_path):
+    """
+    재생 목록에 게시할 구간 [segment_start, segment_start+segment_duration)을 기록
+    - 구간 앞부분은 이전 chunk의 뒤쪽 겹침과 crossfade로 이어 붙여 이음매를 없앰
+      (두 chunk는 같은 원곡을 변환한 상관된 신호라 이득 합이 1인 raised-cosine 사용)
+      (chunk 앞쪽 겹침은 분리/변환 모델이 앞뒤 문맥을 보도록 넣은 것이라 게시하지 않음)
+    :return: 잘린 샘플 수
+    """
+    start, duration = row["segment_start"], row["segment_duration"]
+    mixed, rate, channels = mix_chunk(row, inst_dir, vocal_dir, start, duration)
+    if prev_row is not None:
+        prev_end = prev_row["chunk_start"] + prev_row["chunk_duration"]
+        fade = min(int(round((prev_end - start) * rate)), len(mixed))
+        if fade > 0:
+            tail, _, _ = mix_chunk(
+                prev_row, inst_dir, vocal_dir, start, fade / rate, rate, channels
+            )
+            angle = (np.arange(fade, dtype=np.float32) + 0.5) / fade * (np.pi / 2)
+            fade_in = (np.sin(angle) ** 2)[:, None]
+            mixed[:fade] = mixed[:fade] * fade_in + tail[:fade] * (1.0 - fade_in)
+    return write_wav(out_path, mixed, rate)
+
+
+def concat_segments(segment_paths, out_path):
+    """
+    게시된 구간 WAV들을 이어 붙여 곡 전체 WAV로 기록 (결과 캐시/전체 다운로드용)
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(out_path)}.", dir=os.path.dirname(out_path)
+    )
+    try:
+        with os.fdopen(fd, "wb") as f, wave.open(f, "wb") as out:
+            for i, path in enumerate(segment_paths):
+                with wave.open(path, "rb") as segment:
+                    if i == 0:
+                        out.setparams(segment.getparams())
+                    out.writeframes(segment.readframes(segment.getnframes()))
+        os.replace(tmp_path, out_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def combine_segments(singer_name, names, segments, workspace):
+    """
+    구간 단위 파이프라인의 결합 단계
+    - 이 task의 chunk가 준비됐음을 표시한 뒤, 이 chunk로 게시할 수 있게 된 구간(k, k+1)을 게시
+      (구간 k는 chunk k-1, k가 모두 준비돼야 게시 가능, 두 task 중 나중에 끝난 쪽이 게시)
+    - 곡의 모든 구간이 게시되면 곡 전체 WAV도 기록
+    - 게시 위치: combined/segments/<가수>_<곡>.seg<번호>.wav, 곡 전체: combined/<가수>_<곡>.wav
+    :return: 실패 여부
+    """
+    inst_dir = os.path.join(workspace, "hidden", "inst")
+    vocal_dir = os.path.join(workspace, "output")
+    output_dir = os.path.join(workspace, "combined")
+    segment_dir = os.path.join(output_dir, "segments")
+    ready_dir = os.path.join(segment_dir, ".ready")
+    os.makedirs(ready_dir, exist_ok=True)
+    by_index = {(row["track"], row["index"]): row for row in segments.values()}
+
+    def segment_path(row):
+        return os.path.join(segment_dir, f"{singer_name}_{row['name']}.wav")
+
+    def ready(row):
+        return row is not None and os.path.exists(os.path.join(ready_dir, row["name"]))
+
+    failed = False
+    for name in names:
+        row = segments[name]
+        pair = (
+            os.path.join(inst_dir, f"{name}_inst.wav"),
+            os.path.join(vocal_dir, f"{name}_vocal_output.wav"),
+        )
+        if not all(os.path.exists(p) for p in pair):
+            print(f"[ERROR] Missing inst/vocal pair: {name}")
+            failed = True
+            continue
+        # 추론 결과가 완성된 뒤에만 표시하므로 이웃 task는 쓰는 중인 파일을 읽지 않음
+        open(os.path.join(ready_dir, name), "w").close()
+        for index in (row["index"], row["index"] + 1):
+            target = by_index.get((row["track"], index))
+            prev_row = by_index.get((row["track"], index - 1))
+            if not ready(target) or (index > 0 and not ready(prev_row)):
+                continue
+            out_path = segment_path(target)
+            try:
+                clipped = publish_segment(
+                    target, prev_row, inst_dir, vocal_dir, out_path
+                )
+            except Exception as e:
+                print(f"[ERROR] Failed to publish segment: {out_path} - {e}")
+                failed = True
+                continue
+            if clipped:
+                print(f"[WARN] {clipped} samples clipped: {out_path}")
+            print(f"[INFO] Published segment: {out_path}")
+
+        paths = [segment_path(by_index[(row["track"], i)]) for i in range(row["count"])]
+        if all(os.path.exists(p) for p in paths):
+            out_path = os.path.join(output_dir, f"{singer_name}_{row['track']}.wav")
+            concat_segments(paths, out_path)
+            print(f"[INFO] Successfully combined: {out_path} ({len(paths)} segments)")
+    return failed
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("[ERROR] Usage: python combine.py <singer_name> [--only <prefix> ...]")
+        exit(1)
+
+    singer_name = sys.argv[1]
+    # --only: 지정한 곡(prefix)만 결합 (곡 단위 파이프라인의 job array task)
+    only = (
+        set(sys.argv[sys.argv.index("--only") + 1 :]) if "--only" in sys.argv else None
+    )
+
+    # 작업 디렉토리 (Slurm 작업 환경변수 VCSTREAM_WORKSPACE, 없으면 공유 디렉토리)
+    workspace = os.environ.get("VCSTREAM_WORKSPACE", "/data/msj9518/repos/vcstream/rvc")
+    # 구간 단위 파이프라인(segment.py plan)의 task면 구간을 게시
+    segments = load_segments(workspace)
+    if only and only <= segments.keys():
+        if combine_segments(singer_name, sorted(only), segments, workspace):
+            exit(1)
+        return
+
+    inst_dir = os.path.join(workspace, "hidden", "inst")
+    vocal_dir = os.path.join(workspace, "output")
+    output_dir = os.path.join(workspace, "combined")
+    os.makedirs(output_dir, exist_ok=True)
+
+    inst_files = [f for f in os.listdir(inst_dir) if f.endswith("_inst.wav")]
+    inst_prefixes = {f.replace("_inst.wav", "") for f in inst_files}
+
+    vocal_files = [f for f in os.listdir(vocal_dir) if f.endswith("_vocal_output.wav")]
+    vocal_prefixes = {f.replace("_vocal_output.wav", "") for f in vocal_files}
+
+    common_prefixes = inst_prefixes & vocal_prefixes
+    if only is not None:
+        missing = only - common_prefixes
+        if missing:
+            print(f"[ERROR] Missing inst/vocal pair: {', '.join(sorted(missing))}")
+            exit(1)
+        common_prefixes &= only
+
+    jobs = [
+        (
+            prefix,
+            os.path.join(inst_dir, f"{prefix}_inst.wav"),
+            os.path.join(vocal_dir, f"{prefix}_vocal_output.wav"),
+            os.path.join(output_dir, f"{singer_name}_{prefix}.wav"),
+        )
+        for prefix in sorted(common_prefixes)
+    ]
+    workers = min(default_workers(), len(jobs)) or 1
+    print(f"[INFO] Combining {len(jobs)} tracks with {workers} workers")
+
+    started = time.monotonic()
+    failures = []
+    with Pool(processes=workers) as pool:
+        # 끝나는 순서대로 결과 출력
+        for prefix, out_path, ok, elapsed, clipped, error in pool.imap_unordered(
+            combine_pair, jobs
+        ):
+            if not ok:
+                failures.append(out_path)
+                print(f"[ERROR] Failed to combine/export: {out_path} - {error}")
+                continue
+            if clipped:
+                print(f"[WARN] {clipped} samples clipped: {out_path}")
+            print(f"[INFO] Successfully combined: {out_path} ({elapsed:.2f}s)")
+
+    print(
+        f"[INFO] Combined {len(jobs) - len(failures)}/{len(jobs)} tracks "
+        f"in {time.monotonic() - started:.2f}s"
+    )
+    if failures:
+        # Slurm 의존성 체인(afterok)이 실패를 인식하도록 non-zero로 종료
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
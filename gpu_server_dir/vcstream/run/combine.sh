@@ -1,13 +1,24 @@
 #!/usr/bin/bash
 
+# GPU를 사용하지 않는 단계: 파티션/노드는 서버가 제출 시 지정 (pipeline_service.stage_options)
 #SBATCH -J VC_combine
-#SBATCH --gres=gpu:1
-#SBATCH --cpus-per-gpu=8
-#SBATCH --mem-per-gpu=29G
-#SBATCH -p batch_ugrad
-#SBATCH -w aurora-g1
-#SBATCH -t 1-0
+#SBATCH --cpus-per-task=8
+#SBATCH --mem=16G
+#SBATCH -t 0-2
 
+source /data/msj9518/repos/vcstream/run/timing.sh
+start_timing combine
+
+# 작업 디렉토리 (separate.sh 참고)
+WORKSPACE="${VCSTREAM_WORKSPACE:-/data/msj9518/repos/vcstream/rvc}"
 SINGER_NAME="$1"
 
+# job array로 제출된 경우 (곡 단위 파이프라인) tracks.txt의 해당 곡만 결합
+if [ -n "$SLURM_ARRAY_TASK_ID" ]; then
+  TRACK=$(sed -n "$((SLURM_ARRAY_TASK_ID + 1))p" "$WORKSPACE/input/tracks.txt")
+  python combine.py "$SINGER_NAME" --only "$TRACK"
+  exit $?
+fi
+
+# 매칭된 (반주, 보컬) 쌍을 할당된 CPU 수만큼 병렬로 결합, 하나라도 실패하면 non-zero 종료
 python combine.py "$SINGER_NAME"
\ No newline at end of file
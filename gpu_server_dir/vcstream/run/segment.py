@@ -0,0 +1,200 @@
+import os
+import sys
+import math
+import wave
+import subprocess
+
+# 분리 단계가 읽을 수 있는 입력 오디오 확장자 (separate.py와 동일)
+AUDIO_EXTENSIONS = (".wav", ".opus", ".m4a", ".webm", ".ogg", ".mp3", ".flac", ".aac")
+SEGMENTS_FILE = "segments.tsv"
+COLUMNS = (
+    "name",
+    "track",
+    "index",
+    "count",
+    "source",
+    "chunk_start",
+    "chunk_duration",
+    "segment_start",
+    "segment_duration",
+)
+
+
+def audio_duration(path):
+    """
+    오디오 길이(초) (WAV는 헤더, 압축 파일은 ffprobe로 조회)
+    """
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as f:
+            return f.getnframes() / f.getframerate()
+    output = subprocess.check_output(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "csv=p=0",
+            path,
+        ],
+        text=True,
+    )
+    return float(output.strip())
+
+
+def find_source(input_dir, track):
+    for ext in AUDIO_EXTENSIONS:
+        if os.path.isfile(os.path.join(input_dir, track + ext)):
+            return track + ext
+    raise FileNotFoundError(f"원곡 파일이 없습니다: {track}")
+
+
+def plan_track(track, source, duration, segment_seconds, overlap_seconds):
+    """
+    곡 하나를 segment_seconds 길이의 구간으로 나누고, 구간마다 앞뒤로 overlap_seconds만큼
+    겹치는 변환 단위(chunk)를 만듦
+    - segment_start/segment_duration: 재생 목록에 게시되는 구간 (겹침 없음)
+    - chunk_start/chunk_duration: 실제로 분리/변환하는 구간 (이음매 crossfade용으로 겹침)
+    """
+    count = max(1, math.ceil(duration / segment_seconds))
+    rows = []
+    for index in range(count):
+        segment_start = index * segment_seconds
+        segment_end = min(duration, segment_start + segment_seconds)
+        chunk_start = max(0.0, segment_start - overlap_seconds)
+        chunk_end = min(duration, segment_end + overlap_seconds)
+        rows.append(
+            {
+                "name": f"{track}.seg{index:04d}",
+                "track": track,
+                "index": index,
+                "count": count,
+                "source": source,
+                "chunk_start": round(chunk_start, 3),
+                "chunk_duration": round(chunk_end - chunk_start, 3),
+                "segment_start": round(segment_start, 3),
+                "segment_duration": round(segment_end - segment_start, 3),
+            }
+        )
+    return rows
+
+
+def plan(workspace, segment_seconds, overlap_seconds):
+    """
+    input/tracks.txt의 곡들을 구간으로 나눠 input/segments.tsv에 기록하고,
+    job array 인덱스가 구간을 가리키도록 input/tracks.txt를 구간 이름 목록으로 바꿈
+    (원래 곡 목록은 input/sources.txt에 보관)
+    - 모든 곡의 첫 구간 → 두 번째 구간 → ... 순서로 배치해서 곡마다 앞부분이 먼저 변환됨
+    :return: 구간 목록 (array 인덱스 순서)
+    """
+    input_dir = os.path.join(workspace, "input")
+    tracks_path = os.path.join(input_dir, "tracks.txt")
+    sources_path = os.path.join(input_dir, "sources.txt")
+    if not os.path.exists(sources_path):
+        os.replace(tracks_path, sources_path)
+    with open(sources_path, encoding="utf-8") as f:
+        tracks = [line.rstrip("\n") for line in f if line.strip()]
+    per_track = []
+    for track in tracks:
+        source = find_source(input_dir, track)
+        duration = audio_duration(os.path.join(input_dir, source))
+        per_track.append(
+            plan_track(track, source, duration, segment_seconds, overlap_seconds)
+        )
+    rows = []
+    for index in range(max((len(r) for r in per_track), default=0)):
+        rows.extend(r[index] for r in per_track if index < len(r))
+    with open(os.path.join(input_dir, SEGMENTS_FILE), "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write("\t".join(str(row[c]) for c in COLUMNS) + "\n")
+    with open(tracks_path, "w", encoding="utf-8") as f:
+        f.write("".join(f"{row['name']}\n" for row in rows))
+    return rows
+
+
+def load_segments(workspace):
+    """
+    :return: {구간 이름: 구간 정보}, 구간 모드가 아니면 빈 dict
+    """
+    path = os.path.join(workspace, "input", SEGMENTS_FILE)
+    if not os.path.exists(path):
+        return {}
+    segments = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            values = line.rstrip("\n").split("\t")
+            if len(values) != len(COLUMNS):
+                continue
+            row = dict(zip(COLUMNS, values))
+            for key in ("index", "count"):
+                row[key] = int(row[key])
+            for key in COLUMNS[5:]:
+                row[key] = float(row[key])
+            segments[row["name"]] = row
+    return segments
+
+
+def cut(source, start, duration, out_path):
+    """
+    원곡의 [start, start+duration) 구간을 WAV로 저장 (WAV는 직접 자르고, 압축 파일은 ffmpeg로 디코딩)
+    """
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".part"
+    if source.lower().endswith(".wav"):
+        with wave.open(source, "rb") as src, wave.open(tmp_path, "wb") as out:
+            rate = src.getframerate()
+            out.setparams(src.getparams())
+            src.setpos(min(src.getnframes(), int(round(start * rate))))
+            out.writeframes(src.readframes(int(round(duration * rate))))
+    else:
+        subprocess.check_call(
+            [
+                "ffmpeg",
+                "-y",
+                "-v",
+                "error",
+                "-ss",
+                str(start),
+                "-t",
+                str(duration),
+                "-i",
+                source,
+                "-vn",
+                "-acodec",
+                "pcm_s16le",
+                "-f",
+                "wav",
+                tmp_path,
+            ]
+        )
+    os.replace(tmp_path, out_path)
+
+
+def main():
+    """
+    python segment.py plan <작업 디렉토리> <구간 길이(초)> <겹침(초)>
+        → 구간 목록을 segments.tsv 형식으로 출력
+    python segment.py cut <작업 디렉토리> <구간 이름>
+        → <작업 디렉토리>/segments/<구간 이름>.wav 생성
+    """
+    command, workspace = sys.argv[1], sys.argv[2]
+    if command == "plan":
+        rows = plan(workspace, float(sys.argv[3]), float(sys.argv[4]))
+        for row in rows:
+            print("\t".join(str(row[c]) for c in COLUMNS))
+    elif command == "cut":
+        row = load_segments(workspace)[sys.argv[3]]
+        cut(
+            os.path.join(workspace, "input", row["source"]),
+            row["chunk_start"],
+            row["chunk_duration"],
+            os.path.join(workspace, "segments", f"{row['name']}.wav"),
+        )
+    else:
+        print(f"[ERROR] Unknown command: {command}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,41 @@
 import os
-import sys
-import logging
+import argparse
 
-# UVR 라이브러리 경로 등록
-sys.path.append("/data/msj9518/repos/rvc-cli")
-from uvr.separator import Separator
+from separator_engine import SeparatorEngine, SEPARATION_VERSION
+from stem_cache import StemCache, STEM_CACHE_DIR
+
+# 입력 오디오 확장자 (다운로드 형식이 native면 유튜브 원본 압축 스트림 그대로)
+AUDIO_EXTENSIONS = (".wav", ".opus", ".m4a", ".webm", ".ogg", ".mp3", ".flac", ".aac")
+
+parser = argparse.ArgumentParser(description="input의 곡 보컬/반주 분리")
+parser.add_argument("--input_dir", default="/data/msj9518/repos/vcstream/rvc/input")
+parser.add_argument("--output_root", default="/data/msj9518/repos/vcstream/rvc/hidden")
+parser.add_argument("--model_filename", default="Kim_Vocal_2.onnx")
+parser.add_argument(
+    "--model_file_dir",
+    help="모델 파일 디렉토리 (기본값: 모델 종류별 SeparatorEngine 기본 디렉토리)",
+)
+parser.add_argument("--batch_size", type=int, default=1)
+parser.add_argument("--vr_aggression", type=int, default=10)
+parser.add_argument(
+    "--only",
+    nargs="*",
+    help="분리할 파일명 또는 확장자를 뺀 곡 이름 (job array task 등에서 일부 곡만 처리할 때)",
+)
+parser.add_argument(
+    "--stem_cache_dir", default=os.environ.get("STEM_CACHE_DIR", STEM_CACHE_DIR)
+)
+parser.add_argument(
+    "--stem_cache_max_gb",
+    type=float,
+    default=float(os.environ.get("STEM_CACHE_MAX_GB", 100)),
+)
+parser.add_argument("--no_stem_cache", action="store_true", help="stem 캐시 사용 안 함")
+args = parser.parse_args()
 
 # 입력 및 출력 디렉토리 설정
-input_dir = "/data/msj9518/repos/vcstream/rvc/input"
-output_root = "/data/msj9518/repos/vcstream/rvc/hidden"
+input_dir = args.input_dir
+output_root = args.output_root
 vocal_dir = os.path.join(output_root, "vocal")
 inst_dir = os.path.join(output_root, "inst")
 
@@ -16,55 +43,65 @@ inst_dir = os.path.join(output_root, "inst")
 os.makedirs(vocal_dir, exist_ok=True)
 os.makedirs(inst_dir, exist_ok=True)
 
-# 모델 설정
-model_dir = "/data/yesje1/repos/ultimatevocalremovergui/models/MDX_Net_Models"
-model_filename = "Kim_Vocal_2.onnx"
-
-
-# 입력 디렉토리 내 모든 .wav 파일 순회
-for file in os.listdir(input_dir):
-    if file.lower().endswith(".wav"):
-        audio_path = os.path.join(input_dir, file)
-        base_name = os.path.splitext(file)[0]
-        print(f"\n🔊 분리 중: {file}")
-
-        # ✅ 곡마다 Separator 새로 생성
-        separator = Separator(
-            log_level=logging.INFO,
-            model_file_dir=model_dir,
-            output_dir=output_root,
-            output_format="WAV",
-            normalization_threshold=0.9,
-            output_single_stem=None,
-            invert_using_spec=False,
-            sample_rate=44100,
-            mdx_params={  # ✅ MDX 모델이므로 여기에 설정
-                "hop_length": 1024,
-                "segment_size": 256,
-                "overlap": 0.25,
-                "batch_size": 1,
-                "enable_denoise": False
-            },
+# 입력 디렉토리 내 모든 오디오 파일 순회
+# 압축 파일도 WAV로 변환해 두지 않고 그대로 분리기에 전달 (분리기가 읽으면서 디코딩)
+jobs = []
+for file in sorted(os.listdir(input_dir)):
+    base_name, ext = os.path.splitext(file)
+    if ext.lower() not in AUDIO_EXTENSIONS:
+        continue
+    if not args.only or file in args.only or base_name in args.only:
+        jobs.append(
+            (
+                os.path.join(input_dir, file),
+                {
+                    "Vocals": os.path.join(vocal_dir, f"{base_name}_vocal.wav"),
+                    "Instrumental": os.path.join(inst_dir, f"{base_name}_inst.wav"),
+                },
+            )
         )
 
-        # 모델 로드 (등록되지 않은 사용자 모델일 경우 허용)
-        separator.load_model(model_filename=model_filename)
-
+# stem 캐시에 있는 곡은 분리하지 않고 캐시된 결과를 연결 (분리는 가수와 무관)
+cache = None
+keys = {}
+if not args.no_stem_cache:
+    cache = StemCache(args.stem_cache_dir, int(args.stem_cache_max_gb * 1024**3))
+    settings = {
+        "model": args.model_filename,
+        "vr_aggression": args.vr_aggression,
+        "version": SEPARATION_VERSION,
+    }
+    misses = []
+    for audio_path, stem_paths in jobs:
+        keys[audio_path] = cache.key(audio_path, settings)
+        if cache.fetch(keys[audio_path], stem_paths):
+            print(f"♻️ stem 캐시 적중: {os.path.basename(audio_path)}")
+        else:
+            misses.append((audio_path, stem_paths))
+    print(f"⏱️ stem 캐시: {len(jobs) - len(misses)}곡 적중, {len(misses)}곡 분리")
+else:
+    misses = jobs
 
-        # 분리 수행
-        output_paths = separator.separate(audio_path)
+failures = []
+if misses:
+    # ✅ Separator는 한 번만 생성/모델 로드하고 모든 곡에 재사용 (전부 적중이면 모델 로드 생략)
+    engine = SeparatorEngine(
+        output_dir=output_root,
+        model_filename=args.model_filename,
+        model_file_dir=args.model_file_dir,
+        batch_size=args.batch_size,
+        vr_aggression=args.vr_aggression,
+    )
+    failures = engine.run(misses)
 
-        for path in output_paths:
-            full_path = os.path.join(output_root, path) if not os.path.isabs(path) else path
-            filename = os.path.basename(full_path)
+if cache is not None:
+    for audio_path, stem_paths in misses:
+        if audio_path not in failures:
+            cache.store(keys[audio_path], stem_paths)
+    evicted = cache.evict()
+    if evicted:
+        print(f"🧹 stem 캐시 {evicted}개 정리")
 
-            if "Vocals" in filename:
-                new_filename = f"{base_name}_vocal.wav"
-                new_path = os.path.join(vocal_dir, new_filename)
-                os.rename(full_path, new_path)
-                print(f"✅ 보컬 저장됨: {new_path}")
-            elif "Instrumental" in filename:
-                new_filename = f"{base_name}_inst.wav"
-                new_path = os.path.join(inst_dir, new_filename)
-                os.rename(full_path, new_path)
-                print(f"✅ 반주 저장됨: {new_path}")
+# 일부 곡 실패는 다음 단계를 막지 않고, 전부 실패한 경우에만 non-zero 종료
+if jobs and len(failures) == len(jobs):
+    exit(1)
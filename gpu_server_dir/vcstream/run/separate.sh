@@ -6,33 +6,34 @@
 #SBATCH --mem-per-gpu=29G
 #SBATCH -p batch_ugrad
 #SBATCH -t 1-0
-#SBATCH -o logs/kirby-separate-%A.out
+#SBATCH -o logs/kirby-separate-%A_%a.out
 
-INPUT_DIR="/data/msj9518/repos/vcstream/rvc/input"
-OUTPUT_ROOT="/data/msj9518/repos/vcstream/rvc/hidden"
-VOCAL_DIR="${OUTPUT_ROOT}/vocal"
-INST_DIR="${OUTPUT_ROOT}/inst"
+source /data/msj9518/repos/vcstream/run/timing.sh
+start_timing separate
 
-mkdir -p "$VOCAL_DIR"
-mkdir -p "$INST_DIR"
+# 작업 디렉토리 (서버가 변환 작업마다 rvc/runs/<작업 ID>를 지정, 없으면 공유 디렉토리 rvc)
+WORKSPACE="${VCSTREAM_WORKSPACE:-/data/msj9518/repos/vcstream/rvc}"
+INPUT_DIR="$WORKSPACE/input"
+OUTPUT_ROOT="$WORKSPACE/hidden"
 
-for file in "$INPUT_DIR"/*.wav; do
-  base_name=$(basename "$file" .wav)
-  python uvr_cli.py --audio_file "$file" \
-    --output_format "WAV" \
-    --output_dir "$OUTPUT_ROOT" \
-    --model_filename "2_HP-UVR.pth" \
-    --vr_aggression 10
+# job array로 제출된 경우 (곡 단위 파이프라인) tracks.txt의 해당 곡만 분리
+ONLY=()
+if [ -n "$SLURM_ARRAY_TASK_ID" ]; then
+  TRACK=$(sed -n "$((SLURM_ARRAY_TASK_ID + 1))p" "$INPUT_DIR/tracks.txt")
+  ONLY=(--only "$TRACK")
+  # 구간 단위 파이프라인: 원곡에서 이 task의 구간(앞뒤 겹침 포함)만 잘라서 분리
+  if [ -f "$INPUT_DIR/segments.tsv" ]; then
+    python /data/msj9518/repos/vcstream/run/segment.py cut "$WORKSPACE" "$TRACK" || exit 1
+    INPUT_DIR="$WORKSPACE/segments"
+  fi
+fi
 
-  for out in "$OUTPUT_ROOT"/"${base_name}"*; do
-    if [[ -f "$out" ]]; then
-      if [[ "$out" == *Vocal* ]]; then
-        mv "$out" "$VOCAL_DIR/${base_name}_vocal.wav"
-        echo "✅ 보컬 저장됨: $VOCAL_DIR/${base_name}_vocal.wav"
-      elif [[ "$out" == *Instrumental* ]]; then
-        mv "$out" "$INST_DIR/${base_name}_inst.wav"
-        echo "✅ 반주 저장됨: $INST_DIR/${base_name}_inst.wav"
-      fi
-    fi
-  done
-done
\ No newline at end of file
+# 모델은 한 번만 로드하고 input의 곡 전체를 분리
+# (입력은 WAV 또는 opus/m4a 등 압축 파일, 압축 파일은 분리기가 읽을 때 메모리에서 바로 디코딩)
+# (보컬: hidden/vocal/<곡>_vocal.wav, 반주: hidden/inst/<곡>_inst.wav)
+python /data/msj9518/repos/vcstream/run/separate.py \
+  --input_dir "$INPUT_DIR" \
+  --output_root "$OUTPUT_ROOT" \
+  --model_filename "2_HP-UVR.pth" \
+  --vr_aggression 10 \
+  "${ONLY[@]}"
@@ -1,52 +1,47 @@
 import os
-import sys
-import logging
-
-sys.path.append("/data/msj9518/repos/rvc-cli")
-from uvr.separator import Separator
-
-singer_name = sys.argv[1]
+import argparse
+
+from separator_engine import SeparatorEngine
+
+parser = argparse.ArgumentParser(
+    description="학습용 보컬 분리 (train_input → datasets)"
+)
+parser.add_argument("singer_name")
+parser.add_argument("--model_filename", default="Kim_Vocal_2.onnx")
+parser.add_argument(
+    "--model_file_dir",
+    help="모델 파일 디렉토리 (기본값: 모델 종류별 SeparatorEngine 기본 디렉토리)",
+)
+parser.add_argument("--vr_aggression", type=int, default=10)
+args = parser.parse_args()
+
+singer_name = args.singer_name
 input_dir = f"/data/msj9518/repos/vcstream/rvc/train_input/{singer_name}"
 output_dir = f"/data/msj9518/repos/vcstream/rvc/datasets/{singer_name}"
 
 os.makedirs(output_dir, exist_ok=True)
 
-model_dir = "/data/yesje1/repos/ultimatevocalremovergui/models/MDX_Net_Models"
-model_filename = "Kim_Vocal_2.onnx"
-
-for file in os.listdir(input_dir):
+# Separator는 한 번만 생성/모델 로드, 학습용이므로 보컬만 출력 (inst 파일은 만들지 않음)
+engine = SeparatorEngine(
+    output_dir=output_dir,
+    model_filename=args.model_filename,
+    model_file_dir=args.model_file_dir,
+    vr_aggression=args.vr_aggression,
+    single_stem="Vocals",
+)
+
+jobs = []
+for file in sorted(os.listdir(input_dir)):
     if file.lower().endswith(".wav"):
-        audio_path = os.path.join(input_dir, file)
         base_name = os.path.splitext(file)[0]
-        print(f"\n🔊 분리 중: {file}")
-
-        separator = Separator(
-            log_level=logging.INFO,
-            model_file_dir=model_dir,
-            output_dir=output_dir,
-            output_format="WAV",
-            normalization_threshold=0.9,
-            output_single_stem=None,
-            invert_using_spec=False,
-            sample_rate=44100,
-            mdx_params={
-                "hop_length": 1024,
-                "segment_size": 256,
-                "overlap": 0.25,
-                "batch_size": 1,
-                "enable_denoise": False
-            },
+        jobs.append(
+            (
+                os.path.join(input_dir, file),
+                {"Vocals": os.path.join(output_dir, f"{base_name}.wav")},
+            )
         )
 
-        separator.load_model(model_filename=model_filename)
-        output_paths = separator.separate(audio_path)
-
-        for path in output_paths:
-            full_path = os.path.join(output_dir, path) if not os.path.isabs(path) else path
-            filename = os.path.basename(full_path)
-            if "Vocals" in filename:
-                new_filename = f"{base_name}.wav"
-                new_path = os.path.join(output_dir, new_filename)
-                os.rename(full_path, new_path)
-                print(f"✅ 보컬 저장됨: {new_path}")
-            # inst 파일은 무시
\ No newline at end of file
+failures = engine.run(jobs)
+# 일부 곡 실패는 다음 단계를 막지 않고, 전부 실패한 경우에만 non-zero 종료
+if jobs and len(failures) == len(jobs):
+    exit(1)
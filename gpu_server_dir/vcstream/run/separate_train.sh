@@ -10,24 +10,8 @@
 #SBATCH -o logs/kirby-separate-train-%A.out
 
 SINGER_NAME="$1"
-INPUT_DIR="/data/msj9518/repos/vcstream/rvc/train_input/${SINGER_NAME}"
-OUTPUT_DIR="/data/msj9518/repos/vcstream/rvc/datasets/${SINGER_NAME}"
 
-mkdir -p "$OUTPUT_DIR"
-
-for file in "$INPUT_DIR"/*.wav; do
-  base_name=$(basename "$file" .wav)
-  python uvr_cli.py --audio_file "$file" \
-    --output_format "WAV" \
-    --output_dir "$OUTPUT_DIR" \
-    --model_filename "2_HP-UVR.pth" \
-    --vr_aggression 10 \
-    --single_stem "Vocals"
-
-  for out in "$OUTPUT_DIR"/"${base_name}"*; do
-    if [[ -f "$out" && "$out" == *Vocal* ]]; then
-      mv "$out" "$OUTPUT_DIR/${base_name}.wav"
-      echo "✅ 보컬 저장됨: $OUTPUT_DIR/${base_name}.wav"
-    fi
-  done
-done
\ No newline at end of file
+# 모델은 한 번만 로드하고 train_input/<가수>/*.wav 전체에서 보컬만 분리 (datasets/<가수>/<곡>.wav)
+python /data/msj9518/repos/vcstream/run/separate_train.py "$SINGER_NAME" \
+  --model_filename "2_HP-UVR.pth" \
+  --vr_aggression 10
@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import inspect
+import logging
+
+RVC_CLI_DIR = "/data/msj9518/repos/rvc-cli"
+# UVR 라이브러리 경로 등록
+sys.path.append(RVC_CLI_DIR)
+from uvr.separator import Separator
+
+# MDX 모델(Kim_Vocal_2.onnx 등) 디렉토리 (기존 separate_train.py와 동일)
+MDX_MODEL_DIR = "/data/yesje1/repos/ultimatevocalremovergui/models/MDX_Net_Models"
+# VR 모델(2_HP-UVR.pth 등) 디렉토리: uvr_cli.py의 --model_file_dir 기본값(uvr/tmp/audio-separator-models/)
+# 기존 separate.sh/separate_train.sh는 rvc-cli 디렉토리에서 제출되어 rvc-cli 기준으로 이 경로를 사용
+UVR_MODEL_DIR = os.path.join(RVC_CLI_DIR, "uvr", "tmp", "audio-separator-models")
+# 아래 Separator 설정(정규화, 샘플레이트, mdx/vr 파라미터 등)을 바꾸면 올림 (stem 캐시 무효화)
+SEPARATION_VERSION = 1
+
+
+def default_model_dir(model_filename):
+    """
+    모델 파일 디렉토리를 지정하지 않았을 때 사용할 디렉토리 (VR .pth는 UVR_MODEL_DIR, 그 외 MDX_MODEL_DIR)
+    """
+    return UVR_MODEL_DIR if model_filename.endswith(".pth") else MDX_MODEL_DIR
+
+
+class SeparatorEngine:
+    """
+    UVR Separator를 한 번만 생성/로드해서 여러 파일을 연속으로 분리하는 엔진
+    - 모델 로드(ONNX 세션 생성, 가중치 로드)는 작업당 한 번
+    - 지원되는 경우 출력 파일을 최종 이름으로 바로 기록 (아니면 분리 후 이동)
+    - 모델 로드/파일별 소요 시간 출력
+    """
+
+    def __init__(
+        self,
+        output_dir,
+        model_filename="Kim_Vocal_2.onnx",
+        model_file_dir=None,
+        batch_size=1,
+        vr_aggression=10,
+        single_stem=None,
+    ):
+        """
+        :param output_dir: Separator 출력 디렉토리 (최종 파일 경로의 기준 디렉토리)
+        :param model_filename: 분리 모델 파일명 (MDX .onnx 또는 VR .pth)
+        :param model_file_dir: 모델 파일 디렉토리 (없으면 default_model_dir(model_filename))
+        :param batch_size: 한 번에 추론할 세그먼트 수 (클수록 GPU 메모리 사용 증가, 처리 속도 향상)
+        :param vr_aggression: VR 모델의 보컬 추출 강도
+        :param single_stem: 한 stem만 출력할 때 지정 (예: "Vocals")
+        """
+        self.output_dir = output_dir
+        started = time.monotonic()
+        self.separator = Separator(
+            log_level=logging.INFO,
+            model_file_dir=model_file_dir or default_model_dir(model_filename),
+            output_dir=output_dir,
+            output_format="WAV",
+            normalization_threshold=0.9,
+            output_single_stem=single_stem,
+            invert_using_spec=False,
+            sample_rate=44100,
+            mdx_params={
+                "hop_length": 1024,
+                "segment_size": 256,
+                "overlap": 0.25,
+                "batch_size": batch_size,
+                "enable_denoise": False,
+            },
+            vr_params={
+                "batch_size": max(batch_size, 4),
+                "window_size": 512,
+                "aggression": vr_aggression,
+                "enable_tta": False,
+                "enable_post_process": False,
+                "post_process_threshold": 0.2,
+                "high_end_process": False,
+            },
+        )
+        # 모델 로드 (등록되지 않은 사용자 모델일 경우 허용)
+        self.separator.load_model(model_filename=model_filename)
+        self.model_load_seconds = time.monotonic() - started
+        print(f"⏱️ 모델 로드 완료: {model_filename} ({self.model_load_seconds:.2f}초)")
+        # 버전에 따라 separate()가 출력 파일명을 직접 받을 수 있음
+        self._custom_names = (
+            "custom_output_names"
+            in inspect.signature(self.separator.separate).parameters
+        )
+
+    def separate(self, audio_path, stem_paths):
+        """
+        한 파일을 분리해 stem별 최종 경로에 저장
+        :param audio_path: 입력 오디오 경로
+        :param stem_paths: {"Vocals": 최종 경로, "Instrumental": 최종 경로} (필요한 stem만)
+        :return: 소요 시간(초)
+        """
+        started = time.monotonic()
+        names = {}
+        if self._custom_names:
+            for stem, path in stem_paths.items():
+                rel = os.path.relpath(path, self.output_dir)
+                if not rel.startswith(".."):
+                    names[stem] = os.path.splitext(rel)[0]
+        if names:
+            output_paths = self.separator.separate(
+                audio_path, custom_output_names=names
+            )
+        else:
+            output_paths = self.separator.separate(audio_path)
+
+        targets = {os.path.abspath(p) for p in stem_paths.values()}
+        for path in output_paths:
+            full_path = (
+                os.path.join(self.output_dir, path) if not os.path.isabs(path) else path
+            )
+            if os.path.abspath(full_path) in targets:
+                print(f"✅ 저장됨: {full_path}")
+                continue
+            filename = os.path.basename(full_path)
+            for stem, target in stem_paths.items():
+                if f"({stem})" in filename:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(full_path, target)
+                    print(f"✅ 저장됨: {target}")
+                    break
+            else:
+                # 요청하지 않은 stem은 남기지 않음
+                os.remove(full_path)
+        elapsed = time.monotonic() - started
+        print(f"⏱️ 분리 완료: {os.path.basename(audio_path)} ({elapsed:.2f}초)")
+        return elapsed
+
+    def run(self, jobs):
+        """
+        여러 파일을 순서대로 분리 (한 파일이 실패해도 계속 진행)
+        :param jobs: [(audio_path, stem_paths)] 목록
+        :return: 실패한 입력 파일 경로 목록
+        """
+        started = time.monotonic()
+        failures = []
+        for audio_path, stem_paths in jobs:
+            print(f"\n🔊 분리 중: {os.path.basename(audio_path)}")
+            try:
+                self.separate(audio_path, stem_paths)
+            except Exception as e:
+                print(f"❌ 분리 실패: {audio_path} - {e}")
+                failures.append(audio_path)
+        print(
+            f"\n⏱️ 전체 {len(jobs)}곡 분리: {time.monotonic() - started:.2f}초 "
+            f"(모델 로드 {self.model_load_seconds:.2f}초, 실패 {len(failures)}곡)"
+        )
+        return failures
@@ -0,0 +1,118 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+
+STEM_CACHE_DIR = "/data/msj9518/repos/vcstream/rvc/stem_cache"
+STEMS = ("Vocals", "Instrumental")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(src, dst):
+    """
+    같은 파일시스템이면 하드링크, 아니면 복사 (dst가 있으면 덮어씀)
+    """
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.part"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class StemCache:
+    """
+    보컬/반주 분리 결과(stem) 캐시
+    - 분리는 가수와 무관하므로, 같은 원곡을 다른 가수로 변환할 때 분리를 다시 하지 않음
+    - 키: 원곡 오디오 내용(sha256) + 분리 모델/설정 → <cache_dir>/<키>/{Vocals,Instrumental}.wav
+    - 조회 시 디렉토리 mtime을 갱신하고, 전체 크기가 max_bytes를 넘으면 오래된 항목부터 삭제 (LRU)
+    - 여러 Slurm task가 동시에 저장해도 임시 디렉토리에 쓴 뒤 rename하므로 완성된 항목만 보임
+    """
+
+    def __init__(self, cache_dir=STEM_CACHE_DIR, max_bytes=100 * 1024**3):
+        """
+        :param cache_dir: 캐시 디렉토리
+        :param max_bytes: 캐시 최대 크기(바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, audio_path, settings):
+        """
+        :param settings: 분리 결과에 영향을 주는 모델/설정 값 (dict)
+        """
+        raw = f"{file_sha256(audio_path)}\0{json.dumps(settings, sort_keys=True)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def fetch(self, key, stem_paths):
+        """
+        캐시된 stem을 stem별 최종 경로에 연결
+        :param stem_paths: {"Vocals": 최종 경로, "Instrumental": 최종 경로}
+        :return: 적중 여부
+        """
+        entry = self._entry(key)
+        sources = {stem: os.path.join(entry, f"{stem}.wav") for stem in stem_paths}
+        try:
+            for stem, target in stem_paths.items():
+                link_or_copy(sources[stem], target)
+            os.utime(entry)
+        except OSError:
+            # 없거나 조회 중에 삭제된 항목은 미스로 처리
+            return False
+        return True
+
+    def store(self, key, stem_paths):
+        """
+        분리가 끝난 stem을 캐시에 저장 (이미 있으면 유지)
+        """
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+        tmp = tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir)
+        try:
+            for stem in STEMS:
+                link_or_copy(stem_paths[stem], os.path.join(tmp, f"{stem}.wav"))
+            os.rename(tmp, entry)
+        except OSError:
+            # 다른 task가 먼저 저장했거나 stem 파일이 없는 경우
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def evict(self):
+        """
+        캐시 전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용되지 않은 항목 삭제
+        :return: 삭제한 항목 수
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+                )
+                entries.append((os.path.getmtime(path), size, path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
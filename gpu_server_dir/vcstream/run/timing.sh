@@ -0,0 +1,28 @@
+#!/usr/bin/bash
+# Slurm 작업 스크립트에서 source해서 사용하는 단계별 소요 시간 기록 함수
+# 종료 시 TIMING_FILE에 한 줄(TSV)을 추가하고, 서버가 이 파일을 읽어 /metrics에 반영
+# 형식: stage  job_id  array_task_id  start(epoch)  end(epoch)  exit_status  host
+
+TIMING_FILE="${VCSTREAM_TIMING_FILE:-/data/msj9518/repos/vcstream/rvc/metrics/stage_timings.tsv}"
+
+record_timing() {
+  local status=$?
+  mkdir -p "$(dirname "$TIMING_FILE")"
+  printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\n' \
+    "$TIMING_STAGE" "${SLURM_ARRAY_JOB_ID:-${SLURM_JOB_ID:-}}" "${SLURM_ARRAY_TASK_ID:-}" \
+    "$TIMING_START" "$(date +%s.%N)" "$status" "$(hostname)" >> "$TIMING_FILE"
+}
+
+# 사용법: start_timing <stage> (스크립트가 끝날 때 exit status와 함께 자동 기록)
+start_timing() {
+  TIMING_STAGE="$1"
+  TIMING_START=$(date +%s.%N)
+  trap record_timing EXIT
+}
+
+# 사용법: next_timing <stage> (지금까지를 성공으로 기록하고 다음 단계 시작, 한 작업에서 여러 단계를 실행할 때)
+next_timing() {
+  true
+  record_timing
+  start_timing "$1"
+}
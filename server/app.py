@@ -1,13 +1,18 @@
-from flask import Flask, request, send_file, jsonify, current_app
+from flask import (
+    Flask,
+    request,
+    send_file,
+    jsonify,
+    current_app,
+    stream_with_context,
+)
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
 import os
 from services.ssh_service import (
-    connect_ssh,
+    ssh_session,
     upload_file,
     submit_job,
-    wait_for_job_done,
-    download_file,
-    close_ssh,
 )
 import uuid
 from dotenv import load_dotenv
@@ -15,13 +20,58 @@ import logging
 import socket
 import sys
 from services.convert_service import convert_song
-from services.download_song_service import get_youtube_url, download_audio_as_wav
-import requests
-import json
+from services.slurm_tracker_service import get_job_tracker
+from services.pipeline_service import (
+    get_pipeline_mode,
+    submit_conversion_jobs,
+    run_cleanup,
+    workspace_dir,
+    prepare_workspace,
+    plan_segments,
+)
+from services.download_song_service import (
+    get_youtube_url,
+    download_audio_as_wav,
+    resolve_youtube_ids,
+)
+from urllib.parse import urlencode
 from services.spotify_hijack_service import (
     get_playlist_tracks_with_token,
     SpotifyHijackingService,
     download_playlist_to_gpu_via_ssh,
+    safe_track_name,
+)
+from services.output_stream_service import (
+    HLS_SEGMENT_FORMATS,
+    STREAM_FORMATS,
+    get_rendition_cache,
+    parse_bitrate,
+)
+from services.output_catalog_service import get_output_catalog
+from services.output_sync_service import (
+    LOCAL_SEGMENT_DIR,
+    local_output_name,
+    get_output_syncer,
+    get_segment_syncer,
+)
+from services.segment_service import (
+    segment_file_name,
+    remote_segment_paths,
+    track_playlist,
+)
+from services.job_service import get_job_manager
+from services.singer_registry_service import get_singer_registry
+from services.singer_status_service import get_singer_status_watcher
+from services.event_service import get_event_broker, publish
+from services.spotify_client_service import get_spotify_client
+from services.playback_scheduler_service import get_poll_scheduler
+from services.metrics_service import REGISTRY
+from services.source_store_service import get_source_store
+from services.gpu_timing_service import get_gpu_timing_collector
+from services.result_cache_service import (
+    get_result_cache,
+    get_model_version,
+    result_cache_key,
 )
 import paramiko
 from datetime import datetime
@@ -39,19 +89,13 @@ os.makedirs(UPLOAD_TARGET_FOLDER, exist_ok=True)
 DOWNLOAD_FOLDER = "downloads"
 os.makedirs(DOWNLOAD_FOLDER, exist_ok=True)
 
-ssh_connection = None
 conversion_mode = False
 selected_singers = []
 
-SINGERS_FILE = os.path.join("services", "selected_singer.json")
+REMOTE_COMBINED_DIR = "/data/msj9518/repos/vcstream/rvc/combined"
 
-# Conversion Mode 상태 및 polling 관리용 전역 변수
-conversion_mode_state = {
-    "active": False,
-    "access_token": None,
-    "singer_name": None,
-    "polling_thread": None,
-}
+# /conversion_mode로 등록된 사용자별 Conversion Mode 상태
+conversion_mode_state = {}
 
 
 @app.route("/conversion_mode_info", methods=["POST"])
@@ -60,54 +104,28 @@ def conversion_mode_info():
     access_token = data.get("access_token")
     singer_name = data.get("singer_name")
     mode = data.get("conversion_mode")
+    user_id = data.get("user_id", "default")
     if mode == "on":
-        conversion_mode_state["active"] = True
-        conversion_mode_state["access_token"] = access_token
-        conversion_mode_state["singer_name"] = singer_name
-        # polling thread 시작
-        if (
-            not conversion_mode_state["polling_thread"]
-            or not conversion_mode_state["polling_thread"].is_alive()
-        ):
-            t = threading.Thread(target=playlist_polling_worker, daemon=True)
-            conversion_mode_state["polling_thread"] = t
-            t.start()
+        if not access_token or not singer_name:
+            return jsonify({"error": "access_token, singer_name are required"}), 400
+        get_poll_scheduler().register(
+            user_id, access_token, singer_name, on_playlist_detected
+        )
         return jsonify({"status": "conversion mode on, polling started"})
     else:
-        conversion_mode_state["active"] = False
+        get_poll_scheduler().unregister(user_id)
         return jsonify({"status": "conversion mode off"})
 
 
 @app.route("/conversion_mode_off", methods=["POST"])
 def conversion_mode_off():
-    user_id = "user1"
+    user_id = (request.get_json(silent=True) or {}).get("user_id", "default")
+    get_poll_scheduler().unregister(user_id)
     return jsonify({"status": "off"})
 
 
-def load_selected_singers():
-    if os.path.exists(SINGERS_FILE):
-        try:
-            with open(SINGERS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logging.error(f"{SINGERS_FILE} 파일이 없습니다.")
-            return "파일 없음", 404
-        except Exception as e:
-            logging.error(f"파일 처리 중 오류: {e}")
-            return "서버 오류", 500
-    return []
-
-
-def save_selected_singers(singers):
-    with open(SINGERS_FILE, "w", encoding="utf-8") as f:
-        json.dump(singers, f, ensure_ascii=False)
-
-
 def add_singer(singer_name):
-    singers = load_selected_singers()
-    if not any(s.get("name") == singer_name for s in singers):
-        singers.append({"name": singer_name, "status": "training"})
-        save_selected_singers(singers)
+    get_singer_registry().add(singer_name, status="training")
 
 
 def update_singer_status_if_trained(singer_name):
@@ -115,11 +133,7 @@ def update_singer_status_if_trained(singer_name):
     pth_path = os.path.join(model_dir, f"{singer_name}_best.pth")
     index_path = os.path.join(model_dir, f"{singer_name}.index")
     if os.path.exists(pth_path) and os.path.exists(index_path):
-        singers = load_selected_singers()
-        for s in singers:
-            if s["name"] == singer_name and s["status"] != "done":
-                s["status"] = "done"
-        save_selected_singers(singers)
+        get_singer_registry().set_status([singer_name], "done")
 
 
 def check_remote_file_exists(ssh, path):
@@ -157,45 +171,9 @@ def convert():
             400,
         )
 
-    try:
-        # 1. 플레이리스트 곡들을 GPU 서버에 다운로드
-        download_playlist_to_gpu_via_ssh(playlist_id, access_token)
-
-        # 2. 이후 Slurm 파이프라인 실행 (separate.sh, batch_infer.sh, combine.sh, cleanup.sh)
-        ssh = connect_ssh()
-        # 보컬 분리 (입력: input/*.wav, 출력: hidden/inst/*.wav(반주), hidden/*.wav(보컬))
-        separate_cmd = (
-            "cd /data/msj9518/repos/rvc-cli && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            "sbatch /data/msj9518/repos/vcstream/run/separate.sh"
-        )
-        separate_jobid = submit_job(ssh, separate_cmd)
-        # 추론 (입력: hidden/*.wav(보컬), 출력: output/IU_곡제목.wav)
-        batch_infer_cmd = (
-            "cd /data/msj9518/repos/rvc-cli && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f"sbatch --dependency=afterok:{separate_jobid} /data/msj9518/repos/vcstream/run/batch_infer.sh '{singer_name}'"
-        )
-        batch_jobid = submit_job(ssh, batch_infer_cmd)
-        # 결합 (입력: hidden/inst/*.wav, output/*.wav, 출력: combined/)
-        combine_cmd = (
-            "cd /data/msj9518/repos/vcstream/run && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f"sbatch --dependency=afterok:{batch_jobid} /data/msj9518/repos/vcstream/run/combine.sh '{singer_name}'"
-        )
-        combine_jobid = submit_job(ssh, combine_cmd)
-        # 정리
-        cleanup_cmd = (
-            "cd /data/msj9518/repos/vcstream/run && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f"sbatch --dependency=afterok:{combine_jobid} /data/msj9518/repos/vcstream/run/cleanup.sh"
-        )
-        submit_job(ssh, cleanup_cmd)
-        close_ssh(ssh)
-
-        return jsonify({"status": "conversion completed"})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # 다운로드 → Slurm 파이프라인(separate, batch_infer, combine, cleanup)을 백그라운드에서 실행
+    job_id = start_conversion_job("convert", playlist_id, access_token, singer_name)
+    return jsonify({"job_id": job_id, "status": "queued"}), 202
 
 
 # ========================
@@ -215,69 +193,70 @@ def handle_selected_singers():
         if singer_name:
             add_singer(singer_name)
             try:
-                ssh = connect_ssh()
-                # 1. train_input/가수이름 디렉토리 생성 및 yt-dlp로 음원 다운로드
-                train_input_dir = (
-                    f"/data/msj9518/repos/vcstream/rvc/train_input/{singer_name}"
-                )
-                # 디렉토리 없을 때만 생성
-                stdin, stdout, stderr = ssh.exec_command(
-                    f"[ -d '{train_input_dir}' ] && echo 'exists' || echo 'not_exists'"
-                )
-                if stdout.read().decode().strip() == "not_exists":
-                    ssh.exec_command(f"mkdir -p '{train_input_dir}'")
-                url = get_youtube_url(singer_name)
-                if url:
-                    safe_title = f"{singer_name}".replace("/", "_").replace("\\", "_")
-                    yt_dlp_cmd = (
-                        f"cd '{train_input_dir}' && "
-                        "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-                        f"yt-dlp -x --audio-format wav '{url}' -o '{safe_title}.%(ext)s'"
+                with ssh_session() as ssh:
+                    # 1. train_input/가수이름 디렉토리 생성 및 yt-dlp로 음원 다운로드
+                    train_input_dir = (
+                        f"/data/msj9518/repos/vcstream/rvc/train_input/{singer_name}"
                     )
-                    stdin, stdout, stderr = ssh.exec_command(yt_dlp_cmd)
-                    out = stdout.read().decode()
-                    err = stderr.read().decode()
-                    if out:
-                        logging.info(f"[yt-dlp STDOUT] {out}")
-                    if err:
-                        logging.error(f"[yt-dlp STDERR] {err}")
-                # 2. datasets/가수이름 디렉토리 생성
-                datasets_dir = (
-                    f"/data/msj9518/repos/vcstream/rvc/datasets/{singer_name}"
-                )
-                stdin, stdout, stderr = ssh.exec_command(
-                    f"[ -d '{datasets_dir}' ] && echo 'exists' || echo 'not_exists'"
-                )
-                if stdout.read().decode().strip() == "not_exists":
-                    ssh.exec_command(f"mkdir -p '{datasets_dir}'")
-                # 3. 보컬 분리 (separate_train.sh)
-                separate_cmd = (
-                    f"cd /data/msj9518/repos/rvc-cli && "
-                    f"source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-                    f"sbatch /data/msj9518/repos/vcstream/run/separate_train.sh '{singer_name}'"
-                )
-                separate_jobid = submit_job(ssh, separate_cmd)
-                # 4. 학습 (train_atoz.sh, 보컬 분리 작업이 끝난 후 실행)
-                train_cmd = (
-                    f"cd /data/msj9518/repos/rvc-cli && "
-                    f"source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-                    f"sbatch --dependency=afterok:{separate_jobid} /data/msj9518/repos/vcstream/run/train_atoz.sh '{singer_name}'"
-                )
-                submit_job(ssh, train_cmd)
-                close_ssh(ssh)
+                    # 디렉토리 없을 때만 생성
+                    stdin, stdout, stderr = ssh.exec_command(
+                        f"[ -d '{train_input_dir}' ] && echo 'exists' || echo 'not_exists'"
+                    )
+                    if stdout.read().decode().strip() == "not_exists":
+                        ssh.exec_command(f"mkdir -p '{train_input_dir}'")
+                    url = get_youtube_url(singer_name)
+                    if url:
+                        safe_title = f"{singer_name}".replace("/", "_").replace(
+                            "\\", "_"
+                        )
+                        yt_dlp_cmd = (
+                            f"cd '{train_input_dir}' && "
+                            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
+                            f"yt-dlp -x --audio-format wav '{url}' -o '{safe_title}.%(ext)s'"
+                        )
+                        stdin, stdout, stderr = ssh.exec_command(yt_dlp_cmd)
+                        out = stdout.read().decode()
+                        err = stderr.read().decode()
+                        if out:
+                            logging.info(f"[yt-dlp STDOUT] {out}")
+                        if err:
+                            logging.error(f"[yt-dlp STDERR] {err}")
+                    # 2. datasets/가수이름 디렉토리 생성
+                    datasets_dir = (
+                        f"/data/msj9518/repos/vcstream/rvc/datasets/{singer_name}"
+                    )
+                    stdin, stdout, stderr = ssh.exec_command(
+                        f"[ -d '{datasets_dir}' ] && echo 'exists' || echo 'not_exists'"
+                    )
+                    if stdout.read().decode().strip() == "not_exists":
+                        ssh.exec_command(f"mkdir -p '{datasets_dir}'")
+                    # 3. 보컬 분리 (separate_train.sh)
+                    separate_cmd = (
+                        f"cd /data/msj9518/repos/rvc-cli && "
+                        f"source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
+                        f"sbatch /data/msj9518/repos/vcstream/run/separate_train.sh '{singer_name}'"
+                    )
+                    separate_jobid = submit_job(ssh, separate_cmd)
+                    # 4. 학습 (train_atoz.sh, 보컬 분리 작업이 끝난 후 실행)
+                    train_cmd = (
+                        f"cd /data/msj9518/repos/rvc-cli && "
+                        f"source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
+                        f"sbatch --dependency=afterok:{separate_jobid} /data/msj9518/repos/vcstream/run/train_atoz.sh '{singer_name}'"
+                    )
+                    train_jobid = submit_job(ssh, train_cmd)
+                    # 학습 작업이 끝나면 모델 파일을 확인해서 상태 변경 (singer 이벤트)
+                    if train_jobid:
+                        get_singer_status_watcher().watch(singer_name, train_jobid)
             except Exception as e:
                 logging.error(f"학습 파이프라인 실행 실패: {e}")
                 return jsonify({"error": str(e)}), 500
-        return jsonify({"singers": load_selected_singers()})
+        return jsonify({"singers": get_singer_registry().list()})
     elif request.method == "DELETE":
         data = request.json
-        singer_name = data.get("singer_name")
-        singers = load_selected_singers()
-        singers = [s for s in singers if s.get("name") != singer_name]
-        save_selected_singers(singers)
-        return jsonify({"singers": singers})
+        get_singer_registry().remove(data.get("singer_name"))
+        return jsonify({"singers": get_singer_registry().list()})
     # GET
-    return jsonify({"singers": load_selected_singers()})
+    return jsonify({"singers": get_singer_registry().list()})
 
 
 # ========================
@@ -287,11 +266,12 @@ def handle_selected_singers():
 def handle_conversion_mode():
     """
     변환 모드(ON/OFF) 상태를 관리하는 엔드포인트
-    - POST: 상태 변경 및 SSH 연결 관리
+    - POST: 상태 변경 및 Spotify 재생 polling 등록/해제
+      (GPU 서버 SSH 연결은 작업마다 연결 풀에서 대여하므로 변환 모드 동안 유지하지 않음)
     - GET: 현재 상태 반환
     """
     logging.info("[LOG] /conversion_mode endpoint called")
-    global conversion_mode, ssh_connection, conversion_mode_state
+    global conversion_mode, conversion_mode_state
     if request.method == "POST":
         data = request.json
         # 단일 사용자면 'default' 키 사용, 여러 사용자면 user_id 등으로 구분
@@ -304,24 +284,19 @@ def handle_conversion_mode():
             "started_at": datetime.utcnow().isoformat() + "Z",
         }
         conversion_mode = data.get("on", False)
-        if conversion_mode and ssh_connection is None:
-            ssh_connection = connect_ssh()
-            logging.info("[LOG] Conversion mode ON: SSH 연결 생성")
-        elif not conversion_mode and ssh_connection is not None:
-            close_ssh(ssh_connection)
-            ssh_connection = None
-            logging.info("[LOG] Conversion mode OFF: SSH 연결 해제")
-        else:
-            logging.info(
-                f"[LOG] Conversion mode 상태 변경: on={conversion_mode}, ssh_connection={'있음' if ssh_connection else '없음'}"
+        access_token = data.get("spotify_access_token")
+        if conversion_mode and access_token and data.get("singer_name"):
+            get_poll_scheduler().register(
+                user_id, access_token, data.get("singer_name"), on_playlist_detected
             )
+        elif not conversion_mode:
+            get_poll_scheduler().unregister(user_id)
+        logging.info(f"[LOG] Conversion mode 상태 변경: on={conversion_mode}")
         return jsonify(
-            {"on": conversion_mode, "conversion_mode_state": conversion_mode_state}
+            {"on": conversion_mode, "polling": get_poll_scheduler().status()}
         )
-    # GET: 현재 상태 반환
-    return jsonify(
-        {"on": conversion_mode, "conversion_mode_state": conversion_mode_state}
-    )
+    # GET: 현재 상태 반환 (토큰은 제외)
+    return jsonify({"on": conversion_mode, "polling": get_poll_scheduler().status()})
 
 
 # ========================
@@ -347,9 +322,8 @@ def upload_audio():
 
     # GPU 서버 input 폴더에 업로드
     remote_input_path = f"/data/msj9518/repos/seed-vc/input/{filename}"
-    ssh = connect_ssh()
-    upload_file(ssh, local_input_path, remote_input_path)
-    close_ssh(ssh)
+    with ssh_session() as ssh:
+        upload_file(ssh, local_input_path, remote_input_path)
     logging.info("[LOG] 업로드 완료")
     return "업로드 완료"
 
@@ -382,8 +356,6 @@ def receive_current_track_info():
     # context_uri에서 playlist_id 추출
     if context_uri and context_uri.startswith("spotify:playlist:"):
         playlist_id = context_uri.split(":")[-1]
-        from services.spotify_hijack_service import get_playlist_tracks_with_token
-
         # Spotify API 호출 시 401 처리
         try:
             tracks = get_playlist_tracks_with_token(playlist_id, access_token)
@@ -423,10 +395,8 @@ def search_artist():
     if not query or not access_token:
         return jsonify({"error": "query and access_token required"}), 400
 
-    url = "https://api.spotify.com/v1/search"
-    headers = {"Authorization": f"Bearer {access_token}"}
     params = {"q": query, "type": "artist", "limit": 10}
-    res = requests.get(url, headers=headers, params=params)
+    res = get_spotify_client().get("/search", access_token, params=params)
     if res.status_code == 401:
         return jsonify({"error": "access_token expired"}), 401
     if res.status_code != 200:
@@ -447,70 +417,252 @@ def search_artist():
 @app.route("/update_singer_status", methods=["POST"])
 def update_all_singer_status():
     """
-    모든 가수의 학습 상태를 확인하고, 학습이 끝난 가수의 status를 'done'으로 변경
-    """
-    singers = load_selected_singers()
-    changed = False
-    ssh = connect_ssh()
-    for s in singers:
-        if s["status"] != "done":
-            model_dir = f"/data/msj9518/repos/vcstream/rvc/models/{s['name']}"
-            pth_path = os.path.join(model_dir, f"{s['name']}_best.pth")
-            index_path = os.path.join(model_dir, f"{s['name']}.index")
-            pth_exists = check_remote_file_exists(ssh, pth_path)
-            index_exists = check_remote_file_exists(ssh, index_path)
-            if pth_exists and index_exists:
-                s["status"] = "done"
-                changed = True
-    if changed:
-        save_selected_singers(singers)
-    close_ssh(ssh)
-    return jsonify({"singers": singers})
-
-
-def sync_outputs_internal(
-    remote_output_dir="/data/msj9518/repos/vcstream/rvc/combined",
-):
-    ssh = connect_ssh()
-    local_output_dir = "output"
-    os.makedirs(local_output_dir, exist_ok=True)
-    stdin, stdout, stderr = ssh.exec_command(
-        f"find {remote_output_dir} -maxdepth 1 -name '*.wav'"
+    가수 학습 상태 조회
+    - 학습 작업을 추적 중인 가수는 작업이 끝날 때 서버가 갱신하므로 SSH로 확인하지 않음
+    - 추적하지 않는 미완료 가수만 SINGER_STATUS_CHECK_INTERVAL마다 최대 한 번 확인
+      (force=true면 바로 확인)
+    - 상태 변경은 GET /events의 singer 이벤트로도 전달
+    """
+    force = bool((request.get_json(silent=True) or {}).get("force"))
+    try:
+        get_singer_status_watcher().refresh(force=force)
+    except Exception as e:
+        logging.error(f"[ERROR] 가수 학습 상태 확인 실패: {e}")
+    return jsonify({"singers": get_singer_registry().list()})
+
+
+@app.route("/events", methods=["GET"])
+def events():
+    """
+    서버 이벤트 스트림 (Server-Sent Events, polling 대신 사용)
+    - singer: 가수 추가/삭제/학습 상태 변경 {"name", "status"}
+    - job: 변환 작업 단계/상태 변경 {"job_id", "kind", "status", "stage"}
+    - track: 곡별 변환 상태 변경 {"job_id", "track", "status", "error"}
+    - output / segment: 새로 동기화된 결과 파일 / 구간 파일 {"file", "size"}
+    - types=<종류,...>로 받을 이벤트 선택, job_id=<작업 ID>로 해당 작업의 job/track 이벤트만 수신
+    - 재연결 시 Last-Event-ID 헤더(또는 last_event_id 인자) 이후 이벤트부터 다시 전송
+    """
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get(
+        "last_event_id", ""
     )
-    files = [line.strip() for line in stdout.readlines() if line.strip()]
-    for remote_file in files:
-        # 파일명에서 공백을 _로 변환
-        base_name = os.path.basename(remote_file).replace(" ", "_")
-        local_file = os.path.join(local_output_dir, base_name)
-        try:
-            download_file(ssh, remote_file, local_file)
-        except FileNotFoundError:
-            print(f"[LOG] 파일 없음(무시): {remote_file}")
-        except Exception as e:
-            print(f"[LOG] 다운로드 중 오류(무시): {remote_file}, {e}")
-    close_ssh(ssh)
+    types = request.args.get("types")
+    broker = get_event_broker()
+    sub = broker.subscribe(
+        last_event_id=int(last_event_id) if last_event_id.isdigit() else None,
+        types=set(types.split(",")) if types else None,
+        job_id=request.args.get("job_id"),
+    )
+    return current_app.response_class(
+        stream_with_context(broker.stream(sub)),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def combined_output_name(track, singer_name):
+    """
+    동기화된 결과 파일의 로컬 파일명 (combine.py 출력 파일명에서 공백을 _로 변환)
+    """
+    return f"{singer_name}_{safe_track_name(track)}.wav".replace(" ", "_")
+
+
+def sync_outputs_internal(remote_output_dir=REMOTE_COMBINED_DIR, files=None):
+    """
+    GPU 서버의 결과 파일을 로컬 output 디렉토리로 증분 동기화
+    :param files: 동기화할 원격 파일 경로 목록 (없으면 remote_output_dir의 모든 .wav)
+    :return: 동기화 통계
+    """
+    return get_output_syncer().sync(remote_output_dir, files=files)
 
 
 @app.route("/sync_outputs", methods=["POST"])
 def sync_outputs():
-    sync_outputs_internal()
-    return jsonify({"status": "synced"})
+    stats = sync_outputs_internal()
+    return jsonify({"status": "synced", **stats})
+
+
+@app.route("/result_cache_stats", methods=["GET"])
+def result_cache_stats():
+    """
+    변환 결과 캐시 적중/미스 통계
+    """
+    return jsonify(get_result_cache().stats())
+
+
+@app.route("/source_store_stats", methods=["GET"])
+def source_store_stats():
+    """
+    원곡 저장소 적중/미스 통계, 다시 다운로드하지 않아 절약한 바이트 수
+    """
+    return jsonify(get_source_store().stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    단계별/SSH 명령별/Spotify 요청별 지연 시간, 전송 바이트 수 (Prometheus text format)
+    GPU 작업 소요 시간은 GPU 서버의 기록 파일에서 새로 추가된 부분을 읽어서 반영
+    """
+    try:
+        get_gpu_timing_collector().collect()
+    except Exception as e:
+        logging.error(f"[ERROR] GPU 작업 소요 시간 수집 실패: {e}")
+    return current_app.response_class(
+        REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.route("/output_files", methods=["GET"])
 def output_files():
-    output_dir = "output"
-    files = [f for f in os.listdir(output_dir) if f.endswith(".wav")]
-    return jsonify({"files": files})
+    """
+    결과 파일 목록 (최신순, 동기화 단계가 갱신하는 인덱스에서 조회)
+    - files: 파일명 목록, items: {"file", "singer", "title", "artists", "duration", "size", "created_at"}
+    - 기본은 전체 목록 (files는 기존과 같이 모든 결과 파일)
+    - limit=<개수>(최대 1000) 또는 cursor=<next_cursor>를 주면 페이지 단위로 조회
+      (cursor만 주면 limit 기본값 100, 다음 페이지가 있으면 next_cursor 반환)
+    - singer=<가수>로 필터
+    - ETag 조건부 요청(304) 지원 (목록이 바뀌지 않았으면 본문 없이 응답)
+    """
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit")
+    if limit is not None or cursor is not None:
+        try:
+            limit = min(max(int(limit or 100), 1), 1000)
+        except ValueError:
+            return jsonify({"error": "limit은 정수여야 합니다"}), 400
+    try:
+        items, next_cursor, version = get_output_catalog().page(
+            singer=request.args.get("singer"), cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify(
+        {
+            "files": [item["file"] for item in items],
+            "items": items,
+            "next_cursor": next_cursor,
+        }
+    )
+    response.set_etag(version)
+    return response.make_conditional(request)
 
 
 @app.route("/download_output/<filename>", methods=["GET"])
 def download_output(filename):
+    """
+    결과 파일 다운로드/스트리밍
+    - Range 요청(206), ETag/Last-Modified 조건부 요청(304) 지원
+    - format=opus|aac|mp3 이면 압축 포맷으로 변환해서 전송 (변환 결과는 디스크에 캐시)
+    - bitrate=<kbps>로 비트레이트 지정, inline=1 이면 첨부파일이 아닌 인라인으로 전송
+    """
     output_dir = "output"
-    file_path = os.path.join(output_dir, filename)
-    if not os.path.exists(file_path):
+    file_path = safe_join(output_dir, filename)
+    if file_path is None or not os.path.isfile(file_path):
         return "파일이 존재하지 않습니다.", 404
-    return send_file(file_path, as_attachment=True)
+    return send_output_file(file_path, filename)
+
+
+def send_output_file(file_path, filename, as_attachment=None):
+    """
+    결과 wav 파일 전송 (format/bitrate/inline 요청 인자는 /download_output과 동일)
+    :param as_attachment: 첨부파일로 전송할지 여부 (없으면 inline 요청 인자로 결정)
+    """
+    fmt = request.args.get("format", "wav").lower()
+    if as_attachment is None:
+        as_attachment = request.args.get("inline") != "1"
+    if fmt == "wav":
+        return send_file(
+            file_path,
+            mimetype="audio/wav",
+            as_attachment=as_attachment,
+            conditional=True,
+        )
+    if fmt not in STREAM_FORMATS:
+        return jsonify({"error": f"지원하지 않는 포맷: {fmt}"}), 400
+
+    ext, mimetype, default_bitrate, _ = STREAM_FORMATS[fmt]
+    bitrate = parse_bitrate(request.args.get("bitrate"), default_bitrate)
+    try:
+        rendition = get_rendition_cache().get(file_path, fmt, bitrate)
+    except Exception as e:
+        print(f"[ERROR] 스트리밍 변환 실패: {filename} - {e}")
+        return jsonify({"error": str(e)}), 500
+    return send_file(
+        rendition,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        download_name=f"{os.path.splitext(filename)[0]}.{ext}",
+        conditional=True,
+    )
+
+
+@app.route("/jobs/<job_id>/tracks/<track>/playlist.m3u8", methods=["GET"])
+def track_playlist_m3u8(job_id, track):
+    """
+    곡 하나의 HLS 형식 재생 목록 (구간 단위 모드에서는 변환이 끝나기 전부터 앞 구간 재생 가능)
+    - 변환 중에는 게시된 구간까지만 포함하고 ENDLIST 없이 반환 (클라이언트가 주기적으로 다시 요청)
+    - 구간 포맷: format=adts(기본, ADTS AAC) 또는 mp3, bitrate=<kbps>는 구간 URI에 전달
+    - 구간마다 따로 인코딩하므로 이음매마다 인코더 priming(AAC 1024샘플, 약 23ms) 만큼의
+      짧은 공백이 생길 수 있음 (끊김 없는 재생이 필요하면 /full 또는 /download_output 사용)
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "job not found"}), 404
+    params = {"format": request.args.get("format", HLS_SEGMENT_FORMATS[0]).lower()}
+    if params["format"] not in HLS_SEGMENT_FORMATS:
+        return (
+            jsonify(
+                {
+                    "error": f"재생 목록에서 지원하지 않는 포맷: {params['format']} "
+                    f"({', '.join(HLS_SEGMENT_FORMATS)} 중 선택)"
+                }
+            ),
+            400,
+        )
+    bitrate = request.args.get("bitrate")
+    if bitrate:
+        if not bitrate.isdigit():
+            return jsonify({"error": "bitrate는 정수(kbps)여야 합니다"}), 400
+        params["bitrate"] = parse_bitrate(bitrate, STREAM_FORMATS[params["format"]][2])
+    query = urlencode(params)
+    playlist = track_playlist(job, track, query)
+    if playlist is None:
+        return jsonify({"error": "track not found"}), 404
+    return current_app.response_class(
+        playlist,
+        content_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.route("/jobs/<job_id>/tracks/<track>/segments/<int:index>", methods=["GET"])
+def track_segment(job_id, track, index):
+    """
+    재생 목록의 구간 파일 (format=adts|mp3 이면 HLS 구간용 압축 포맷으로 변환해서 전송)
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "job not found"}), 404
+    filename = segment_file_name(job["params"]["singer_name"], track, index)
+    file_path = safe_join(LOCAL_SEGMENT_DIR, filename)
+    if file_path is None or not os.path.isfile(file_path):
+        return "파일이 존재하지 않습니다.", 404
+    return send_output_file(file_path, filename, as_attachment=False)
+
+
+@app.route("/jobs/<job_id>/tracks/<track>/full", methods=["GET"])
+def track_full_output(job_id, track):
+    """
+    구간 없이 변환된 곡의 결과 파일 (재생 목록의 단일 구간)
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "job not found"}), 404
+    filename = local_output_name(f"{job['params']['singer_name']}_{track}.wav")
+    file_path = safe_join("output", filename)
+    if file_path is None or not os.path.isfile(file_path):
+        return "파일이 존재하지 않습니다.", 404
+    return send_output_file(file_path, filename, as_attachment=False)
 
 
 @app.route("/current_spotify_context", methods=["POST"])
@@ -520,8 +672,7 @@ def current_spotify_context():
     if not access_token:
         return jsonify({"error": "access_token required"}), 400
 
-    headers = {"Authorization": f"Bearer {access_token}"}
-    resp = requests.get("https://api.spotify.com/v1/me/player", headers=headers)
+    resp = get_spotify_client().get("/me/player", access_token)
     if resp.status_code != 200:
         return (
             jsonify({"error": "Spotify API error", "detail": resp.text}),
@@ -538,61 +689,333 @@ def current_spotify_context():
         return jsonify({"error": "No playlist context found", "context": context}), 404
 
 
-def convert_playlist_internal(playlist_id, access_token, singer_name):
-    if not playlist_id or not access_token or not singer_name:
-        return {"error": "playlist_id, access_token, singer_name are required"}, 400
-    try:
-        # 1. 플레이리스트 곡들을 GPU 서버에 다운로드
-        download_playlist_to_gpu_via_ssh(playlist_id, access_token)
-
-        # 2. 이후 Slurm 파이프라인 실행 (separate.sh, batch_infer.sh, combine.sh, cleanup.sh)
-        ssh = connect_ssh()
-        # 보컬 분리
-        separate_cmd = (
-            "cd /data/msj9518/repos/rvc-cli && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            "sbatch /data/msj9518/repos/vcstream/run/separate.sh"
-        )
-        separate_jobid = submit_job(ssh, separate_cmd)
+def start_conversion_job(kind, playlist_id, access_token, singer_name):
+    """
+    플레이리스트 변환을 백그라운드 작업으로 등록
+    :return: 작업 ID (GET /jobs/<id>로 진행 상황 조회)
+    """
+    return get_job_manager().submit(
+        kind,
+        {"playlist_id": playlist_id, "singer_name": singer_name},
+        lambda job: convert_playlist_internal(
+            playlist_id, access_token, singer_name, job
+        ),
+    )
 
-        # 2. batch_infer (보컬 분리 후)
-        batch_infer_cmd = (
-            "cd /data/msj9518/repos/rvc-cli && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f"sbatch --dependency=afterok:{separate_jobid} /data/msj9518/repos/vcstream/run/batch_infer.sh '{singer_name}'"
-        )
-        batch_jobid = submit_job(ssh, batch_infer_cmd)
 
-        # 3. combine (batch_infer 후)
-        combine_cmd = (
-            "cd /data/msj9518/repos/vcstream/run && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f"sbatch --dependency=afterok:{batch_jobid} /data/msj9518/repos/vcstream/run/combine.sh '{singer_name}'"
+def convert_playlist_internal(playlist_id, access_token, singer_name, job):
+    """
+    플레이리스트 변환 파이프라인 (작업 스레드에서 실행)
+    Slurm 작업 제출까지 진행하고 반환하며, 작업 완료 처리는 combine 추적 콜백에서 수행
+    :param job: 진행 상황을 기록할 Job
+    """
+    # 0. 변환 결과 캐시 조회 (같은 원곡 + 같은 가수 모델이면 GPU 작업 생략)
+    job.set_stage("resolving")
+    tracks = resolve_youtube_ids(
+        get_playlist_tracks_with_token(playlist_id, access_token)
+    )
+    job.set_tracks([safe_track_name(t) for t in tracks])
+
+    job.set_stage("cache_lookup")
+    result_cache = get_result_cache()
+    with ssh_session() as ssh:
+        model_version = get_model_version(ssh, singer_name)
+        keys = [result_cache_key(t, singer_name, model_version) for t in tracks]
+        hits = result_cache.lookup(ssh, keys) if model_version else set()
+        # 결과 목록에 표시할 곡 정보 등록 (결과 파일이 동기화되면 목록에 추가됨)
+        catalog = get_output_catalog()
+        catalog.register_many(
+            [
+                (
+                    combined_output_name(track, singer_name),
+                    singer_name,
+                    track["title"],
+                    track["artists"],
+                )
+                for track in tracks
+            ]
+        )
+        # 캐시 적중 곡은 바로 동기화 단계로
+        os.makedirs("output", exist_ok=True)
+        for track, key in zip(tracks, keys):
+            if key in hits:
+                path = os.path.join("output", combined_output_name(track, singer_name))
+                result_cache.fetch(ssh, key, path)
+                catalog.add(path, save=False)
+                # 동기화 단계로 받은 결과 파일과 같은 output 이벤트 전달
+                publish(
+                    "output",
+                    {"file": os.path.basename(path), "size": os.path.getsize(path)},
+                )
+        catalog.save()
+    job.update_tracks(
+        [safe_track_name(t) for t, key in zip(tracks, keys) if key in hits], "cached"
+    )
+    misses = {key: track for track, key in zip(tracks, keys) if key not in hits}
+    if not misses:
+        job.complete(
+            {
+                "status": "playlist conversion completed (cached)",
+                "cached_tracks": len(hits),
+            }
         )
-        combine_jobid = submit_job(ssh, combine_cmd)
+        return
+
+    # 1. 캐시 미스 곡들만 이 작업의 작업 디렉토리(rvc/runs/<작업 ID>)에 다운로드
+    #    (동시에 실행되는 다른 변환 작업과 입력/중간/결과 파일을 공유하지 않음)
+    job.set_stage("downloading")
+    workspace = workspace_dir(job.id)
+    remote_combined_dir = f"{workspace}/combined"
+    name_to_key = {safe_track_name(t): key for key, t in misses.items()}
+    job.update_tracks(list(name_to_key), "downloading")
+    with ssh_session() as ssh:
+        prepare_workspace(ssh, workspace)
+    landed = download_playlist_to_gpu_via_ssh(
+        playlist_id,
+        access_token,
+        output_dir=f"{workspace}/input",
+        tracks=list(misses.values()),
+    )
+    track_names = [os.path.splitext(os.path.basename(p))[0] for p in landed]
+    job.update_tracks(
+        [name for name in name_to_key if name not in track_names],
+        "failed",
+        error="다운로드 실패",
+    )
+    if not track_names:
+        raise RuntimeError("다운로드된 곡이 없습니다")
+
+    # 2. 이후 Slurm 파이프라인 실행 (separate.sh, batch_infer.sh, combine.sh)
+    #    구간 단위 모드에서는 곡을 구간으로 나눠 구간마다 array task로 제출
+    job.set_stage("submitting")
+    pipeline_mode = get_pipeline_mode()
+    per_track = pipeline_mode != "batch"
+    segments = None
+    with ssh_session() as ssh:
+        if pipeline_mode == "segmented":
+            segments = plan_segments(ssh, workspace)
+            # 모든 곡의 첫 구간(앞쪽 array 인덱스)을 따로 먼저 제출해서
+            # 첫 구간의 추론/결합이 나머지 구간의 분리보다 먼저 스케줄되도록 함
+            first = sum(1 for s in segments if s["index"] == 0)
+            waves = [
+                submit_conversion_jobs(
+                    ssh,
+                    singer_name,
+                    track_count=count,
+                    workspace=workspace,
+                    array_start=start,
+                )
+                for start, count in ((0, first), (first, len(segments) - first))
+                if count
+            ]
+            job_ids = waves[0]
+        else:
+            job_ids = submit_conversion_jobs(
+                ssh,
+                singer_name,
+                track_count=len(track_names) if per_track else None,
+                workspace=workspace,
+            )
+            waves = [job_ids]
+    if not all(all(ids.values()) for ids in waves):
+        raise RuntimeError(f"Slurm 작업 제출 실패: {waves}")
+
+    # 3. combine이 끝나는 즉시 결과 동기화 (곡 단위 모드에서는 곡마다), 전부 끝나면 정리
+    combine_jobid = job_ids["combine"]
+    task_segments = {}
+    if segments:
+        # array task i는 i번째 구간, 곡의 마지막 구간 task가 끝나면 곡 전체 결과도 완성됨
+        task_ids = [
+            f"{waves[0 if i < first else 1]['combine']}_{i}"
+            for i in range(len(segments))
+        ]
+        tasks = {
+            task_id: f"{remote_combined_dir}/{singer_name}_{s['track']}.wav"
+            for task_id, s in zip(task_ids, segments)
+        }
+        task_tracks = {task_id: [s["track"]] for task_id, s in zip(task_ids, segments)}
+        task_segments = {
+            task_id: remote_segment_paths(remote_combined_dir, singer_name, s)
+            for task_id, s in zip(task_ids, segments)
+        }
+        durations = {}
+        for s in sorted(segments, key=lambda s: s["index"]):
+            durations.setdefault(s["track"], []).append(s["segment_duration"])
+        job.update(segments=durations)
+    elif per_track:
+        # array task i는 input/tracks.txt의 i번째 곡 (download manifest 순서)
+        tasks = {
+            f"{combine_jobid}_{i}": f"{remote_combined_dir}/{singer_name}_{name}.wav"
+            for i, name in enumerate(track_names)
+        }
+        task_tracks = {
+            f"{combine_jobid}_{i}": [name] for i, name in enumerate(track_names)
+        }
+    else:
+        tracker = get_job_tracker()
+        tracker.watch(job_ids["separate"])
+        tracker.watch(job_ids["batch_infer"])
+        tasks = {combine_jobid: None}
+        task_tracks = {combine_jobid: track_names}
+    # 캐시에 저장할 결과 파일 (combine.py 출력: combined/<가수>_<곡 파일명>.wav)
+    cache_entries = (
+        {
+            name_to_key[name]: f"{remote_combined_dir}/{singer_name}_{name}.wav"
+            for name in track_names
+            if name in name_to_key
+        }
+        if model_version
+        else {}
+    )
+    job.set_stage("converting")
+    job.update_tracks(track_names, "converting")
+    # 서버가 재시작되어도 같은 Slurm 작업을 이어서 추적할 수 있도록 저장
+    job.update(
+        job_ids=job_ids if len(waves) == 1 else waves,
+        pipeline_mode=pipeline_mode,
+        cached_tracks=len(hits),
+        conversion={
+            "tasks": tasks,
+            "task_tracks": task_tracks,
+            "task_segments": task_segments,
+            "cache_entries": cache_entries,
+            "workspace": workspace,
+        },
+    )
+    watch_conversion_tasks(
+        job, tasks, task_tracks, cache_entries, workspace, task_segments
+    )
 
-        # 4. combine 작업이 끝난 후 결과 파일 확인/다운로드
-        combined_dir = "/data/msj9518/repos/vcstream/rvc/combined"
-        time.sleep(240)
-        close_ssh(ssh)
 
-        # 5. 결과물 동기화 (다운로드)
-        sync_outputs_internal(
-            remote_output_dir="/data/msj9518/repos/vcstream/rvc/combined"
-        )
+def resume_conversion_job(job):
+    """
+    서버 재시작 전에 Slurm 작업을 추적 중이던 변환 작업을 이어서 추적
+    :return: 이어서 추적하면 True (Slurm 제출 전 단계였다면 False)
+    """
+    conversion = job.doc.get("conversion")
+    if job.doc.get("stage") != "converting" or not conversion:
+        return False
+    watch_conversion_tasks(
+        job,
+        conversion["tasks"],
+        conversion["task_tracks"],
+        conversion["cache_entries"],
+        conversion.get("workspace"),
+        conversion.get("task_segments"),
+    )
+    return True
+
 
-        # 6. clean (combine 작업 이후)
-        ssh = connect_ssh()
-        cleanup_cmd = (
-            "cd /data/msj9518/repos/vcstream/run && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f"sbatch --dependency=afterok:{combine_jobid} /data/msj9518/repos/vcstream/run/cleanup.sh"
+def watch_conversion_tasks(
+    job, tasks, task_tracks, cache_entries, workspace=None, task_segments=None
+):
+    """
+    combine 작업(또는 곡별/구간별 array task)을 추적하다가, 끝나는 즉시 결과 캐시 저장 + 동기화
+    모든 작업이 성공하면 작업 디렉토리 정리 (실패 시에는 afterok 체인과 동일하게 남겨둠)
+    :param job: 진행 상황을 기록할 Job (모든 작업이 끝나면 완료/실패 처리)
+    :param tasks: {combine job/task id: 원격 결과 파일 경로 (None이면 combined 전체)}
+    :param task_tracks: {combine job/task id: 해당 작업이 처리하는 곡 이름 목록}
+        (구간 단위 모드에서는 곡 하나를 여러 task가 처리, 곡의 task가 모두 끝나야 곡 완료)
+    :param cache_entries: 변환 결과 캐시에 저장할 {캐시 키: 원격 결과 파일 경로}
+    :param workspace: 작업 디렉토리 (없으면 공유 디렉토리를 사용하던 이전 작업)
+    :param task_segments: {combine task id: task가 끝나면 동기화할 원격 구간 파일 경로 목록}
+    """
+    remote_combined_dir = f"{workspace}/combined" if workspace else REMOTE_COMBINED_DIR
+    task_segments = task_segments or {}
+    lock = threading.Lock()
+    remaining = {"count": len(tasks), "failed": 0}
+    # 곡별로 아직 끝나지 않은 task 수, 실패한 task가 있는 곡
+    pending = {}
+    for names in task_tracks.values():
+        for name in names:
+            pending[name] = pending.get(name, 0) + 1
+    failed_tracks = set()
+
+    def on_done(task_id, remote_path, future):
+        try:
+            state = future.result()
+        except Exception as e:
+            state = f"UNKNOWN ({e})"
+        names = task_tracks.get(task_id, [])
+        error = None
+        if state != "COMPLETED":
+            error = f"combine 작업 실패: {state}"
+        elif task_segments.get(task_id):
+            # 게시된 구간은 곡 전체가 끝나기 전에 바로 동기화 (재생 목록에 추가됨)
+            try:
+                get_segment_syncer().sync(
+                    f"{remote_combined_dir}/segments", files=task_segments[task_id]
+                )
+            except Exception as e:
+                logging.error(f"[ERROR] 구간 동기화 실패: {e} ({task_id})")
+        with lock:
+            for name in names:
+                pending[name] -= 1
+            if error:
+                failed_tracks.update(names)
+            finished = not error and not failed_tracks.intersection(names)
+            finished = finished and all(pending[name] == 0 for name in names)
+        if finished:
+            try:
+                finish_combined_outputs(remote_path, cache_entries, remote_combined_dir)
+            except Exception as e:
+                error = f"결과 동기화 실패: {e}"
+        if error:
+            logging.error(f"[ERROR] {error} ({task_id})")
+            job.update_tracks(names, "failed", error=error)
+        elif finished:
+            job.update_tracks(names, "completed")
+        with lock:
+            remaining["count"] -= 1
+            if error:
+                remaining["failed"] += 1
+            last = remaining["count"] == 0
+            failed = remaining["failed"]
+        if not last:
+            return
+        if failed:
+            logging.error(f"[ERROR] combine 실패 {failed}/{len(tasks)}건, 정리 생략")
+            job.fail(f"combine 실패 {failed}/{len(tasks)}건")
+            return
+        if workspace is None:
+            # 공유 디렉토리는 다른 변환 작업이 사용 중일 수 있으므로 삭제하지 않음
+            logging.info(f"[LOG] 작업 디렉토리가 없는 이전 작업, 정리 생략 ({job.id})")
+        else:
+            try:
+                with ssh_session() as ssh:
+                    run_cleanup(ssh, workspace)
+            except Exception as e:
+                logging.error(f"[ERROR] 정리 작업 실패: {e}")
+        job.complete({"status": "playlist conversion completed"})
+
+    tracker = get_job_tracker()
+    for task_id, remote_path in tasks.items():
+        tracker.watch(task_id).add_done_callback(
+            lambda future, task_id=task_id, remote_path=remote_path: on_done(
+                task_id, remote_path, future
+            )
         )
-        submit_job(ssh, cleanup_cmd)
-        close_ssh(ssh)
-        return {"status": "playlist conversion started"}, 200
-    except Exception as e:
-        return {"error": str(e)}, 500
+
+
+def finish_combined_outputs(
+    remote_path, cache_entries, remote_output_dir=REMOTE_COMBINED_DIR
+):
+    """
+    combine이 끝난 결과를 변환 결과 캐시에 저장하고 로컬로 동기화
+    :param remote_path: 결과 파일 경로 (None이면 combined 디렉토리 전체)
+    :param remote_output_dir: combined 디렉토리 (작업 디렉토리의 combined)
+    """
+    if remote_path is None:
+        entries = cache_entries
+    else:
+        entries = {k: v for k, v in cache_entries.items() if v == remote_path}
+    if entries:
+        with ssh_session() as ssh:
+            get_result_cache().store(ssh, entries)
+    sync_outputs_internal(
+        remote_output_dir=remote_output_dir,
+        files=None if remote_path is None else [remote_path],
+    )
 
 
 @app.route("/convert_playlist", methods=["POST"])
@@ -601,43 +1024,48 @@ def convert_playlist():
     playlist_id = data.get("playlist_id")
     access_token = data.get("access_token")
     singer_name = data.get("singer_name")
-    result, status = convert_playlist_internal(playlist_id, access_token, singer_name)
-    return jsonify(result), status
-
-
-def playlist_polling_worker():
-    with app.app_context():
-        while conversion_mode_state["active"]:
-            access_token = conversion_mode_state["access_token"]
-            singer_name = conversion_mode_state["singer_name"]
-            if not access_token or not singer_name:
-                time.sleep(2)
-                continue
-            headers = {"Authorization": f"Bearer {access_token}"}
-            resp = requests.get("https://api.spotify.com/v1/me/player", headers=headers)
-            if resp.status_code == 200:
-                player = resp.json()
-                context = player.get("context")
-                if context and context.get("uri", "").startswith("spotify:playlist:"):
-                    playlist_id = context["uri"].split(":")[-1]
-                    # 변환 파이프라인 함수 직접 호출
-                    try:
-                        print(
-                            f"[LOG] Detected playlist_id: {playlist_id}, starting conversion..."
-                        )
-                        result, status = convert_playlist_internal(
-                            playlist_id, access_token, singer_name
-                        )
-                        print(
-                            f"[LOG] convert_playlist_internal result: {result}, status: {status}"
-                        )
-                    except Exception as e:
-                        print(f"[ERROR] Exception in polling thread: {e}")
-                    conversion_mode_state["active"] = False
-                    break
-            time.sleep(3)
+    if not playlist_id or not access_token or not singer_name:
+        return (
+            jsonify({"error": "playlist_id, access_token, singer_name are required"}),
+            400,
+        )
+    job_id = start_conversion_job(
+        "convert_playlist", playlist_id, access_token, singer_name
+    )
+    return jsonify({"job_id": job_id, "status": "queued"}), 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    변환 작업 진행 상황 조회 (단계, 곡별 상태, 단계/곡별 소요 시간)
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "job not found"}), 404
+    # 재시작 후 추적용 내부 정보는 응답에서 제외
+    job.pop("conversion", None)
+    counts = {}
+    for track in job["tracks"].values():
+        counts[track["status"]] = counts.get(track["status"], 0) + 1
+    job["progress"] = {"total": len(job["tracks"]), **counts}
+    return jsonify(job)
+
+
+def on_playlist_detected(user_id, playlist_id, access_token, singer_name):
+    """
+    재생 중인 플레이리스트가 바뀌었을 때 변환 작업 등록 (polling 스케줄러 콜백)
+    """
+    job_id = start_conversion_job(
+        "convert_playlist", playlist_id, access_token, singer_name
+    )
+    logging.info(f"[LOG] Conversion job queued for {user_id}: {job_id}")
 
 
 if __name__ == "__main__":
     logging.info("[LOG] Server started")
+    # 재시작 전에 추적 중이던 변환 작업 이어서 추적
+    get_job_manager().recover(resume_conversion_job)
+    # 재시작 전에 학습 중이던 가수의 학습 작업 이어서 추적
+    get_singer_status_watcher().resume()
     app.run(host="0.0.0.0", port=5000, debug=False, use_reloader=False)
@@ -0,0 +1,219 @@
+"""
+GPU 서버 도구 대역 (벤치마크용)
+yt-dlp, ffmpeg, ffprobe, jq, separate_train.py, rvc_cli.py 자리에 복사/연결되어 실행되며
+실행 파일 이름으로 흉내낼 도구를 결정하고, 실제 도구와 같은 이름의 출력 파일을 만듦
+separator_engine.py 자리에도 복사되어 실제 separate.py(stem 캐시 포함)가 이 SeparatorEngine을 사용
+- yt-dlp: FAKE_YTDLP_SECONDS만큼 대기(네트워크) 후 FAKE_TRACK_SECONDS 길이의 오디오 생성
+  (같은 영상이면 같은 내용, --audio-format wav가 없으면 압축 스트림 대역인 zlib 압축 PCM .m4a)
+- ffmpeg/ffprobe: 구간 분할(segment.py)이 사용하는 구간 디코딩(-ss/-t)/길이 조회만 지원
+- jq: train_atoz.sh가 사용하는 최상위 필드 조회(jq .<필드> <파일>)만 지원
+- separate/infer/train: 곡마다 FAKE_<단계>_SECONDS 동안 FFT로 CPU를 사용한 뒤 결과 WAV 생성
+  (곡보다 짧은 구간은 FAKE_TRACK_SECONDS 대비 길이에 비례해서 사용)
+- train: 학습 결과(best_model_info.json, epoch별 .pth, .index)를 --model_name 디렉토리에 생성
+  (train_atoz.sh가 이 파일들을 models/<가수>/로 복사해야 학습 성공)
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import wave
+import zlib
+import argparse
+import numpy as np
+
+SAMPLE_RATE = 16000
+COMPRESSED_MAGIC = b"FAKEZPCM"
+SEPARATION_VERSION = 1
+
+
+def setting(name, default):
+    return float(os.environ.get(name, default))
+
+
+def write_wav(path, samples):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes())
+
+
+def write_compressed(path, samples):
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+    with open(path, "wb") as out:
+        out.write(COMPRESSED_MAGIC + zlib.compress(pcm, 6))
+
+
+def read_wav(path):
+    """
+    WAV 또는 write_compressed 파일을 읽음 (압축 파일은 메모리에서 바로 디코딩)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(COMPRESSED_MAGIC)) == COMPRESSED_MAGIC:
+            data = np.frombuffer(zlib.decompress(f.read()), dtype="<i2")
+            return data.astype(np.float32) / 32767
+    with wave.open(path, "rb") as f:
+        data = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    return data.astype(np.float32) / 32767
+
+
+def burn(samples, seconds):
+    """
+    seconds 동안 samples에 FFT/역FFT를 반복 (합성 CPU 부하)
+    samples가 곡 길이(FAKE_TRACK_SECONDS)보다 짧으면 길이에 비례해서 줄임
+    """
+    if len(samples):
+        track_frames = SAMPLE_RATE * setting("FAKE_TRACK_SECONDS", 10)
+        seconds *= min(1.0, len(samples) / track_frames)
+    deadline = time.monotonic() + seconds
+    frame = samples[: 4096 * 16] if len(samples) else np.zeros(4096, np.float32)
+    while time.monotonic() < deadline:
+        np.fft.irfft(np.fft.rfft(frame))
+
+
+def yt_dlp(args):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source")
+    parser.add_argument("-o", dest="output")
+    parser.add_argument("-x", action="store_true")
+    parser.add_argument("--audio-format")
+    parser.add_argument("--print", dest="print_template")
+    args = parser.parse_args(args)
+    time.sleep(setting("FAKE_YTDLP_SECONDS", 0.2))
+    duration = setting("FAKE_TRACK_SECONDS", 10)
+    t = np.arange(int(SAMPLE_RATE * duration)) / SAMPLE_RATE
+    seed = sum(args.source.encode())
+    noise = np.random.default_rng(seed).standard_normal(len(t))
+    samples = 0.3 * np.sin(2 * np.pi * (220 + seed % 400) * t) + 0.05 * noise
+    if args.audio_format == "wav":
+        path = args.output.replace("%(ext)s", "wav")
+        write_wav(path, samples)
+    else:
+        path = args.output.replace("%(ext)s", "m4a")
+        write_compressed(path, samples)
+    if args.print_template:
+        print(path)
+
+
+def ffprobe(args):
+    # ffprobe -v error -show_entries format=duration -of csv=p=0 <파일>
+    print(len(read_wav(args[-1])) / SAMPLE_RATE)
+
+
+def jq(args):
+    # jq .<필드> <파일>
+    with open(args[-1], encoding="utf-8") as f:
+        print(json.dumps(json.load(f)[args[0].lstrip(".")]))
+
+
+def ffmpeg(args):
+    # ffmpeg -y -v error -ss <시작> -t <길이> -i <입력> ... <출력 WAV>
+    options = dict(zip(args, args[1:]))
+    start = int(float(options.get("-ss", 0)) * SAMPLE_RATE)
+    samples = read_wav(options["-i"])
+    if "-t" in options:
+        samples = samples[start : start + int(float(options["-t"]) * SAMPLE_RATE)]
+    else:
+        samples = samples[start:]
+    write_wav(args[-1], samples)
+
+
+class SeparatorEngine:
+    """
+    separator_engine.SeparatorEngine 대역 (같은 인터페이스)
+    """
+
+    def __init__(self, output_dir, **kwargs):
+        self.output_dir = output_dir
+
+    def run(self, jobs):
+        """
+        :param jobs: [(audio_path, {"Vocals": 경로, "Instrumental": 경로})] 목록
+        :return: 실패한 입력 파일 경로 목록
+        """
+        for audio_path, stem_paths in jobs:
+            samples = read_wav(audio_path)
+            burn(samples, setting("FAKE_SEPARATE_SECONDS", 1))
+            write_wav(stem_paths["Vocals"], samples * 0.6)
+            write_wav(stem_paths["Instrumental"], samples * 0.4)
+        return []
+
+
+def rvc_cli(args):
+    command, args = args[0], args[1:]
+    parser = argparse.ArgumentParser()
+    for name in (
+        "input_path",
+        "output_path",
+        "input_folder",
+        "output_folder",
+        "model_name",
+        "total_epoch",
+    ):
+        parser.add_argument(f"--{name}")
+    args, _ = parser.parse_known_args(args)
+    if command == "infer":
+        pairs = [(args.input_path, args.output_path)]
+    elif command == "batch_infer":
+        pairs = [
+            (
+                path,
+                os.path.join(
+                    args.output_folder,
+                    os.path.basename(path).replace(".wav", "_output.wav"),
+                ),
+            )
+            for path in sorted(glob.glob(os.path.join(args.input_folder, "*.wav")))
+        ]
+    else:
+        # preprocess/extract: 부하만, train: 부하 후 학습 결과 파일 생성
+        burn(np.zeros(0, np.float32), setting("FAKE_TRAIN_SECONDS", 1))
+        if command == "train":
+            write_model(args.model_name, int(args.total_epoch or 1))
+        return
+    for input_path, output_path in pairs:
+        samples = read_wav(input_path)
+        burn(samples, setting("FAKE_INFER_SECONDS", 1))
+        write_wav(output_path, samples[::-1])
+
+
+def write_model(model_dir, epoch):
+    """
+    rvc-cli 학습 결과와 같은 이름의 파일 생성 (<가수>_<epoch>e_<step>s.pth, <가수>.index)
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    name = os.path.basename(model_dir.rstrip("/"))
+    with open(os.path.join(model_dir, "best_model_info.json"), "w") as f:
+        json.dump({"epoch": epoch}, f)
+    for path in (f"{name}_{epoch}e_{epoch * 10}s.pth", f"{name}.index"):
+        with open(os.path.join(model_dir, path), "wb") as f:
+            f.write(os.urandom(1024))
+
+
+def separate_train(args):
+    burn(np.zeros(0, np.float32), setting("FAKE_SEPARATE_SECONDS", 1))
+
+
+TOOLS = {
+    "yt-dlp": yt_dlp,
+    "ffmpeg": ffmpeg,
+    "ffprobe": ffprobe,
+    "jq": jq,
+    "separate_train.py": separate_train,
+    "rvc_cli.py": rvc_cli,
+}
+
+
+def main():
+    tool = os.path.basename(sys.argv[0])
+    args = sys.argv[1:]
+    if tool not in TOOLS:
+        tool, args = args[0], args[1:]
+    TOOLS[tool](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import os
+import sys
+import json
+import socket
+import itertools
+import threading
+import subprocess
+import socketserver
+
+TERMINAL_STATES = {"COMPLETED", "FAILED"}
+
+
+class FakeSlurm:
+    """
+    Slurm 대역 (벤치마크용)
+    - sbatch/squeue/sacct 명령(shim)이 Unix 소켓으로 이 스케줄러에 요청
+    - --array, --dependency=afterok/aftercorr, --export=ALL,<이름>=<값> 지원
+    - GPU 파티션은 slots개, CPU 파티션(--partition=<cpu_partition>)은 cpu_slots개 task까지 동시 실행
+    - task는 제출된 작업 스크립트를 bash로 실행하고 exit status로 COMPLETED/FAILED 결정
+    """
+
+    def __init__(
+        self,
+        socket_path,
+        log_dir,
+        slots=2,
+        cpu_slots=4,
+        cpu_partition="cpu",
+        env=None,
+    ):
+        """
+        :param socket_path: shim과 통신할 Unix 소켓 경로
+        :param log_dir: task별 stdout/stderr 로그 디렉토리
+        :param slots: GPU 파티션에서 동시에 실행할 task 수 (GPU 수)
+        :param cpu_slots: CPU 파티션에서 동시에 실행할 task 수
+        :param cpu_partition: CPU 파티션 이름
+        :param env: 작업 스크립트 실행 환경변수
+        """
+        self.socket_path = socket_path
+        self.log_dir = log_dir
+        self.slots = {"gpu": slots, "cpu": cpu_slots}
+        self.cpu_partition = cpu_partition
+        self.env = dict(env or os.environ)
+        self._cond = threading.Condition()
+        self._ids = itertools.count(1000)
+        # job_id -> {"pool", "script", "args", "cwd", "env", "dependency", "tasks"}
+        self._jobs = {}
+        self._running = {"gpu": 0, "cpu": 0}
+        self._server = None
+
+    def start(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                request = json.loads(self.rfile.readline())
+                try:
+                    response = fake.handle(request)
+                except Exception as e:
+                    response = {"stdout": "", "stderr": f"{e}\n", "code": 1}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._schedule, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle(self, request):
+        command = {"sbatch": self.sbatch, "squeue": self.squeue, "sacct": self.sacct}
+        stdout = command[request["cmd"]](request["args"], request.get("cwd", "/"))
+        return {"stdout": stdout, "stderr": "", "code": 0}
+
+    def sbatch(self, args, cwd):
+        options = {}
+        args = list(args)
+        while args and args[0].startswith("--"):
+            name, _, value = args.pop(0)[2:].partition("=")
+            options[name] = value
+        script, script_args = args[0], args[1:]
+        indices = [None]
+        if "array" in options:
+            first, _, last = options["array"].partition("-")
+            indices = list(range(int(first), int(last or first) + 1))
+        dependency = None
+        if options.get("dependency"):
+            kind, _, dep_id = options["dependency"].partition(":")
+            dependency = (kind, dep_id)
+        env = {}
+        for item in options.get("export", "").split(","):
+            name, sep, value = item.partition("=")
+            if sep:
+                env[name] = value
+        pool = "cpu" if options.get("partition") == self.cpu_partition else "gpu"
+        with self._cond:
+            job_id = str(next(self._ids))
+            self._jobs[job_id] = {
+                "pool": pool,
+                "script": script,
+                "args": script_args,
+                "cwd": cwd,
+                "env": env,
+                "dependency": dependency,
+                "tasks": {i: {"state": "PENDING", "reason": "None"} for i in indices},
+            }
+            self._cond.notify_all()
+        return f"Submitted batch job {job_id}\n"
+
+    def _select(self, args):
+        ids = []
+        for i, arg in enumerate(args):
+            if arg == "-j" and i + 1 < len(args):
+                ids.extend(args[i + 1].split(","))
+        rows = []
+        with self._cond:
+            for requested in ids:
+                job_id, _, index = requested.partition("_")
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                for task_index, task in job["tasks"].items():
+                    if index and str(task_index) != index:
+                        continue
+                    name = job_id if task_index is None else f"{job_id}_{task_index}"
+                    rows.append((name, task["state"], task["reason"]))
+        return rows
+
+    def squeue(self, args, cwd):
+        # 추적기가 사용하는 형식(-o '%i|%T|%r')만 지원
+        return "".join(
+            f"{name}|{state}|{reason}\n"
+            for name, state, reason in self._select(args)
+            if state not in TERMINAL_STATES
+        )
+
+    def sacct(self, args, cwd):
+        # 추적기가 사용하는 형식(-o JobID,State)만 지원
+        return "".join(f"{name}|{state}\n" for name, state, _ in self._select(args))
+
+    def _dependency_state(self, job, index):
+        """
+        :return: "ready", "waiting", "never"
+        """
+        if job["dependency"] is None:
+            return "ready"
+        kind, dep_id = job["dependency"]
+        dep = self._jobs.get(dep_id)
+        if dep is None:
+            return "never"
+        if kind == "aftercorr" and index in dep["tasks"]:
+            states = [dep["tasks"][index]["state"]]
+        else:
+            states = [task["state"] for task in dep["tasks"].values()]
+        if any(state == "FAILED" for state in states):
+            return "never"
+        if all(state == "COMPLETED" for state in states):
+            return "ready"
+        return "waiting"
+
+    def _schedule(self):
+        while True:
+            with self._cond:
+                launch = None
+                for job_id, job in self._jobs.items():
+                    for index, task in job["tasks"].items():
+                        if task["state"] != "PENDING":
+                            continue
+                        dependency = self._dependency_state(job, index)
+                        if dependency == "never":
+                            task["reason"] = "DependencyNeverSatisfied"
+                        elif dependency == "waiting":
+                            task["reason"] = "Dependency"
+                        elif (
+                            launch is None
+                            and self._running[job["pool"]] < self.slots[job["pool"]]
+                        ):
+                            launch = (job_id, index)
+                        else:
+                            task["reason"] = "Resources"
+                if launch is None:
+                    self._cond.wait()
+                    continue
+                job_id, index = launch
+                job = self._jobs[job_id]
+                job["tasks"][index].update(state="RUNNING", reason="None")
+                self._running[job["pool"]] += 1
+            threading.Thread(
+                target=self._run_task, args=(job_id, job, index), daemon=True
+            ).start()
+
+    def _run_task(self, job_id, job, index):
+        env = dict(self.env, **job["env"], SLURM_JOB_ID=job_id)
+        name = job_id
+        if index is not None:
+            env.update(SLURM_ARRAY_JOB_ID=job_id, SLURM_ARRAY_TASK_ID=str(index))
+            name = f"{job_id}_{index}"
+        log_path = os.path.join(self.log_dir, f"{name}.out")
+        try:
+            with open(log_path, "wb") as log:
+                code = subprocess.call(
+                    ["bash", job["script"], *job["args"]],
+                    cwd=job["cwd"],
+                    env=env,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                )
+        except OSError:
+            code = 1
+        with self._cond:
+            job["tasks"][index]["state"] = "COMPLETED" if code == 0 else "FAILED"
+            self._running[job["pool"]] -= 1
+            self._cond.notify_all()
+
+    def states(self):
+        """
+        상태별 task 수
+        """
+        counts = {}
+        with self._cond:
+            for job in self._jobs.values():
+                for task in job["tasks"].values():
+                    counts[task["state"]] = counts.get(task["state"], 0) + 1
+        return counts
+
+
+def main():
+    """
+    sbatch/squeue/sacct shim: python fake_slurm.py <명령> [인자...]
+    """
+    request = {"cmd": sys.argv[1], "args": sys.argv[2:], "cwd": os.getcwd()}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(os.environ["FAKE_SLURM_SOCKET"])
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        response = json.loads(sock.makefile("rb").readline())
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["code"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+def playlist_tracks(playlist_id, size):
+    """
+    벤치마크용 플레이리스트의 곡 목록 (playlist_id로 결정되는 고정 목록)
+    :return: Spotify API의 track 객체 목록
+    """
+    return [
+        {
+            "id": f"{playlist_id}-t{i:04d}",
+            "name": f"Track {i:04d}",
+            "artists": [{"name": f"Artist {playlist_id}"}],
+        }
+        for i in range(size)
+    ]
+
+
+class FakeSpotifyServer:
+    """
+    Spotify Web API 대역 (벤치마크용)
+    - /v1/playlists/<id> (snapshot_id), /v1/playlists/<id>/tracks (offset/limit 페이지)
+    - /v1/me/player (등록된 플레이리스트를 재생 중), /v1/search (가수 검색)
+    - 모든 요청에 latency만큼 지연을 넣어 실제 API 왕복 시간을 흉내냄
+    """
+
+    def __init__(self, latency=0.05, host="127.0.0.1", port=0):
+        """
+        :param latency: 요청마다 추가할 지연 시간(초)
+        """
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._playlists = {}  # playlist_id -> 곡 수
+        self._playing = None
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def api_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def add_playlist(self, playlist_id, size):
+        with self._lock:
+            self._playlists[playlist_id] = size
+
+    def set_playing(self, playlist_id):
+        with self._lock:
+            self._playing = playlist_id
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(fake.latency)
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                parts = url.path.strip("/").split("/")[1:]  # "v1" 제외
+                if not self.headers.get("Authorization", "").startswith("Bearer "):
+                    return self._send(401, {"error": {"status": 401}})
+                if parts[:1] == ["playlists"] and len(parts) in (2, 3):
+                    return self._playlist(parts[1], parts[2:], query)
+                if parts == ["me", "player"]:
+                    return self._player()
+                if parts == ["search"]:
+                    return self._search(query)
+                return self._send(404, {"error": {"status": 404}})
+
+            def _playlist(self, playlist_id, rest, query):
+                with fake._lock:
+                    size = fake._playlists.get(playlist_id)
+                if size is None:
+                    return self._send(404, {"error": {"status": 404}})
+                if not rest:
+                    return self._send(200, {"snapshot_id": f"{playlist_id}-{size}"})
+                offset = int(query.get("offset", 0))
+                limit = min(int(query.get("limit", 100)), 100)
+                items = [
+                    {"track": track}
+                    for track in playlist_tracks(playlist_id, size)[
+                        offset : offset + limit
+                    ]
+                ]
+                next_url = None
+                if offset + limit < size:
+                    params = dict(query, offset=offset + limit, limit=limit)
+                    next_url = (
+                        f"{fake.api_url}/playlists/{playlist_id}/tracks?"
+                        f"{urlencode(params)}"
+                    )
+                return self._send(200, {"items": items, "next": next_url})
+
+            def _player(self):
+                with fake._lock:
+                    playing = fake._playing
+                if playing is None:
+                    self.send_response(204)
+                    self.end_headers()
+                    return
+                return self._send(
+                    200,
+                    {
+                        "is_playing": True,
+                        "context": {"uri": f"spotify:playlist:{playing}"},
+                        "item": {"id": f"{playing}-t0000"},
+                    },
+                )
+
+            def _search(self, query):
+                name = query.get("q", "")
+                artist = {"id": f"artist-{name}", "name": name, "images": []}
+                return self._send(200, {"artists": {"items": [artist]}})
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
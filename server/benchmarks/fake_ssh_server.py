@@ -0,0 +1,207 @@
+import os
+import socket
+import threading
+import subprocess
+import logging
+import paramiko
+
+
+class PathMapper:
+    """
+    GPU 서버 경로(remote_prefix)와 로컬 sandbox 경로(local_root)를 서로 변환
+    명령어/SFTP 경로는 sandbox 경로로, 명령 출력은 다시 GPU 서버 경로로 바꿔서
+    서버 코드는 실제 GPU 서버에 접속한 것과 같은 경로를 보게 됨
+    """
+
+    def __init__(self, remote_prefix, local_root):
+        self.remote_prefix = remote_prefix.rstrip("/")
+        self.local_root = os.path.abspath(local_root)
+
+    def to_local(self, text):
+        return text.replace(self.remote_prefix, self.local_root)
+
+    def to_remote(self, text):
+        return text.replace(self.local_root, self.remote_prefix)
+
+
+class _SFTPHandle(paramiko.SFTPHandle):
+    def stat(self):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+
+class LocalSFTPServer(paramiko.SFTPServerInterface):
+    """
+    sandbox 디렉토리를 GPU 서버 경로로 보여주는 SFTP 서버
+    """
+
+    def __init__(self, server, mapper, *args, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.mapper = mapper
+
+    def _local(self, path):
+        return self.mapper.to_local(self.canonicalize(path))
+
+    def _attributes(self, path, follow=True):
+        try:
+            st = os.stat(path) if follow else os.lstat(path)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        attr = paramiko.SFTPAttributes.from_stat(st)
+        attr.filename = os.path.basename(path)
+        return attr
+
+    def list_folder(self, path):
+        local = self._local(path)
+        try:
+            return [self._attributes(os.path.join(local, n)) for n in os.listdir(local)]
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        return self._attributes(self._local(path))
+
+    def lstat(self, path):
+        return self._attributes(self._local(path), follow=False)
+
+    def open(self, path, flags, attr):
+        local = self._local(path)
+        try:
+            fd = os.open(local, flags, 0o644)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        if flags & os.O_WRONLY:
+            mode = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            mode = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            mode = "rb"
+        handle = _SFTPHandle(flags)
+        handle.readfile = handle.writefile = os.fdopen(fd, mode)
+        return handle
+
+    def _call(self, func, *paths):
+        try:
+            func(*(self._local(p) for p in paths))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def remove(self, path):
+        return self._call(os.remove, path)
+
+    def rename(self, oldpath, newpath):
+        return self._call(os.rename, oldpath, newpath)
+
+    def posix_rename(self, oldpath, newpath):
+        return self._call(os.replace, oldpath, newpath)
+
+    def mkdir(self, path, attr):
+        return self._call(os.mkdir, path)
+
+    def rmdir(self, path):
+        return self._call(os.rmdir, path)
+
+    def chattr(self, path, attr):
+        return paramiko.SFTP_OK
+
+
+class _ServerInterface(paramiko.ServerInterface):
+    def __init__(self, fake):
+        self.fake = fake
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (self.fake.username, self.fake.password):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(
+            target=self.fake.execute, args=(channel, command.decode()), daemon=True
+        ).start()
+        return True
+
+
+class FakeSSHServer:
+    """
+    GPU 서버 SSH 대역 (벤치마크용)
+    - 비밀번호 인증, exec 채널(bash -c), SFTP 서브시스템 지원
+    - 명령은 env 환경변수로 실행하므로 PATH에 가짜 sbatch/yt-dlp 등을 넣어 둘 수 있음
+    """
+
+    def __init__(self, mapper, env=None, username="bench", password="bench"):
+        """
+        :param mapper: GPU 서버 경로 ↔ sandbox 경로 변환기
+        :param env: 원격 명령 실행 환경변수
+        """
+        self.mapper = mapper
+        self.env = dict(env or os.environ)
+        self.username = username
+        self.password = password
+        self.commands = 0
+        self._host_key = paramiko.RSAKey.generate(2048)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._transports = []
+
+    @property
+    def port(self):
+        return self._sock.getsockname()[1]
+
+    def start(self):
+        self._sock.listen(64)
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._sock.close()
+        for transport in self._transports:
+            transport.close()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self._host_key)
+            transport.set_subsystem_handler(
+                "sftp", paramiko.SFTPServer, LocalSFTPServer, self.mapper
+            )
+            self._transports.append(transport)
+            try:
+                transport.start_server(server=_ServerInterface(self))
+            except paramiko.SSHException as e:
+                logging.error(f"[ERROR] 벤치마크 SSH 협상 실패: {e}")
+
+    def execute(self, channel, command):
+        self.commands += 1
+        try:
+            process = subprocess.run(
+                ["bash", "-c", self.mapper.to_local(command)],
+                cwd=self.mapper.local_root,
+                env=self.env,
+                capture_output=True,
+            )
+            stdout = self.mapper.to_remote(process.stdout.decode(errors="replace"))
+            stderr = self.mapper.to_remote(process.stderr.decode(errors="replace"))
+            channel.sendall(stdout.encode())
+            channel.sendall_stderr(stderr.encode())
+            channel.send_exit_status(process.returncode)
+        except Exception as e:
+            logging.error(f"[ERROR] 벤치마크 SSH 명령 실패: {command} - {e}")
+            channel.send_exit_status(255)
+        finally:
+            channel.close()
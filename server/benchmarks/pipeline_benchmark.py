@@ -0,0 +1,527 @@
+"""
+변환 파이프라인 end-to-end 벤치마크
+GPU 클러스터/Spotify 없이 로컬 대역(SSH 서버, Slurm, Spotify API)을 띄우고
+Flask 서버에 여러 사용자의 플레이리스트 변환 요청을 동시에 보내 처리량/지연 시간을 측정
+
+사용법 (server 디렉토리에서):
+    python -m benchmarks.pipeline_benchmark --users 4 --tracks 10
+    python -m benchmarks.pipeline_benchmark --output result.json
+    python -m benchmarks.pipeline_benchmark --baseline result.json  # 회귀 시 exit 1
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import importlib
+import requests
+from urllib.parse import quote
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+GPU_RUN_DIR = os.path.join(
+    os.path.dirname(SERVER_DIR), "gpu_server_dir", "vcstream", "run"
+)
+REMOTE_PREFIX = "/data/msj9518"
+# 학습 중간 결과를 두는 GPU 노드 로컬 디렉토리 (train_atoz.sh)
+LOCAL_DATASETS_PREFIX = "/local_datasets/msj9518"
+
+sys.path.insert(0, SERVER_DIR)
+
+from benchmarks.fake_slurm import FakeSlurm  # noqa: E402
+from benchmarks.fake_spotify import FakeSpotifyServer, playlist_tracks  # noqa: E402
+from benchmarks.fake_ssh_server import FakeSSHServer, PathMapper  # noqa: E402
+
+# 실제 GPU 서버 스크립트 중 그대로(경로만 바꿔서) 실행하는 파일
+RUN_SCRIPTS = (
+    "timing.sh",
+    "separate.sh",
+    "separate.py",
+    "stem_cache.py",
+    "segment.py",
+    "batch_infer.sh",
+    "combine.sh",
+    "combine.py",
+    "cleanup.sh",
+    "separate_train.sh",
+    "train_atoz.sh",
+)
+
+
+def percentile(values, q):
+    """
+    nearest-rank 백분위수 (값이 없으면 None)
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, int(round(q / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def build_sandbox(root, singers, settings):
+    """
+    GPU 서버 디렉토리 구조를 흉내낸 sandbox 생성
+    - run/: 실제 작업 스크립트(경로만 sandbox로 변경), 분리 엔진/rvc_cli.py는 합성 부하 대역
+    - local_datasets/: GPU 노드 로컬 학습 디렉토리 (/local_datasets/msj9518 대신 사용)
+    - bin/: sbatch/squeue/sacct/yt-dlp/ffmpeg/ffprobe/jq/python shim
+    :return: (PathMapper, 원격 명령 실행 환경변수)
+    """
+    remote = os.path.join(root, "remote")
+    mapper = PathMapper(REMOTE_PREFIX, remote)
+    run_dir = os.path.join(remote, "repos", "vcstream", "run")
+    rvc_dir = os.path.join(remote, "repos", "vcstream", "rvc")
+    for sub in (
+        "input",
+        "hidden/vocal",
+        "hidden/inst",
+        "output",
+        "combined",
+        "metrics",
+    ):
+        os.makedirs(os.path.join(rvc_dir, sub), exist_ok=True)
+    os.makedirs(run_dir, exist_ok=True)
+    for name in RUN_SCRIPTS:
+        with open(os.path.join(GPU_RUN_DIR, name), encoding="utf-8") as f:
+            script = mapper.to_local(f.read()).replace(
+                LOCAL_DATASETS_PREFIX, os.path.join(root, "local_datasets")
+            )
+        with open(os.path.join(run_dir, name), "w", encoding="utf-8") as f:
+            f.write(script)
+    tools = os.path.join(BENCHMARK_DIR, "fake_gpu_tools.py")
+    rvc_cli_dir = os.path.join(remote, "repos", "rvc-cli")
+    os.makedirs(rvc_cli_dir, exist_ok=True)
+    shutil.copy(tools, os.path.join(run_dir, "separator_engine.py"))
+    shutil.copy(tools, os.path.join(run_dir, "separate_train.py"))
+    shutil.copy(tools, os.path.join(rvc_cli_dir, "rvc_cli.py"))
+    for singer in singers:
+        model_dir = os.path.join(rvc_dir, "models", singer)
+        os.makedirs(model_dir, exist_ok=True)
+        for name in (f"{singer}_best.pth", f"{singer}.index"):
+            with open(os.path.join(model_dir, name), "wb") as f:
+                f.write(os.urandom(1024))
+    conda_dir = os.path.join(remote, "anaconda3", "etc", "profile.d")
+    os.makedirs(conda_dir, exist_ok=True)
+    with open(os.path.join(conda_dir, "conda.sh"), "w") as f:
+        f.write("conda() { :; }\n")
+
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    shims = {
+        "python": f'exec "{sys.executable}" "$@"',
+        "yt-dlp": f'exec "{sys.executable}" "{tools}" yt-dlp "$@"',
+        "ffmpeg": f'exec "{sys.executable}" "{tools}" ffmpeg "$@"',
+        "ffprobe": f'exec "{sys.executable}" "{tools}" ffprobe "$@"',
+        "jq": f'exec "{sys.executable}" "{tools}" jq "$@"',
+    }
+    for name in ("sbatch", "squeue", "sacct"):
+        slurm = os.path.join(BENCHMARK_DIR, "fake_slurm.py")
+        shims[name] = f'exec "{sys.executable}" "{slurm}" {name} "$@"'
+    for name, body in shims.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(f"#!/bin/sh\n{body}\n")
+        os.chmod(path, 0o755)
+
+    env = dict(
+        os.environ,
+        PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""),
+        HOME=remote,
+        FAKE_SLURM_SOCKET=os.path.join(root, "slurm.sock"),
+        COMBINE_WORKERS="1",
+        **{k: str(v) for k, v in settings.items()},
+    )
+    return mapper, env
+
+
+class EndpointTimer:
+    """
+    엔드포인트별 응답 시간 기록 (thread-safe)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def request(self, session, method, url, name, **kwargs):
+        started = time.monotonic()
+        res = session.request(method, url, timeout=60, **kwargs)
+        elapsed = time.monotonic() - started
+        key = f"{method} {name}"
+        with self._lock:
+            self.samples.setdefault(key, []).append(elapsed)
+            if res.status_code >= 400:
+                self.errors[key] = self.errors.get(key, 0) + 1
+        return res
+
+    def summary(self):
+        with self._lock:
+            samples = {k: list(v) for k, v in self.samples.items()}
+            errors = dict(self.errors)
+        return {
+            name: {
+                "count": len(values),
+                "errors": errors.get(name, 0),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2),
+            }
+            for name, values in sorted(samples.items())
+        }
+
+
+def run_user(base_url, timer, user, playlist_id, singer, args, results):
+    """
+    사용자 한 명의 요청 흐름: 가수 목록 조회 → 플레이리스트 변환 요청 → 완료까지 진행 상황 조회
+    """
+    session = requests.Session()
+    timer.request(session, "GET", f"{base_url}/selected_singers", "/selected_singers")
+    posted_at = time.time()
+    res = timer.request(
+        session,
+        "POST",
+        f"{base_url}/convert_playlist",
+        "/convert_playlist",
+        json={
+            "playlist_id": playlist_id,
+            "access_token": f"token-{user}",
+            "singer_name": singer,
+        },
+    )
+    job_id = res.json()["job_id"]
+    deadline = time.monotonic() + args.timeout
+    job = None
+    first_audio_at = None
+    while time.monotonic() < deadline:
+        job = timer.request(
+            session, "GET", f"{base_url}/jobs/{job_id}", "/jobs/<job_id>"
+        ).json()
+        # 첫 곡의 재생 목록에 재생 가능한 구간이 생긴 시각 (곡 전체 완료 전이어도 됨)
+        if first_audio_at is None and job.get("tracks"):
+            track = quote(next(iter(job["tracks"])), safe="")
+            playlist = timer.request(
+                session,
+                "GET",
+                f"{base_url}/jobs/{job_id}/tracks/{track}/playlist.m3u8",
+                "/jobs/<job_id>/tracks/<track>/playlist.m3u8",
+            )
+            if "#EXTINF" in playlist.text:
+                first_audio_at = time.time()
+        if job.get("status") in ("completed", "failed"):
+            break
+        time.sleep(args.poll_interval)
+    results[user] = {
+        "posted_at": posted_at,
+        "first_audio_at": first_audio_at,
+        "job": job,
+    }
+
+
+def register_singers(base_url, timer, names):
+    """
+    가수 등록(POST /selected_singers: yt-dlp 다운로드 + 학습 작업 제출)을 동시에 요청
+    """
+    threads = []
+    for name in names:
+        session = requests.Session()
+        thread = threading.Thread(
+            target=timer.request,
+            args=(session, "POST", f"{base_url}/selected_singers", "/selected_singers"),
+            kwargs={"json": {"singer_name": name}},
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+
+def summarize(args, results, timer, started_at, slurm):
+    jobs = [r["job"] for r in results.values() if r["job"]]
+    counts = {}
+    errors = {}
+    first_track = []
+    first_audio = []
+    finished = []
+    for result in results.values():
+        job = result["job"] or {}
+        for track in job.get("tracks", {}).values():
+            counts[track["status"]] = counts.get(track["status"], 0) + 1
+            if track.get("error"):
+                errors[track["error"]] = errors.get(track["error"], 0) + 1
+        ended = [
+            t["ended_at"]
+            for t in job.get("tracks", {}).values()
+            if t["status"] in ("completed", "cached") and "ended_at" in t
+        ]
+        if ended:
+            first_track.append(min(ended) - result["posted_at"])
+        if result.get("first_audio_at"):
+            first_audio.append(result["first_audio_at"] - result["posted_at"])
+        if job.get("finished_at"):
+            finished.append(job["finished_at"])
+    wall = (max(finished) if finished else time.time()) - started_at
+    done = counts.get("completed", 0) + counts.get("cached", 0)
+    return {
+        "config": {
+            "users": args.users,
+            "tracks": args.tracks,
+            "slots": args.slots,
+            "cpu_slots": args.cpu_slots,
+            "pipeline_mode": args.pipeline_mode,
+            "cpu_stage_placement": args.cpu_stage_placement,
+            "download_format": args.download_format,
+            "singer_registrations": args.singer_registrations,
+        },
+        "tracks": {"requested": args.users * args.tracks, **counts},
+        "jobs": {
+            status: sum(1 for j in jobs if j.get("status") == status)
+            for status in ("completed", "failed", "running", "queued")
+        },
+        "wall_seconds": round(wall, 2),
+        "tracks_per_minute": round(done / wall * 60, 2) if wall > 0 else 0.0,
+        "time_to_first_track": {
+            "p50": _round(percentile(first_track, 50)),
+            "max": _round(max(first_track) if first_track else None),
+        },
+        "time_to_first_audio": {
+            "p50": _round(percentile(first_audio, 50)),
+            "max": _round(max(first_audio) if first_audio else None),
+        },
+        "endpoints": timer.summary(),
+        "slurm_tasks": slurm.states(),
+        "errors": errors,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def compare(result, baseline, tolerance):
+    """
+    기준 결과 대비 회귀 목록
+    - 처리량(tracks/minute)이 tolerance 이상 감소
+    - 첫 곡까지 시간, 엔드포인트 p99 지연이 tolerance 이상 증가 (5ms 미만 차이는 무시)
+    """
+    regressions = []
+    old, new = baseline["tracks_per_minute"], result["tracks_per_minute"]
+    if new < old * (1 - tolerance):
+        regressions.append(f"tracks_per_minute {old} → {new}")
+    old = baseline["time_to_first_track"]["p50"]
+    new = result["time_to_first_track"]["p50"]
+    if old is not None and (new is None or new > old * (1 + tolerance)):
+        regressions.append(f"time_to_first_track p50 {old}s → {new}s")
+    for name, stats in result["endpoints"].items():
+        if name not in baseline["endpoints"]:
+            continue
+        old, new = baseline["endpoints"][name]["p99_ms"], stats["p99_ms"]
+        if new > old * (1 + tolerance) and new - old > 5:
+            regressions.append(f"{name} p99 {old}ms → {new}ms")
+    return regressions
+
+
+def print_report(result):
+    print(
+        f"\n처리량: {result['tracks_per_minute']} tracks/min "
+        f"({result['tracks']}, {result['wall_seconds']}초)"
+    )
+    ttft = result["time_to_first_track"]
+    print(f"첫 곡까지 시간: p50 {ttft['p50']}초, max {ttft['max']}초")
+    ttfa = result["time_to_first_audio"]
+    print(f"첫 재생 가능 시점: p50 {ttfa['p50']}초, max {ttfa['max']}초")
+    print(f"작업: {result['jobs']}, Slurm task: {result['slurm_tasks']}")
+    for error, count in result["errors"].items():
+        print(f"  실패 {count}곡: {error}")
+    print(
+        f"{'endpoint':<28}{'count':>7}{'errors':>8}"
+        f"{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+    )
+    for name, stats in result["endpoints"].items():
+        print(
+            f"{name:<28}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=2, help="동시 사용자 수")
+    parser.add_argument(
+        "--tracks", type=int, default=5, help="사용자별 플레이리스트 곡 수"
+    )
+    parser.add_argument(
+        "--slots", type=int, default=2, help="GPU 파티션 동시 실행 Slurm task 수"
+    )
+    parser.add_argument(
+        "--cpu-slots", type=int, default=4, help="CPU 파티션 동시 실행 Slurm task 수"
+    )
+    parser.add_argument(
+        "--pipeline-mode",
+        choices=("per_track", "batch", "segmented"),
+        default="per_track",
+    )
+    parser.add_argument(
+        "--cpu-stage-placement",
+        choices=("fused", "cpu_partition", "gpu"),
+        default="fused",
+        help="결합 단계 배치 방식",
+    )
+    parser.add_argument(
+        "--download-format",
+        choices=("native", "wav"),
+        default="native",
+        help="원곡 다운로드 형식",
+    )
+    parser.add_argument(
+        "--singer-registrations",
+        type=int,
+        default=1,
+        help="변환 전에 등록할 가수 수 (POST /selected_singers)",
+    )
+    parser.add_argument("--track-seconds", type=float, default=10, help="곡 길이(초)")
+    parser.add_argument("--ytdlp-seconds", type=float, default=0.2)
+    parser.add_argument("--separate-seconds", type=float, default=0.5)
+    parser.add_argument("--infer-seconds", type=float, default=0.5)
+    parser.add_argument("--train-seconds", type=float, default=0.2)
+    parser.add_argument(
+        "--spotify-latency", type=float, default=0.05, help="Spotify API 지연(초)"
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 회귀 비율")
+    parser.add_argument("--keep", action="store_true", help="sandbox 디렉토리 유지")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    for name in ("output", "baseline"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    root = tempfile.mkdtemp(prefix="vcstream-bench-")
+    singer = "bench_singer"
+    new_singers = [f"bench_new_{i}" for i in range(args.singer_registrations)]
+    mapper, remote_env = build_sandbox(
+        root,
+        [singer],
+        {
+            "FAKE_TRACK_SECONDS": args.track_seconds,
+            "FAKE_YTDLP_SECONDS": args.ytdlp_seconds,
+            "FAKE_SEPARATE_SECONDS": args.separate_seconds,
+            "FAKE_INFER_SECONDS": args.infer_seconds,
+            "FAKE_TRAIN_SECONDS": args.train_seconds,
+        },
+    )
+    slurm = FakeSlurm(
+        remote_env["FAKE_SLURM_SOCKET"],
+        os.path.join(root, "slurm-logs"),
+        slots=args.slots,
+        cpu_slots=args.cpu_slots,
+        cpu_partition=os.environ.get("SLURM_CPU_PARTITION", "cpu"),
+        env=remote_env,
+    ).start()
+    ssh_server = FakeSSHServer(mapper, env=remote_env).start()
+    spotify = FakeSpotifyServer(latency=args.spotify_latency).start()
+    playlists = {f"bench{u}": args.tracks for u in range(args.users)}
+    for playlist_id, size in playlists.items():
+        spotify.add_playlist(playlist_id, size)
+
+    # 서버의 상대 경로(cache/, output/, input/ 등)가 sandbox 안에 생기도록 import 전에 이동
+    local_dir = os.path.join(root, "local")
+    os.makedirs(local_dir)
+    os.chdir(local_dir)
+    os.environ.update(
+        SSH_HOST="127.0.0.1",
+        SSH_PORT=str(ssh_server.port),
+        SSH_USER=ssh_server.username,
+        SSH_PASSWORD=ssh_server.password,
+        SPOTIFY_API_URL=spotify.api_url,
+        PIPELINE_MODE=args.pipeline_mode,
+        CPU_STAGE_PLACEMENT=args.cpu_stage_placement,
+        DOWNLOAD_AUDIO_FORMAT=args.download_format,
+        GPU_TIMING_MIN_INTERVAL="0",
+        SINGERS_FILE=os.path.join(local_dir, "selected_singer.json"),
+    )
+    os.environ.setdefault("SLURM_POLL_MIN_INTERVAL", "0.2")
+    os.environ.setdefault("SLURM_POLL_MAX_INTERVAL", "1")
+    server = importlib.import_module("app")
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    # 유튜브 검색은 대역이 없으므로 검색 캐시를 미리 채워서 캐시 적중 경로로 측정
+    from services.youtube_cache_service import get_youtube_cache, track_cache_keys
+
+    seeds = {}
+    for playlist_id, size in playlists.items():
+        for track in playlist_tracks(playlist_id, size):
+            for key in track_cache_keys({"title": track["name"], "id": track["id"]}):
+                seeds[key] = f"vid-{track['id']}"
+    for name in new_singers:
+        for key in track_cache_keys({"title": name}):
+            seeds[key] = f"vid-{name}"
+    get_youtube_cache().put_many(seeds)
+
+    from werkzeug.serving import make_server
+
+    http = make_server("127.0.0.1", 0, server.app, threaded=True)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{http.server_port}"
+
+    timer = EndpointTimer()
+    try:
+        if new_singers:
+            register_singers(base_url, timer, new_singers)
+        started_at = time.time()
+        results = {}
+        threads = [
+            threading.Thread(
+                target=run_user,
+                args=(base_url, timer, u, f"bench{u}", singer, args, results),
+            )
+            for u in range(args.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        timer.request(requests.Session(), "GET", f"{base_url}/metrics", "/metrics")
+        result = summarize(args, results, timer, started_at, slurm)
+    finally:
+        http.shutdown()
+        spotify.stop()
+        ssh_server.stop()
+        slurm.stop()
+        os.chdir(SERVER_DIR)
+        if args.keep:
+            print(f"sandbox: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print("\n[ERROR] 성능 회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n기준 결과 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,35 @@
 import os
 import yt_dlp
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from services.youtube_cache_service import get_youtube_cache, track_cache_keys
+from services.metrics_service import STAGE_SECONDS, STAGE_FAILURES
 
 SONGS_DIR = os.path.join("input", "songs")
 os.makedirs(SONGS_DIR, exist_ok=True)
 
+# native: 유튜브 원본 압축 스트림(opus/m4a 등)을 변환 없이 저장하고 분리 단계에서 바로 디코딩
+# wav: 다운로드 시 ffmpeg로 WAV 변환 (이전 방식, 파일 크기 약 10배)
+DOWNLOAD_AUDIO_FORMATS = ("native", "wav")
 
-def get_youtube_url(artist):
+
+def get_download_audio_format():
     """
-    아티스트로 유튜브에서 검색해 첫 번째 영상의 URL을 반환
-    :param title: 곡 제목
-    :param artist: 아티스트명
-    :return: 유튜브 영상 URL 또는 None
+    원곡 다운로드 형식 (환경변수 DOWNLOAD_AUDIO_FORMAT, 기본값: native)
+    """
+    audio_format = os.environ.get("DOWNLOAD_AUDIO_FORMAT", "native")
+    return audio_format if audio_format in DOWNLOAD_AUDIO_FORMATS else "native"
+
+
+def youtube_watch_url(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def search_youtube_video_id(query):
+    """
+    유튜브에서 query로 검색해 첫 번째 영상의 ID를 반환
+    :return: 영상 ID, 검색 결과가 없으면 None (검색 자체가 실패하면 예외 발생)
     """
-    query = f"{artist} lyrics"
     ydl_opts = {
         "quiet": True,
         "skip_download": True,
@@ -21,52 +37,128 @@ def get_youtube_url(artist):
         "default_search": "ytsearch1",
     }
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(query, download=False)
+    if "entries" in info and len(info["entries"]) > 0:
+        return info["entries"][0].get("id")
+    return None
+
+
+def get_youtube_url(title, artist=None):
+    """
+    곡 제목(+아티스트)으로 유튜브에서 검색해 첫 번째 영상의 URL을 반환
+    검색 결과는 유튜브 검색 캐시에 저장되어 다음 호출부터 재사용
+    :param title: 곡 제목 (아티스트만으로 검색할 때는 아티스트명)
+    :param artist: 아티스트명
+    :return: 유튜브 영상 URL 또는 None
+    """
+    track = {"title": title, "artists": artist}
+    video_id = resolve_youtube_ids([track])[0].get("video_id")
+    return youtube_watch_url(video_id) if video_id else None
+
+
+def resolve_youtube_ids(tracks, parallelism=None):
+    """
+    여러 곡의 유튜브 영상 ID를 한 번에 조회
+    - 캐시에서 한 번에 조회하고, 캐시에 없는 곡만 동시에 검색한 뒤 캐시에 저장
+    :param tracks: [{"title", "artists", "id"(선택)}] 목록
+    :param parallelism: 동시 검색 수 (기본값: 환경변수 YOUTUBE_RESOLVE_PARALLELISM 또는 4)
+    :return: 각 곡에 "video_id"를 추가한 목록
+        (검색 결과 없음이면 None, 검색 자체가 실패한 곡은 "video_id" 키 없음)
+    """
+    cache = get_youtube_cache()
+    keys_per_track = [track_cache_keys(t) for t in tracks]
+    cached = cache.get_many([k for keys in keys_per_track for k in keys])
+
+    resolved = [dict(t) for t in tracks]
+    misses = []
+    for track, keys in zip(resolved, keys_per_track):
+        hit = next((k for k in keys if k in cached), None)
+        if hit is not None:
+            track["video_id"] = cached[hit]
+        else:
+            misses.append((track, keys))
+    logging.info(
+        f"🔎 유튜브 검색 캐시: {len(tracks) - len(misses)}곡 적중, {len(misses)}곡 검색"
+    )
+
+    def search(item):
+        track, _ = item
+        artists = track.get("artists")
+        query = (
+            f"{track['title']} {artists} lyrics"
+            if artists
+            else f"{track['title']} lyrics"
+        )
         try:
-            info = ydl.extract_info(query, download=False)
-            if "entries" in info and len(info["entries"]) > 0:
-                video = info["entries"][0]
-                url = video.get("url")
-                logging.info(f"🔗 {query} → {url}")
-                return url
-            else:
-                logging.warning(f"❌ 검색 결과 없음: {query}")
-                return None
+            with STAGE_SECONDS.time(stage="youtube_resolve"):
+                video_id = search_youtube_video_id(query)
         except Exception as e:
+            STAGE_FAILURES.inc(stage="youtube_resolve")
             logging.error(f"❌ 유튜브 검색 실패: {query}\n{e}")
-            return None
+            return
+        if video_id:
+            logging.info(f"🔗 {query} → {video_id}")
+        else:
+            logging.warning(f"❌ 검색 결과 없음: {query}")
+        track["video_id"] = video_id
 
+    if parallelism is None:
+        parallelism = int(os.environ.get("YOUTUBE_RESOLVE_PARALLELISM", 4))
+    if misses:
+        with ThreadPoolExecutor(max_workers=max(1, parallelism)) as executor:
+            list(executor.map(search, misses))
+        cache.put_many(
+            {
+                key: track["video_id"]
+                for track, keys in misses
+                if "video_id" in track
+                for key in keys
+            }
+        )
+    return resolved
 
-def download_audio_as_wav(url, title, artist, output_dir=SONGS_DIR):
+
+def download_audio(url, title, artist, output_dir=SONGS_DIR, audio_format=None):
     """
-    주어진 유튜브 URL에서 오디오를 WAV 파일로 다운로드
+    주어진 유튜브 URL에서 오디오를 다운로드 (형식은 audio_format, 기본값은 DOWNLOAD_AUDIO_FORMAT 설정)
     :param url: 유튜브 동영상 URL
     :param title: 곡 제목
     :param artist: 아티스트명
     :param output_dir: 저장할 디렉토리 (기본값: input/songs)
+    :param audio_format: "wav"면 WAV로 변환, "native"면 원본 압축 스트림 그대로 저장
+        (기본값: get_download_audio_format())
     :return: 저장된 파일 경로
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
+    if audio_format is None:
+        audio_format = get_download_audio_format()
     safe_title = f"{title} - {artist}".replace("/", "_").replace("\\", "_")
-    output_path = os.path.join(output_dir, f"{safe_title}.wav")
+    output_path = os.path.join(output_dir, f"{safe_title}.%(ext)s")
+    extract = {"key": "FFmpegExtractAudio", "preferredcodec": "best"}
+    if audio_format == "wav":
+        extract.update(preferredcodec="wav", preferredquality="192")
     ydl_opts = {
         "format": "bestaudio/best",
         "outtmpl": output_path,
         "quiet": False,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "wav",
-                "preferredquality": "192",
-            }
-        ],
+        "postprocessors": [extract],
     }
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         try:
             logging.info(f"🎧 다운로드 중: {title} - {artist}")
-            ydl.download([url])
+            info = ydl.extract_info(url, download=True)
+            output_path = info["requested_downloads"][0]["filepath"]
             logging.info(f"✅ 저장 완료: {output_path}")
             return output_path
         except Exception as e:
             logging.error(f"❌ 다운로드 실패: {title} - {artist}\n{e}")
             return None
+
+
+def download_audio_as_wav(url, title, artist, output_dir=SONGS_DIR):
+    """
+    주어진 유튜브 URL에서 오디오를 WAV 파일로 다운로드 (설정과 관계없이 항상 WAV)
+    :return: 저장된 파일 경로
+    """
+    return download_audio(url, title, artist, output_dir, audio_format="wav")
@@ -0,0 +1,134 @@
+import os
+import json
+import queue
+import threading
+import itertools
+import collections
+import logging
+
+
+class Subscription:
+    def __init__(self, types, job_id, queue_size):
+        self.types = types
+        self.job_id = job_id
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def accepts(self, event):
+        if self.types and event["event"] not in self.types:
+            return False
+        if self.job_id and event["data"].get("job_id", self.job_id) != self.job_id:
+            return False
+        return True
+
+
+class EventBroker:
+    """
+    서버 이벤트(학습 상태, 곡별 변환 진행 상황, 새 결과 파일)를 구독자(SSE 연결)에게 전달
+    - publish는 구독자 큐에 넣기만 하므로 호출한 스레드(작업/동기화)를 막지 않음
+    - 이벤트마다 증가하는 id를 붙이고 최근 history개를 보관,
+      재연결 시 Last-Event-ID 이후 이벤트를 다시 전송
+    - 큐가 가득 찬 느린 구독자는 연결을 끊음 (재연결해서 Last-Event-ID로 이어받음)
+    """
+
+    def __init__(self, history=1000, queue_size=1000):
+        """
+        :param history: 재전송용으로 보관할 최근 이벤트 수
+        :param queue_size: 구독자별 대기 이벤트 최대 수
+        """
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history = collections.deque(maxlen=history)
+        self._subscribers = set()
+
+    def publish(self, event, data):
+        """
+        :param event: 이벤트 종류 (singer, job, track, output, segment)
+        :param data: JSON으로 직렬화할 수 있는 dict
+        """
+        with self._lock:
+            item = {"id": next(self._ids), "event": event, "data": data}
+            self._history.append(item)
+            for sub in list(self._subscribers):
+                if not sub.accepts(item):
+                    continue
+                try:
+                    sub.queue.put_nowait(item)
+                except queue.Full:
+                    sub.dropped = True
+                    self._subscribers.discard(sub)
+                    logging.warning("[LOG] 이벤트 구독자 큐가 가득 차서 연결 종료")
+
+    def subscribe(self, last_event_id=None, types=None, job_id=None):
+        """
+        :param last_event_id: 이 id 이후의 보관된 이벤트부터 전달 (재연결)
+        :param types: 받을 이벤트 종류 집합 (없으면 전체)
+        :param job_id: 지정하면 이 작업의 job/track 이벤트만 (다른 종류는 그대로 전달)
+        """
+        sub = Subscription(types, job_id, self.queue_size)
+        with self._lock:
+            if last_event_id is not None:
+                missed = [
+                    item
+                    for item in self._history
+                    if item["id"] > last_event_id and sub.accepts(item)
+                ]
+                for item in missed[-self.queue_size :]:
+                    sub.queue.put_nowait(item)
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def stream(self, sub, heartbeat=15):
+        """
+        SSE 응답 본문 생성기 (heartbeat초 동안 이벤트가 없으면 주석 줄을 보내 연결 유지)
+        """
+        try:
+            yield "retry: 3000\n\n"
+            while not sub.dropped:
+                try:
+                    item = sub.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(item["data"], ensure_ascii=False)
+                yield f"id: {item['id']}\nevent: {item['event']}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_event_broker():
+    """
+    프로세스 전역 EventBroker 반환
+    - EVENT_HISTORY, EVENT_QUEUE_SIZE 환경변수로 설정
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = EventBroker(
+                history=int(os.environ.get("EVENT_HISTORY", 1000)),
+                queue_size=int(os.environ.get("EVENT_QUEUE_SIZE", 1000)),
+            )
+        return _broker
+
+
+def publish(event, data):
+    """
+    get_event_broker().publish 단축 함수 (이벤트 전달 실패가 호출한 작업을 실패시키지 않음)
+    """
+    try:
+        get_event_broker().publish(event, data)
+    except Exception as e:
+        logging.error(f"[ERROR] 이벤트 전달 실패 ({event}): {e}")
@@ -0,0 +1,117 @@
+import os
+import shlex
+import threading
+import time
+import logging
+from services.ssh_service import ssh_session, run_command
+from services.metrics_service import STAGE_SECONDS, STAGE_FAILURES
+
+REMOTE_TIMING_FILE = "/data/msj9518/repos/vcstream/rvc/metrics/stage_timings.tsv"
+OFFSET_PATH = os.path.join("cache", "gpu_timing_offset")
+
+
+class GpuTimingCollector:
+    """
+    GPU 서버 작업 스크립트(timing.sh)가 기록한 단계별 소요 시간을 읽어 메트릭에 반영
+    - 마지막으로 읽은 위치(offset) 이후에 추가된 줄만 읽음 (offset은 로컬 파일에 저장)
+    - 파일이 잘렸거나 새로 만들어졌으면 처음부터 다시 읽음
+    - min_interval 안에 다시 호출되면 SSH 요청 없이 건너뜀
+    """
+
+    def __init__(
+        self, remote_path=REMOTE_TIMING_FILE, offset_path=OFFSET_PATH, min_interval=30
+    ):
+        """
+        :param remote_path: GPU 서버의 소요 시간 기록 파일 경로
+        :param offset_path: 읽은 위치를 저장할 로컬 파일 경로
+        :param min_interval: 최소 수집 간격(초)
+        """
+        self.remote_path = remote_path
+        self.offset_path = offset_path
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_collect = 0.0
+        self._offset = self._load_offset()
+
+    def _load_offset(self):
+        try:
+            with open(self.offset_path, "r") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _save_offset(self):
+        os.makedirs(os.path.dirname(self.offset_path) or ".", exist_ok=True)
+        tmp_path = f"{self.offset_path}.part"
+        with open(tmp_path, "w") as f:
+            f.write(str(self._offset))
+        os.replace(tmp_path, self.offset_path)
+
+    def collect(self, force=False):
+        """
+        새로 기록된 소요 시간을 읽어 vcstream_stage_seconds{stage="gpu_<단계>"}에 반영
+        :param force: min_interval과 관계없이 수집
+        :return: 반영한 줄 수
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._last_collect < self.min_interval:
+                return 0
+            self._last_collect = time.monotonic()
+            path = shlex.quote(self.remote_path)
+            # 첫 줄: "<파일 크기> <읽기 시작 위치>", 이후: 새로 추가된 내용
+            command = (
+                f"[ -f {path} ] || exit 0; s=$(stat -c %s {path}); o={self._offset}; "
+                '[ "$s" -lt "$o" ] && o=0; echo "$s $o"; '
+                f"tail -c +$((o + 1)) {path} | head -c $((s - o))"
+            )
+            with ssh_session() as ssh:
+                _, output = run_command(ssh, command, label="gpu_timing")
+            header, _, body = output.partition("\n")
+            if not header:
+                return 0
+            _, start = (int(v) for v in header.split())
+            # 기록 중인 마지막 줄(개행 없음)은 다음 수집 때 읽음
+            complete = body[: body.rfind("\n") + 1]
+            count = 0
+            for line in complete.splitlines():
+                if self._observe(line):
+                    count += 1
+            self._offset = start + len(complete.encode())
+            self._save_offset()
+        if count:
+            logging.info(f"[LOG] GPU 작업 소요 시간 {count}건 수집")
+        return count
+
+    @staticmethod
+    def _observe(line):
+        parts = line.split("\t")
+        if len(parts) < 6:
+            return False
+        stage, _, _, started, ended, status = parts[:6]
+        try:
+            elapsed = float(ended) - float(started)
+        except ValueError:
+            return False
+        STAGE_SECONDS.observe(elapsed, stage=f"gpu_{stage}")
+        if status != "0":
+            STAGE_FAILURES.inc(stage=f"gpu_{stage}")
+        return True
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_gpu_timing_collector():
+    """
+    프로세스 전역 GpuTimingCollector 반환
+    - GPU_TIMING_FILE, GPU_TIMING_MIN_INTERVAL 환경변수로 설정
+    """
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = GpuTimingCollector(
+                remote_path=os.environ.get("GPU_TIMING_FILE", REMOTE_TIMING_FILE),
+                min_interval=float(os.environ.get("GPU_TIMING_MIN_INTERVAL", 30)),
+            )
+        return _collector
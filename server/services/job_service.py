@@ -0,0 +1,324 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from services.metrics_service import JOB_STAGE_SECONDS, JOBS_TOTAL
+from services.event_service import publish
+
+JOB_STORE_PATH = os.path.join("cache", "jobs.sqlite3")
+
+FINAL_STATUSES = {"completed", "failed"}
+
+
+class JobStore:
+    """
+    변환 작업 상태를 저장하는 SQLite 저장소 (서버 재시작 후에도 유지)
+    작업 하나를 JSON 문서 한 행으로 저장
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT, updated_at REAL, doc TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+        self._conn.commit()
+
+    def save(self, job):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, status, updated_at, doc) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    job["id"],
+                    job["status"],
+                    job["updated_at"],
+                    json.dumps(job, ensure_ascii=False),
+                ),
+            )
+            self._conn.commit()
+
+    def load(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_unfinished(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc FROM jobs WHERE status NOT IN ('completed', 'failed')"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def prune(self, older_than):
+        """
+        끝난 지 older_than 초가 지난 작업 삭제
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('completed', 'failed') "
+                "AND updated_at < ?",
+                (time.time() - older_than,),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+class Job:
+    """
+    실행 중인 작업의 진행 상황을 기록하는 핸들
+    - 단계(stage)별 시작/종료 시각, 곡별 상태/소요 시간
+    - 값이 바뀔 때마다 JobStore에 저장
+    - 단계/상태 변경은 job 이벤트, 곡 상태 변경은 track 이벤트로 전달 (GET /events)
+    """
+
+    def __init__(self, manager, doc):
+        self._manager = manager
+        self._doc = doc
+
+    @property
+    def id(self):
+        return self._doc["id"]
+
+    @property
+    def doc(self):
+        return self._doc
+
+    def set_stage(self, stage):
+        """
+        현재 단계 변경 (이전 단계의 종료 시각/소요 시간 기록)
+        """
+        now = time.time()
+        with self._manager.lock:
+            timings = self._doc["timings"]
+            previous = self._doc.get("stage")
+            if previous in timings and "ended_at" not in timings[previous]:
+                self._end_timing_locked(timings[previous], now)
+                JOB_STAGE_SECONDS.observe(timings[previous]["seconds"], stage=previous)
+            timings[stage] = {"started_at": now}
+            self._doc["stage"] = stage
+            self._doc["status"] = "running"
+            self._save_locked(now)
+        self._publish_job()
+
+    def set_tracks(self, names, status="pending"):
+        """
+        곡 목록 등록 (이미 등록된 곡은 유지)
+        """
+        now = time.time()
+        with self._manager.lock:
+            tracks = self._doc["tracks"]
+            for name in names:
+                tracks.setdefault(name, {"status": status, "updated_at": now})
+            self._save_locked(now)
+
+    def update_tracks(self, names, status, error=None):
+        """
+        곡 상태 변경 (처음 진행 상태가 된 시각부터 완료/실패까지의 소요 시간 기록)
+        """
+        now = time.time()
+        with self._manager.lock:
+            for name in names:
+                track = self._doc["tracks"].setdefault(name, {})
+                track.setdefault("started_at", now)
+                track["status"] = status
+                track["updated_at"] = now
+                if error:
+                    track["error"] = error
+                if status in FINAL_STATUSES or status == "cached":
+                    self._end_timing_locked(track, now)
+            self._save_locked(now)
+        for name in names:
+            event = {"job_id": self.id, "track": name, "status": status}
+            if error:
+                event["error"] = error
+            publish("track", event)
+
+    def update(self, **fields):
+        """
+        작업 문서에 임의의 필드 저장 (예: Slurm job id, 재시작 후 이어서 추적할 정보)
+        """
+        now = time.time()
+        with self._manager.lock:
+            self._doc.update(fields)
+            self._save_locked(now)
+
+    def complete(self, result=None):
+        self._finish("completed", result=result)
+
+    def fail(self, error):
+        self._finish("failed", error=str(error))
+
+    def _finish(self, status, result=None, error=None):
+        now = time.time()
+        with self._manager.lock:
+            stage = self._doc.get("stage")
+            timing = self._doc["timings"].get(stage)
+            if timing is not None and "ended_at" not in timing:
+                self._end_timing_locked(timing, now)
+                JOB_STAGE_SECONDS.observe(timing["seconds"], stage=stage)
+            self._doc["status"] = status
+            self._doc["finished_at"] = now
+            self._doc["elapsed"] = round(now - self._doc["created_at"], 3)
+            if result is not None:
+                self._doc["result"] = result
+            if error is not None:
+                self._doc["error"] = error
+            self._save_locked(now)
+        JOBS_TOTAL.inc(kind=self._doc["kind"], status=status)
+        self._publish_job()
+        logging.info(f"[LOG] 작업 {self.id} {status} ({self._doc['elapsed']}초)")
+
+    def _publish_job(self):
+        doc = self._doc
+        event = {
+            "job_id": self.id,
+            "kind": doc["kind"],
+            "status": doc["status"],
+            "stage": doc.get("stage"),
+        }
+        if doc.get("error"):
+            event["error"] = doc["error"]
+        publish("job", event)
+
+    @staticmethod
+    def _end_timing_locked(timing, now):
+        timing["ended_at"] = now
+        timing["seconds"] = round(now - timing.get("started_at", now), 3)
+
+    def _save_locked(self, now):
+        self._doc["updated_at"] = now
+        self._manager.store.save(self._doc)
+
+
+class JobManager:
+    """
+    변환 요청을 백그라운드에서 실행하는 작업 관리자
+    - submit()은 작업 ID를 바로 반환하고, 제한된 크기의 스레드 풀에서 실행
+    - 작업 상태는 JobStore에 저장되어 GET /jobs/<id>로 조회 가능
+    - 서버 재시작 시 끝나지 않은 작업은 resume 함수로 이어서 추적하거나 실패 처리
+    """
+
+    def __init__(self, store, workers=4):
+        """
+        :param store: JobStore
+        :param workers: 동시에 실행할 작업 수
+        """
+        self.store = store
+        self.lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="job"
+        )
+        self._jobs = {}  # 실행 중인 작업: id -> Job
+
+    def submit(self, kind, params, fn):
+        """
+        작업 등록 후 백그라운드에서 fn(job) 실행
+        fn이 반환되면 작업을 완료 처리하지 않음 (작업이 job.complete/fail로 직접 종료)
+        fn에서 예외가 발생하면 실패 처리
+        :param kind: 작업 종류 (예: convert_playlist)
+        :param params: 저장할 요청 파라미터 (토큰 등 민감한 값은 제외)
+        :return: 작업 ID
+        """
+        now = time.time()
+        doc = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "params": params,
+            "status": "queued",
+            "stage": None,
+            "tracks": {},
+            "timings": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        job = Job(self, doc)
+        with self.lock:
+            self._jobs[job.id] = job
+            self.store.save(doc)
+        job._publish_job()
+        self._executor.submit(self._run, job, fn)
+        logging.info(f"[LOG] 작업 등록: {job.id} ({kind})")
+        return job.id
+
+    def _run(self, job, fn):
+        try:
+            fn(job)
+        except Exception as e:
+            logging.error(f"[ERROR] 작업 {job.id} 실패: {e}")
+            job.fail(e)
+        finally:
+            with self.lock:
+                if job.doc["status"] in FINAL_STATUSES:
+                    self._jobs.pop(job.id, None)
+
+    def attach(self, doc):
+        """
+        저장된 작업 문서로 Job 핸들 생성 (재시작 후 이어서 추적할 때 사용)
+        """
+        job = Job(self, doc)
+        with self.lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        """
+        작업 상태 조회
+        :return: 작업 문서 dict, 없으면 None
+        """
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if job.doc["status"] in FINAL_STATUSES:
+                    self._jobs.pop(job_id, None)
+                return json.loads(json.dumps(job.doc))
+        return self.store.load(job_id)
+
+    def recover(self, resume):
+        """
+        재시작 전에 끝나지 않은 작업 처리
+        :param resume: resume(job) -> 이어서 추적했으면 True, 불가능하면 False
+        """
+        for doc in self.store.load_unfinished():
+            job = self.attach(doc)
+            try:
+                resumed = resume(job)
+            except Exception as e:
+                logging.error(f"[ERROR] 작업 {job.id} 재개 실패: {e}")
+                resumed = False
+            if resumed:
+                logging.info(f"[LOG] 작업 재개: {job.id} (stage={doc.get('stage')})")
+            else:
+                job.fail("서버 재시작으로 중단됨")
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """
+    프로세스 전역 JobManager 반환
+    - JOB_STORE_PATH, JOB_WORKERS, JOB_RETENTION_DAYS 환경변수로 설정
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            store = JobStore(os.environ.get("JOB_STORE_PATH", JOB_STORE_PATH))
+            pruned = store.prune(
+                float(os.environ.get("JOB_RETENTION_DAYS", 7)) * 24 * 3600
+            )
+            if pruned:
+                logging.info(f"[LOG] 오래된 작업 기록 {pruned}개 삭제")
+            _manager = JobManager(store, workers=int(os.environ.get("JOB_WORKERS", 4)))
+        return _manager
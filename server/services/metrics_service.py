@@ -0,0 +1,205 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# 지연 시간 히스토그램 기본 구간(초): SSH 명령/HTTP 요청부터 GPU 작업까지
+DEFAULT_BUCKETS = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    600,
+    1800,
+    3600,
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    단조 증가 카운터 (라벨 조합별로 값 유지)
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """
+    지연 시간 히스토그램 (라벨 조합별 누적 bucket/합계/개수)
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._lock = threading.Lock()
+        self._values = {}  # key -> [bucket별 개수, 합계, 개수]
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        with 블록 실행 시간을 기록 (예외가 나도 기록)
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(
+                (key, (list(entry[0]), entry[1], entry[2]))
+                for key, entry in self._values.items()
+            )
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames, key, ("le", _format_value(float(bound)))
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(float(total))}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """
+    메트릭 목록을 Prometheus text format(0.0.4)으로 출력
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# 파이프라인 단계: youtube_resolve, ytdlp_download, slurm_queue_wait, slurm_run,
+# gpu_separate, gpu_batch_infer, gpu_combine, output_sync
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "vcstream_stage_seconds", "Latency of pipeline stages in seconds", ["stage"]
+    )
+)
+STAGE_FAILURES = REGISTRY.register(
+    Counter("vcstream_stage_failures_total", "Failed pipeline stage runs", ["stage"])
+)
+JOB_STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "vcstream_job_stage_seconds",
+        "Wall-clock time conversion jobs spend in each stage",
+        ["stage"],
+    )
+)
+JOBS_TOTAL = REGISTRY.register(
+    Counter("vcstream_jobs_total", "Finished conversion jobs", ["kind", "status"])
+)
+SSH_COMMAND_SECONDS = REGISTRY.register(
+    Histogram(
+        "vcstream_ssh_command_seconds",
+        "Latency of remote commands run over SSH",
+        ["command"],
+    )
+)
+SSH_COMMAND_FAILURES = REGISTRY.register(
+    Counter(
+        "vcstream_ssh_command_failures_total",
+        "Remote commands that exited non-zero or raised",
+        ["command"],
+    )
+)
+SPOTIFY_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "vcstream_spotify_request_seconds",
+        "Latency of Spotify Web API requests",
+        ["endpoint", "status"],
+    )
+)
+SPOTIFY_PLAYLIST_CACHE = REGISTRY.register(
+    Counter(
+        "vcstream_spotify_playlist_cache_total",
+        "Playlist track list lookups by snapshot_id cache result",
+        ["result"],
+    )
+)
+TRANSFER_BYTES = REGISTRY.register(
+    Counter(
+        "vcstream_transfer_bytes_total",
+        "Bytes transferred over SFTP",
+        ["direction"],
+    )
+)
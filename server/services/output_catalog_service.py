@@ -0,0 +1,324 @@
+import os
+import json
+import time
+import wave
+import base64
+import bisect
+import threading
+import logging
+from services.singer_registry_service import get_singer_registry
+
+CATALOG_DIR = "output"
+CATALOG_PATH = os.path.join("cache", "output_catalog.json")
+# 결과 파일이 생기지 않은 등록 정보(변환 실패 등)를 보관하는 기간(초)
+PENDING_TTL = 7 * 24 * 3600
+
+
+def local_name(text):
+    return text.replace(" ", "_")
+
+
+def parse_output_name(name, singers=()):
+    """
+    등록 정보가 없는 결과 파일명(<가수>_<제목> - <아티스트>.wav, 공백은 _)에서 메타데이터 추정
+    :param singers: 알려진 가수 이름 목록 (이름에 _/공백이 있는 가수를 구분하는 데 사용)
+    """
+    base = os.path.splitext(name)[0]
+    singer = None
+    for candidate in sorted(singers, key=len, reverse=True):
+        if base.startswith(local_name(candidate) + "_"):
+            singer = candidate
+            base = base[len(local_name(candidate)) + 1 :]
+            break
+    if singer is None:
+        singer, _, base = base.partition("_") if "_" in base else ("", "", base)
+    title, _, artists = base.partition("_-_")
+    return {
+        "singer": singer,
+        "title": title.replace("_", " "),
+        "artists": artists.replace("_", " "),
+    }
+
+
+def wav_duration(path):
+    try:
+        with wave.open(path, "rb") as f:
+            return round(f.getnframes() / f.getframerate(), 3)
+    except (OSError, EOFError, wave.Error):
+        return None
+
+
+def encode_cursor(key):
+    raw = json.dumps(list(key), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    :raise ValueError: 잘못된 cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, name = json.loads(raw)
+        return float(sort_key), str(name)
+    except Exception as e:
+        raise ValueError(f"잘못된 cursor: {cursor}") from e
+
+
+class OutputCatalog:
+    """
+    결과 파일(output/*.wav) 목록 인덱스
+    - 파일별 메타데이터(가수, 제목, 아티스트, 길이, 크기, 생성 시각)를 메모리에 보관하고 JSON 파일에 저장
+    - 메타데이터는 변환 요청 시 register()로 등록하고, 동기화 단계가 파일을 받으면 add()로 완성
+      (목록 조회 시 디렉토리를 읽거나 파일명을 해석하지 않음)
+    - 디렉토리와의 대조는 시작 시 한 번만 수행 (빠진 파일 추가, 사라진 파일 제거)
+    - 최신순 정렬 목록을 전체/가수별로 유지해서 cursor 페이지 조회가 O(log n + limit)
+    - 내용이 바뀔 때마다 version이 바뀜 (ETag)
+    - add(save=False)로 바뀐 내용은 save()를 호출할 때 한 번에 저장 (동기화 단계는 sync가 끝날 때 저장)
+    """
+
+    def __init__(self, output_dir=CATALOG_DIR, path=CATALOG_PATH, singers=None):
+        """
+        :param output_dir: 결과 파일 디렉토리
+        :param path: 인덱스 저장 파일(JSON) 경로
+        :param singers: 등록 정보가 없는 파일의 가수 이름 추정에 사용할 함수 (이름 목록 반환)
+        """
+        self.output_dir = output_dir
+        self.path = path
+        self.singers = singers or (lambda: [])
+        self._lock = threading.Lock()
+        self._entries = {}  # 파일명 -> 메타데이터
+        self._pending = {}  # 파일명 -> 파일이 생기기 전에 등록된 메타데이터
+        self._order = []  # 전체 정렬 키 (-created_at, 파일명)
+        self._by_singer = {}  # 가수 -> 정렬 키 목록
+        self._boot = int(time.time())
+        self._changes = 0
+        self._dirty = False
+        self._load()
+        self.reconcile()
+
+    @property
+    def version(self):
+        return f"{self._boot}-{self._changes}"
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"[LOG] 결과 목록 인덱스 로드 실패, 새로 작성: {e}")
+            return
+        self._pending = data.get("pending", {})
+        for entry in data.get("entries", []):
+            self._insert_locked(entry)
+
+    def _changed_locked(self):
+        self._changes += 1
+        self._dirty = True
+
+    def _save_locked(self):
+        now = time.time()
+        self._pending = {
+            name: meta
+            for name, meta in self._pending.items()
+            if now - meta.get("registered_at", now) < PENDING_TTL
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"entries": list(self._entries.values()), "pending": self._pending},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def save(self):
+        """
+        메모리에서 바뀐 내용이 있으면 파일로 저장
+        """
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+    @staticmethod
+    def _key(entry):
+        return (-entry["created_at"], entry["file"])
+
+    def _insert_locked(self, entry):
+        self._remove_locked(entry["file"])
+        self._entries[entry["file"]] = entry
+        key = self._key(entry)
+        bisect.insort(self._order, key)
+        bisect.insort(self._by_singer.setdefault(entry["singer"], []), key)
+
+    def _remove_locked(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return False
+        key = self._key(entry)
+        for keys in (self._order, self._by_singer.get(entry["singer"], [])):
+            index = bisect.bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+        if not self._by_singer.get(entry["singer"]):
+            self._by_singer.pop(entry["singer"], None)
+        return True
+
+    def register(self, name, singer, title, artists):
+        """
+        결과 파일이 생기기 전에 메타데이터 등록 (변환 요청 시점, 이미 있는 파일이면 바로 갱신)
+        :param name: 결과 파일명 (output 디렉토리 기준)
+        """
+        self.register_many([(name, singer, title, artists)])
+
+    def register_many(self, entries):
+        """
+        여러 결과 파일의 메타데이터를 한 번에 등록 (플레이리스트 단위, 저장은 한 번)
+        :param entries: [(결과 파일명, 가수, 제목, 아티스트)] 목록
+        """
+        now = time.time()
+        with self._lock:
+            for name, singer, title, artists in entries:
+                meta = {
+                    "singer": singer,
+                    "title": title,
+                    "artists": artists,
+                    "registered_at": now,
+                }
+                self._pending[name] = meta
+                entry = self._entries.get(name)
+                if entry is not None:
+                    self._insert_locked(dict(entry, **self._meta(meta)))
+            self._changed_locked()
+            self._save_locked()
+
+    @staticmethod
+    def _meta(meta):
+        return {k: meta[k] for k in ("singer", "title", "artists")}
+
+    def _entry_locked(self, name, st, duration, singers):
+        """
+        :param singers: 등록 정보가 없을 때 파일명 해석에 쓸 가수 이름 목록
+            (가수 목록 조회는 가수 레지스트리 잠금을 잡으므로 self._lock 밖에서 미리 구함)
+        """
+        meta = self._pending.get(name) or self._entries.get(name)
+        if meta is None:
+            meta = parse_output_name(name, singers)
+        return {
+            "file": name,
+            **self._meta(meta),
+            "duration": duration,
+            "size": st.st_size,
+            "created_at": round(st.st_mtime, 3),
+        }
+
+    def add(self, path, save=True):
+        """
+        결과 파일이 새로 생기거나 바뀌었을 때 호출 (동기화 단계, 결과 캐시에서 가져온 경우)
+        :param save: False면 목록만 갱신하고 파일 저장은 다음 save() 호출로 미룸
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        duration = wav_duration(path)
+        name = os.path.basename(path)
+        singers = self.singers()
+        with self._lock:
+            self._insert_locked(self._entry_locked(name, st, duration, singers))
+            self._changed_locked()
+            if save:
+                self._save_locked()
+
+    def remove(self, name):
+        with self._lock:
+            if self._remove_locked(name):
+                self._changed_locked()
+                self._save_locked()
+
+    def reconcile(self):
+        """
+        디렉토리와 인덱스 대조 (시작 시 한 번, 서버가 꺼져 있는 동안 바뀐 파일 반영)
+        """
+        try:
+            files = {
+                e.name: e.stat()
+                for e in os.scandir(self.output_dir)
+                if e.is_file() and e.name.endswith(".wav")
+            }
+        except FileNotFoundError:
+            files = {}
+        with self._lock:
+            gone = [name for name in self._entries if name not in files]
+            changed = [
+                name
+                for name, st in files.items()
+                if name not in self._entries
+                or self._entries[name]["size"] != st.st_size
+                or self._entries[name]["created_at"] != round(st.st_mtime, 3)
+            ]
+        if not gone and not changed:
+            return
+        durations = {
+            name: wav_duration(os.path.join(self.output_dir, name)) for name in changed
+        }
+        singers = self.singers()
+        with self._lock:
+            for name in gone:
+                self._remove_locked(name)
+            for name in changed:
+                self._insert_locked(
+                    self._entry_locked(name, files[name], durations[name], singers)
+                )
+            self._changed_locked()
+            self._save_locked()
+        logging.info(
+            f"[LOG] 결과 목록 인덱스 대조: {len(changed)}개 추가/갱신, {len(gone)}개 제거"
+        )
+
+    def page(self, singer=None, cursor=None, limit=100):
+        """
+        최신순 목록의 한 페이지
+        :param singer: 지정하면 이 가수의 결과만
+        :param cursor: 이전 페이지의 next_cursor (없으면 처음부터)
+        :param limit: 페이지 크기 (None이면 cursor 이후 전체)
+        :return: (항목 목록, 다음 페이지 cursor(마지막이면 None), version)
+        :raise ValueError: 잘못된 cursor
+        """
+        after = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            keys = self._order if singer is None else self._by_singer.get(singer, [])
+            start = bisect.bisect_right(keys, after) if after else 0
+            end = len(keys) if limit is None else start + limit
+            page = keys[start:end]
+            items = [dict(self._entries[name]) for _, name in page]
+            has_more = end < len(keys)
+            version = self.version
+        next_cursor = encode_cursor(page[-1]) if page and has_more else None
+        return items, next_cursor, version
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_output_catalog():
+    """
+    프로세스 전역 OutputCatalog 반환 (OUTPUT_CATALOG_PATH 환경변수로 저장 경로 변경 가능)
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = OutputCatalog(
+                path=os.environ.get("OUTPUT_CATALOG_PATH", CATALOG_PATH),
+                singers=lambda: [s["name"] for s in get_singer_registry().list()],
+            )
+        return _catalog
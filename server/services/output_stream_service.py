@@ -0,0 +1,163 @@
+import os
+import hashlib
+import shutil
+import subprocess
+import threading
+import time
+import logging
+
+RENDITION_CACHE_DIR = os.path.join("cache", "renditions")
+
+# 포맷: (확장자, mimetype, 기본 비트레이트(kbps), ffmpeg 인코더/컨테이너 인자)
+STREAM_FORMATS = {
+    "opus": ("ogg", "audio/ogg", 96, ["-c:a", "libopus", "-vbr", "on", "-f", "ogg"]),
+    "aac": (
+        "m4a",
+        "audio/mp4",
+        128,
+        ["-c:a", "aac", "-movflags", "+faststart", "-f", "ipod"],
+    ),
+    "mp3": ("mp3", "audio/mpeg", 160, ["-c:a", "libmp3lame", "-f", "mp3"]),
+    # HLS packed audio 구간용 AAC (MP4 컨테이너 없이 ADTS 프레임만)
+    "adts": ("aac", "audio/aac", 128, ["-c:a", "aac", "-f", "adts"]),
+}
+# HLS 재생 목록 구간으로 쓸 수 있는 포맷 (packed audio, 첫 번째가 기본값)
+# wav/Ogg Opus/MP4(ipod) 구간은 표준 HLS 플레이어가 재생하지 못함
+HLS_SEGMENT_FORMATS = ("adts", "mp3")
+
+
+def parse_bitrate(value, default):
+    """
+    요청한 비트레이트(kbps)를 32~320 범위로 제한해서 반환 (잘못된 값이면 기본값)
+    """
+    try:
+        return min(max(int(value), 32), 320)
+    except (TypeError, ValueError):
+        return default
+
+
+class RenditionCache:
+    """
+    결과 wav를 압축 포맷(Opus/AAC/MP3)으로 변환한 파일을 디스크에 저장하는 캐시
+    - 키: 원본 경로 + 수정 시각 + 크기 + 포맷 + 비트레이트 (원본이 다시 동기화되면 새로 변환)
+    - 같은 파일을 동시에 요청해도 변환은 한 번만 실행
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 파일부터 삭제
+    """
+
+    def __init__(self, cache_dir=RENDITION_CACHE_DIR, max_bytes=5 * 1024**3):
+        """
+        :param cache_dir: 변환 파일 저장 디렉토리
+        :param max_bytes: 캐시 최대 크기(바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path_for(self, src_path, fmt, bitrate):
+        st = os.stat(src_path)
+        raw = f"{os.path.abspath(src_path)}\0{st.st_mtime_ns}\0{st.st_size}\0{fmt}\0{bitrate}"
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+        ext = STREAM_FORMATS[fmt][0]
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def get(self, src_path, fmt, bitrate):
+        """
+        변환된 파일 경로 반환 (캐시에 없으면 ffmpeg로 변환 후 저장)
+        :param src_path: 원본 wav 경로
+        :param fmt: STREAM_FORMATS의 키
+        :param bitrate: 비트레이트(kbps)
+        """
+        path = self._path_for(src_path, fmt, bitrate)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(path, threading.Lock())
+        try:
+            with key_lock:
+                if os.path.exists(path):
+                    os.utime(path)
+                    return path
+                started = time.monotonic()
+                self._transcode(src_path, path, fmt, bitrate)
+                logging.info(
+                    f"[LOG] 스트리밍용 변환 완료: {os.path.basename(src_path)} → {fmt} "
+                    f"{bitrate}k ({time.monotonic() - started:.2f}초)"
+                )
+        finally:
+            # 변환이 실패해도 키별 락이 남지 않도록 정리
+            with self._lock:
+                self._key_locks.pop(path, None)
+        self.evict()
+        return path
+
+    @staticmethod
+    def _transcode(src_path, out_path, fmt, bitrate):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg를 찾을 수 없습니다.")
+        codec_args = STREAM_FORMATS[fmt][3]
+        tmp_path = f"{out_path}.part"
+        command = [
+            ffmpeg,
+            "-nostdin",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            src_path,
+            "-vn",
+        ]
+        command += codec_args + ["-b:a", f"{bitrate}k", tmp_path]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg 변환 실패: {result.stderr.strip()}")
+            os.replace(tmp_path, out_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def evict(self):
+        """
+        캐시 전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용되지 않은 파일 삭제
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            logging.info(f"[LOG] 스트리밍 변환 캐시 {removed}개 정리")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_rendition_cache():
+    """
+    프로세스 전역 RenditionCache 반환
+    - RENDITION_CACHE_DIR, RENDITION_CACHE_MAX_GB 환경변수로 설정
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RenditionCache(
+                cache_dir=os.environ.get("RENDITION_CACHE_DIR", RENDITION_CACHE_DIR),
+                max_bytes=int(
+                    float(os.environ.get("RENDITION_CACHE_MAX_GB", 5)) * 1024**3
+                ),
+            )
+        return _cache
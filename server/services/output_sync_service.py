@@ -0,0 +1,310 @@
+import os
+import json
+import shlex
+import hashlib
+import tempfile
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from services.ssh_service import ssh_session, run_command, get_ssh_pool
+from services.metrics_service import STAGE_SECONDS, STAGE_FAILURES, TRANSFER_BYTES
+from services.event_service import publish
+from services.output_catalog_service import get_output_catalog
+
+LOCAL_OUTPUT_DIR = "output"
+MANIFEST_PATH = os.path.join("cache", "output_manifest.json")
+# 구간 단위 파이프라인에서 먼저 게시되는 구간 파일 (output/segments/<가수>_<곡>.seg<번호>.wav)
+LOCAL_SEGMENT_DIR = os.path.join(LOCAL_OUTPUT_DIR, "segments")
+SEGMENT_MANIFEST_PATH = os.path.join("cache", "segment_manifest.json")
+
+
+def local_output_name(remote_path):
+    """
+    원격 결과 파일의 로컬 파일명 (공백을 _로 변환)
+    """
+    return os.path.basename(remote_path).replace(" ", "_")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputSyncer:
+    """
+    GPU 서버 결과 파일 → 로컬 output 디렉토리 증분 동기화
+    - 원격 (크기, 수정 시각)을 로컬 manifest와 비교해서 새로 생겼거나 바뀐 파일만 전송
+    - verify_hash=True면 크기/시각만 바뀐 파일은 sha256을 비교해서 내용이 같으면 전송 생략
+    - 여러 SSH 연결로 동시에 전송 (SFTP prefetch 사용)
+    - 임시 파일(.part)에 받은 뒤 rename하므로 output에는 완성된 파일만 보임
+    - manifest(와 결과 목록 인덱스)는 메모리에서 갱신하고 sync()가 끝날 때 한 번만 파일로 저장
+    - 전송이 끝난 파일은 event 이벤트로 전달 (GET /events), catalog가 있으면 결과 목록에 추가
+    """
+
+    def __init__(
+        self,
+        local_dir=LOCAL_OUTPUT_DIR,
+        manifest_path=MANIFEST_PATH,
+        workers=4,
+        verify_hash=False,
+        event="output",
+        catalog=None,
+    ):
+        """
+        :param local_dir: 로컬 output 디렉토리
+        :param manifest_path: 동기화 manifest(JSON) 경로
+        :param workers: 동시 전송 수 (SSH 연결 풀 크기 이하로 설정)
+        :param verify_hash: 원격/로컬 sha256 비교 여부
+        :param event: 새 파일을 전달할 이벤트 종류
+        :param catalog: 받은 파일을 추가할 OutputCatalog (없으면 추가하지 않음)
+        """
+        self.local_dir = local_dir
+        self.manifest_path = manifest_path
+        self.workers = workers
+        self.verify_hash = verify_hash
+        self.event = event
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._dirty = False
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"[LOG] 동기화 manifest 로드 실패, 새로 작성: {e}")
+            return {}
+
+    def _save_manifest_locked(self):
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        tmp_path = f"{self.manifest_path}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+        self._dirty = False
+
+    def _flush_manifest(self):
+        """
+        메모리에서 바뀐 manifest가 있으면 파일로 저장
+        """
+        with self._lock:
+            if self._dirty:
+                self._save_manifest_locked()
+
+    def list_remote(self, ssh, remote_dir, files=None):
+        """
+        원격 파일의 크기/수정 시각을 한 번의 SSH 명령으로 조회
+        :param files: 조회할 원격 파일 경로 목록 (없으면 remote_dir의 모든 .wav)
+        :return: {원격 경로: (크기, 수정 시각 문자열)} (존재하지 않는 파일은 제외)
+        """
+        if files is None:
+            command = (
+                f"find {shlex.quote(remote_dir)} -maxdepth 1 -name '*.wav' "
+                "-printf '%s %T@ %p\\n'"
+            )
+        elif not files:
+            return {}
+        else:
+            paths = " ".join(shlex.quote(p) for p in files)
+            command = f"find {paths} -maxdepth 0 -type f -printf '%s %T@ %p\\n'"
+        _, output = run_command(ssh, f"{command} 2>/dev/null")
+        remote = {}
+        for line in output.splitlines():
+            parts = line.split(" ", 2)
+            if len(parts) == 3 and parts[0].isdigit():
+                remote[parts[2]] = (int(parts[0]), parts[1])
+        return remote
+
+    def _is_current(self, remote_path, size, mtime):
+        entry = self._manifest.get(local_output_name(remote_path))
+        local_path = os.path.join(self.local_dir, local_output_name(remote_path))
+        if entry is None or not os.path.isfile(local_path):
+            return False
+        if os.path.getsize(local_path) != entry["size"]:
+            return False
+        return entry["size"] == size and entry["mtime"] == mtime
+
+    def _remote_hashes(self, ssh, paths):
+        if not paths:
+            return {}
+        _, output = run_command(
+            ssh,
+            "sha256sum " + " ".join(shlex.quote(p) for p in paths) + " 2>/dev/null",
+        )
+        hashes = {}
+        for line in output.splitlines():
+            parts = line.split("  ", 1)
+            if len(parts) == 2:
+                hashes[parts[1]] = parts[0]
+        return hashes
+
+    def _transfer(self, remote_path, size, mtime):
+        """
+        파일 하나를 임시 파일로 받은 뒤 최종 경로로 rename
+        :return: (원격 경로, 성공 여부, 전송 바이트, 에러 메시지)
+        """
+        name = local_output_name(remote_path)
+        local_path = os.path.join(self.local_dir, name)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{name}.", suffix=".part", dir=self.local_dir
+        )
+        os.close(fd)
+        started = time.monotonic()
+        try:
+            with ssh_session() as ssh:
+                sftp = get_ssh_pool().get_sftp(ssh)
+                sftp.get(remote_path, tmp_path)
+            TRANSFER_BYTES.inc(os.path.getsize(tmp_path), direction="download")
+            if os.path.getsize(tmp_path) != size:
+                raise IOError(f"크기 불일치 ({os.path.getsize(tmp_path)} != {size})")
+            entry = {"remote_path": remote_path, "size": size, "mtime": mtime}
+            if self.verify_hash:
+                entry["sha256"] = file_sha256(tmp_path)
+            os.replace(tmp_path, local_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            STAGE_FAILURES.inc(stage="output_sync")
+            return remote_path, False, 0, str(e)
+        STAGE_SECONDS.observe(time.monotonic() - started, stage="output_sync")
+        with self._lock:
+            self._manifest[name] = entry
+            self._dirty = True
+        if self.catalog is not None:
+            self.catalog.add(local_path, save=False)
+        publish(self.event, {"file": name, "size": size})
+        return remote_path, True, size, None
+
+    def sync(self, remote_dir, files=None):
+        """
+        원격 결과 파일을 로컬로 증분 동기화
+        :param remote_dir: 원격 결과 디렉토리
+        :param files: 동기화할 원격 파일 경로 목록 (없으면 remote_dir의 모든 .wav)
+        :return: {"checked", "transferred", "skipped", "failed", "bytes", "elapsed"} 통계
+        """
+        started = time.monotonic()
+        os.makedirs(self.local_dir, exist_ok=True)
+        try:
+            return self._sync(remote_dir, files, started)
+        finally:
+            # 중간에 실패해도 그때까지 받은 파일은 manifest(와 결과 목록)에 반영
+            self._flush_manifest()
+            if self.catalog is not None:
+                self.catalog.save()
+
+    def _sync(self, remote_dir, files, started):
+        with ssh_session() as ssh:
+            remote = self.list_remote(ssh, remote_dir, files)
+            for path in files or []:
+                if path not in remote:
+                    logging.info(f"[LOG] 파일 없음(무시): {path}")
+            with self._lock:
+                changed = {
+                    path: stat
+                    for path, stat in remote.items()
+                    if not self._is_current(path, *stat)
+                }
+            if self.verify_hash:
+                changed = self._skip_identical(ssh, changed)
+
+        stats = {
+            "checked": len(remote),
+            "transferred": 0,
+            "skipped": len(remote) - len(changed),
+            "failed": 0,
+            "bytes": 0,
+        }
+        if changed:
+            workers = max(1, min(self.workers, len(changed)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    lambda item: self._transfer(item[0], *item[1]), changed.items()
+                )
+                for remote_path, ok, nbytes, error in results:
+                    if ok:
+                        stats["transferred"] += 1
+                        stats["bytes"] += nbytes
+                        logging.info(f"[LOG] 다운로드 완료: {remote_path}")
+                    else:
+                        stats["failed"] += 1
+                        logging.error(f"[ERROR] 다운로드 실패: {remote_path} - {error}")
+        stats["elapsed"] = round(time.monotonic() - started, 3)
+        logging.info(
+            f"[LOG] 결과 동기화: {stats['transferred']}개 전송, "
+            f"{stats['skipped']}개 생략, {stats['failed']}개 실패 "
+            f"({stats['bytes'] / 1024**2:.1f}MB, {stats['elapsed']}초)"
+        )
+        return stats
+
+    def _skip_identical(self, ssh, changed):
+        """
+        크기/수정 시각은 바뀌었지만 내용(sha256)이 로컬과 같은 파일은 manifest만 갱신하고 제외
+        """
+        with self._lock:
+            candidates = [
+                path
+                for path, (size, _) in changed.items()
+                if self._manifest.get(local_output_name(path), {}).get("sha256")
+                and os.path.isfile(
+                    os.path.join(self.local_dir, local_output_name(path))
+                )
+            ]
+        hashes = self._remote_hashes(ssh, candidates)
+        remaining = dict(changed)
+        with self._lock:
+            for path, digest in hashes.items():
+                entry = self._manifest[local_output_name(path)]
+                if entry["sha256"] == digest and entry["size"] == changed[path][0]:
+                    entry["mtime"] = changed[path][1]
+                    entry["remote_path"] = path
+                    remaining.pop(path)
+            if len(remaining) != len(changed):
+                self._dirty = True
+        return remaining
+
+
+_syncer = None
+_syncer_lock = threading.Lock()
+
+
+def get_output_syncer():
+    """
+    프로세스 전역 OutputSyncer 반환
+    - OUTPUT_SYNC_WORKERS, OUTPUT_SYNC_VERIFY_HASH, OUTPUT_SYNC_MANIFEST 환경변수로 설정
+    """
+    global _syncer
+    with _syncer_lock:
+        if _syncer is None:
+            _syncer = OutputSyncer(
+                manifest_path=os.environ.get("OUTPUT_SYNC_MANIFEST", MANIFEST_PATH),
+                workers=int(os.environ.get("OUTPUT_SYNC_WORKERS", 4)),
+                verify_hash=os.environ.get("OUTPUT_SYNC_VERIFY_HASH", "0") == "1",
+                catalog=get_output_catalog(),
+            )
+        return _syncer
+
+
+_segment_syncer = None
+
+
+def get_segment_syncer():
+    """
+    구간 파일 전용 OutputSyncer 반환 (output/segments, manifest는 결과 파일과 별도)
+    """
+    global _segment_syncer
+    with _syncer_lock:
+        if _segment_syncer is None:
+            _segment_syncer = OutputSyncer(
+                local_dir=LOCAL_SEGMENT_DIR,
+                manifest_path=SEGMENT_MANIFEST_PATH,
+                workers=int(os.environ.get("OUTPUT_SYNC_WORKERS", 4)),
+                event="segment",
+            )
+        return _segment_syncer
@@ -0,0 +1,261 @@
+import os
+import shlex
+from services.ssh_service import submit_job, run_command
+
+REMOTE_RUN_DIR = "/data/msj9518/repos/vcstream/run"
+REMOTE_RVC_DIR = "/data/msj9518/repos/vcstream/rvc"
+# 변환 작업별 작업 디렉토리 (runs/<작업 ID>/{input,hidden/vocal,hidden/inst,output,combined})
+REMOTE_RUNS_DIR = f"{REMOTE_RVC_DIR}/runs"
+RVC_CLI_DIR = "/data/msj9518/repos/rvc-cli"
+CONDA_ACTIVATE = (
+    "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc"
+)
+
+# batch: 단계마다 플레이리스트 전체가 끝나야 다음 단계 시작 (afterok)
+# per_track: 곡마다 separate→infer→combine이 독립적으로 진행 (Slurm job array + aftercorr)
+# segmented: per_track과 같지만 곡을 겹치는 구간으로 나눠 구간마다 array task로 처리
+#   (모든 곡의 앞 구간부터 변환해서 곡 전체가 끝나기 전에 재생 목록으로 들을 수 있음)
+PIPELINE_MODES = ("batch", "per_track", "segmented")
+
+# 단계별 자원 종류
+# gpu: GPU 노드에서 실행 (분리, 추론)
+# cpu: GPU가 필요 없는 단계 (결합, numpy 연산만 사용) → CPU_STAGE_PLACEMENT에 따라 배치
+# shell: Slurm 할당 없이 GPU 서버 셸에서 바로 실행 (정리, rm -rf만 수행)
+STAGE_RESOURCES = {
+    "separate": "gpu",
+    "batch_infer": "gpu",
+    "combine": "cpu",
+    "cleanup": "shell",
+}
+
+# cpu 단계 배치 방식
+# fused: 직전 GPU 작업(추론)의 끝에서 이어서 실행 (별도 작업 대기/할당 없음)
+# cpu_partition: CPU 파티션(SLURM_CPU_PARTITION)에 별도 작업으로 제출해서 GPU를 바로 반납
+# gpu: GPU 파티션에 별도 작업으로 제출 (이전 방식)
+CPU_STAGE_PLACEMENTS = ("fused", "cpu_partition", "gpu")
+GPU_PARTITION_OPTIONS = "--partition=batch_ugrad --gres=gpu:1 --nodelist=aurora-g1"
+
+
+def get_pipeline_mode():
+    """
+    변환 파이프라인 모드 (환경변수 PIPELINE_MODE, 기본값: per_track)
+    """
+    mode = os.environ.get("PIPELINE_MODE", "per_track")
+    return mode if mode in PIPELINE_MODES else "per_track"
+
+
+def get_segment_settings():
+    """
+    구간 단위 파이프라인의 구간 길이/겹침(초)
+    (환경변수 SEGMENT_SECONDS 기본값 10, SEGMENT_OVERLAP_SECONDS 기본값 1)
+    :return: (구간 길이, 겹침)
+    """
+    seconds = float(os.environ.get("SEGMENT_SECONDS", 10))
+    overlap = float(os.environ.get("SEGMENT_OVERLAP_SECONDS", 1))
+    return seconds, min(max(overlap, 0.0), seconds / 2)
+
+
+def get_cpu_stage_placement():
+    """
+    cpu 단계 배치 방식 (환경변수 CPU_STAGE_PLACEMENT, 기본값: fused)
+    """
+    placement = os.environ.get("CPU_STAGE_PLACEMENT", "fused")
+    return placement if placement in CPU_STAGE_PLACEMENTS else "fused"
+
+
+def workspace_dir(run_id):
+    """
+    변환 작업 하나가 사용하는 GPU 서버 작업 디렉토리
+    동시에 실행되는 변환 작업끼리 입력/중간/결과 파일을 공유하지 않도록 작업마다 분리
+    :param run_id: 작업 ID (GET /jobs/<id>의 id)
+    """
+    return f"{REMOTE_RUNS_DIR}/{run_id}"
+
+
+def workspace_options(workspace):
+    """
+    작업 스크립트가 workspace를 사용하도록 하는 sbatch 옵션 (환경변수 VCSTREAM_WORKSPACE)
+    """
+    if not workspace:
+        return []
+    return [f"--export=ALL,VCSTREAM_WORKSPACE={shlex.quote(workspace)}"]
+
+
+def prepare_workspace(ssh, workspace):
+    """
+    작업 디렉토리 생성 (다운로드 전에 호출)
+    """
+    exit_status, output = run_command(
+        ssh, f"mkdir -p {shlex.quote(workspace + '/input')}", label="workspace"
+    )
+    if exit_status != 0:
+        raise RuntimeError(f"작업 디렉토리 생성 실패 ({exit_status}): {output.strip()}")
+
+
+def plan_segments(ssh, workspace):
+    """
+    다운로드된 곡들을 구간으로 나누고(segment.py plan) input/tracks.txt를 구간 목록으로 바꿈
+    (array 인덱스 i는 i번째 구간, 모든 곡의 첫 구간이 먼저 오도록 정렬)
+    :return: 구간 목록 [{"name", "track", "index", "count", "segment_duration"}]
+    """
+    seconds, overlap = get_segment_settings()
+    exit_status, output = run_command(
+        ssh,
+        f"cd {REMOTE_RUN_DIR} && {CONDA_ACTIVATE} && "
+        f"python segment.py plan {shlex.quote(workspace)} {seconds} {overlap}",
+        label="segment_plan",
+    )
+    if exit_status != 0:
+        raise RuntimeError(f"구간 분할 실패 ({exit_status}): {output.strip()}")
+    segments = []
+    for line in output.splitlines():
+        values = line.split("\t")
+        if len(values) != 9:
+            continue
+        segments.append(
+            {
+                "name": values[0],
+                "track": values[1],
+                "index": int(values[2]),
+                "count": int(values[3]),
+                "segment_duration": float(values[8]),
+            }
+        )
+    if not segments:
+        raise RuntimeError(f"구간 분할 결과가 없습니다: {output.strip()}")
+    return segments
+
+
+def stage_options(stage):
+    """
+    단계의 자원 종류/배치 방식에 맞는 sbatch 옵션 (명령줄 옵션이 스크립트의 #SBATCH 설정보다 우선)
+    gpu 단계는 스크립트에 선언된 GPU 설정을 그대로 사용
+    """
+    if STAGE_RESOURCES[stage] == "gpu":
+        return []
+    if get_cpu_stage_placement() == "gpu":
+        return [GPU_PARTITION_OPTIONS]
+    return [f"--partition={os.environ.get('SLURM_CPU_PARTITION', 'cpu')}"]
+
+
+def sbatch_command(
+    workdir,
+    script,
+    args="",
+    dependency=None,
+    array_size=None,
+    options=None,
+    array_start=0,
+):
+    """
+    conda 환경 활성화 후 sbatch로 스크립트를 제출하는 명령어 생성
+    :param workdir: sbatch를 실행할 디렉토리
+    :param script: run 디렉토리 안의 스크립트 이름 (예: separate.sh)
+    :param args: 스크립트 인자
+    :param dependency: --dependency 값 (예: afterok:123)
+    :param array_size: 지정하면 0 ~ array_size-1 job array로 제출
+    :param options: 추가 sbatch 옵션 목록 (예: stage_options()의 결과)
+    :param array_start: job array 첫 인덱스 (array_start ~ array_start+array_size-1)
+    """
+    options = list(options or [])
+    if array_size:
+        options.append(f"--array={array_start}-{array_start + array_size - 1}")
+    if dependency:
+        options.append(f"--dependency={dependency}")
+    command = f"cd {workdir} && {CONDA_ACTIVATE} && sbatch "
+    if options:
+        command += " ".join(options) + " "
+    command += f"{REMOTE_RUN_DIR}/{script}"
+    if args:
+        command += f" {args}"
+    return command
+
+
+def submit_conversion_jobs(
+    ssh, singer_name, track_count=None, workspace=None, array_start=0
+):
+    """
+    separate → batch_infer → combine Slurm 작업 제출
+    :param track_count: 지정하면 곡 수만큼의 job array로 제출하고 곡 단위 의존성(aftercorr) 사용
+        (array 인덱스 i는 input/tracks.txt의 i+1번째 곡)
+    :param workspace: 작업 디렉토리 (workspace_dir(), 없으면 공유 디렉토리 rvc)
+    :param array_start: job array 첫 인덱스 (tracks.txt의 일부만 제출할 때)
+    :return: {"separate", "batch_infer", "combine"} job id
+        (결합을 추론 작업에 합친 경우 combine은 batch_infer와 같은 id)
+    """
+    dependency_type = "aftercorr" if track_count else "afterok"
+    fused = get_cpu_stage_placement() == "fused"
+    options = workspace_options(workspace)
+    separate_jobid = submit_job(
+        ssh,
+        sbatch_command(
+            RVC_CLI_DIR,
+            "separate.sh",
+            array_size=track_count,
+            array_start=array_start,
+            options=options,
+        ),
+    )
+    batch_jobid = submit_job(
+        ssh,
+        sbatch_command(
+            RVC_CLI_DIR,
+            "batch_infer.sh",
+            f"'{singer_name}'" + (" --combine" if fused else ""),
+            dependency=f"{dependency_type}:{separate_jobid}",
+            array_size=track_count,
+            array_start=array_start,
+            options=options,
+        ),
+    )
+    if fused:
+        return {
+            "separate": separate_jobid,
+            "batch_infer": batch_jobid,
+            "combine": batch_jobid,
+        }
+    combine_jobid = submit_job(
+        ssh,
+        sbatch_command(
+            REMOTE_RUN_DIR,
+            "combine.sh",
+            f"'{singer_name}'",
+            dependency=f"{dependency_type}:{batch_jobid}",
+            array_size=track_count,
+            array_start=array_start,
+            options=stage_options("combine") + options,
+        ),
+    )
+    return {
+        "separate": separate_jobid,
+        "batch_infer": batch_jobid,
+        "combine": combine_jobid,
+    }
+
+
+def run_cleanup(ssh, workspace=None, dependency=None):
+    """
+    작업 디렉토리 정리(cleanup.sh)
+    파일 삭제만 하므로 Slurm 할당 없이 GPU 서버 셸에서 바로 실행하고,
+    다른 작업이 끝난 뒤에 실행해야 하면(dependency) CPU 단계로 제출
+    :param workspace: 지정하면 이 작업 디렉토리만 삭제
+        (동시에 진행 중인 다른 변환 작업의 디렉토리는 유지, 없으면 공유 디렉토리 전체 삭제)
+    :return: 제출한 Slurm job id (바로 실행했으면 None)
+    """
+    if dependency is None:
+        env = f"VCSTREAM_WORKSPACE={shlex.quote(workspace)} " if workspace else ""
+        exit_status, output = run_command(
+            ssh, f"{env}bash {REMOTE_RUN_DIR}/cleanup.sh", label="cleanup"
+        )
+        if exit_status != 0:
+            raise RuntimeError(f"cleanup.sh 실패 ({exit_status}): {output.strip()}")
+        return None
+    return submit_job(
+        ssh,
+        sbatch_command(
+            REMOTE_RUN_DIR,
+            "cleanup.sh",
+            dependency=dependency,
+            options=stage_options("cleanup") + workspace_options(workspace),
+        ),
+    )
@@ -0,0 +1,275 @@
+import os
+import heapq
+import itertools
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from services.spotify_client_service import get_spotify_client
+
+
+def fetch_player(access_token):
+    """
+    현재 재생 상태 조회 (/v1/me/player)
+    429는 기다리지 않고 바로 반환 (스케줄러가 Retry-After 이후로 다음 조회를 미룸)
+    :return: (HTTP 상태 코드, 응답 JSON 또는 None)
+    """
+    res = get_spotify_client().get("/me/player", access_token, retries=0)
+    if res.status_code == 200:
+        return res.status_code, res.json()
+    return res.status_code, None
+
+
+def rate_limit_delay(access_token):
+    """
+    토큰이 429로 제한된 남은 시간(초)
+    """
+    return get_spotify_client().blocked_for(access_token)
+
+
+class PlaybackPollScheduler:
+    """
+    여러 사용자의 Spotify 재생 상태를 polling하는 스케줄러
+    - 사용자별 다음 polling 시각을 힙(heap)으로 관리해서 가장 이른 사용자부터 조회
+    - 스케줄 스레드는 순서만 관리하고 조회는 제한된 크기의 스레드 풀에서 실행
+      (느린 요청이 다른 사용자의 polling 시각을 늦추지 않음, 사용자당 동시 조회는 하나)
+    - 429를 받은 사용자는 해당 토큰의 Retry-After 이후로 다음 조회를 미룸
+    - 재생 중인 곡/컨텍스트가 바뀌면 짧은 간격, 변화가 없거나 일시정지/미재생이면 점점 긴 간격
+    - 재생 중인 플레이리스트가 바뀌었을 때만 on_playlist 콜백 호출
+    - 토큰이 만료(401)되면 해당 사용자 polling 중단
+    """
+
+    def __init__(
+        self,
+        min_interval=2,
+        active_max_interval=10,
+        idle_max_interval=60,
+        backoff=1.5,
+        workers=8,
+        fetch=fetch_player,
+        blocked_for=rate_limit_delay,
+    ):
+        """
+        :param min_interval: 재생 상태가 바뀐 직후의 polling 간격(초)
+        :param active_max_interval: 재생 중이지만 변화가 없을 때의 최대 간격(초)
+        :param idle_max_interval: 일시정지/미재생일 때의 최대 간격(초)
+        :param backoff: 변화가 없을 때 간격을 늘리는 배수
+        :param workers: 동시에 실행할 조회 수
+        :param fetch: fetch(access_token) -> (상태 코드, 재생 상태 JSON)
+        :param blocked_for: blocked_for(access_token) -> 429 제한이 풀리기까지 남은 시간(초)
+        """
+        self.min_interval = min_interval
+        self.active_max_interval = active_max_interval
+        self.idle_max_interval = idle_max_interval
+        self.backoff = backoff
+        self.fetch = fetch
+        self.blocked_for = blocked_for
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="playback-poll"
+        )
+        self._cond = threading.Condition()
+        self._heap = []  # [(다음 polling 시각, 순번, user_id, generation)]
+        self._seq = itertools.count()
+        self._users = {}  # user_id -> 상태 dict
+        self._thread = None
+
+    def register(self, user_id, access_token, singer_name, on_playlist):
+        """
+        사용자 polling 시작 (이미 등록된 사용자면 토큰/가수만 갱신하고 바로 다시 조회)
+        :param on_playlist: on_playlist(user_id, playlist_id, access_token, singer_name)
+        """
+        with self._cond:
+            user = self._users.get(user_id)
+            if user is None:
+                user = {
+                    "generation": 0,
+                    "context_uri": None,
+                    "track_id": None,
+                    "triggered_uri": None,
+                    "interval": self.min_interval,
+                    "polls": 0,
+                    "conversions": 0,
+                }
+                self._users[user_id] = user
+            # 가수가 바뀌면 같은 플레이리스트도 다시 변환
+            if user.get("singer_name") != singer_name:
+                user["triggered_uri"] = None
+            user.update(
+                access_token=access_token,
+                singer_name=singer_name,
+                on_playlist=on_playlist,
+                status="polling",
+                interval=self.min_interval,
+            )
+            user["generation"] += 1
+            self._push_locked(user_id, time.monotonic())
+            self._ensure_thread_locked()
+        logging.info(f"[LOG] 재생 상태 polling 시작: {user_id}")
+
+    def unregister(self, user_id):
+        """
+        사용자 polling 중단
+        :return: 등록되어 있었으면 True
+        """
+        with self._cond:
+            # 힙에 남은 항목은 generation이 맞지 않아 꺼낼 때 무시됨
+            removed = self._users.pop(user_id, None) is not None
+            self._cond.notify()
+        if removed:
+            logging.info(f"[LOG] 재생 상태 polling 중단: {user_id}")
+        return removed
+
+    def status(self):
+        """
+        사용자별 polling 상태 (토큰 제외)
+        """
+        now = time.monotonic()
+        with self._cond:
+            next_poll = {}
+            for deadline, _, user_id, generation in self._heap:
+                user = self._users.get(user_id)
+                if user is not None and user["generation"] == generation:
+                    next_poll[user_id] = round(max(deadline - now, 0), 1)
+            return {
+                user_id: {
+                    "singer_name": user["singer_name"],
+                    "status": user["status"],
+                    "context_uri": user["context_uri"],
+                    "interval": round(user["interval"], 1),
+                    "next_poll_in": next_poll.get(user_id),
+                    "polls": user["polls"],
+                    "conversions": user["conversions"],
+                }
+                for user_id, user in self._users.items()
+            }
+
+    def _push_locked(self, user_id, deadline):
+        user = self._users[user_id]
+        heapq.heappush(
+            self._heap, (deadline, next(self._seq), user_id, user["generation"])
+        )
+        self._cond.notify()
+
+    def _ensure_thread_locked(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    # 해지/재등록으로 무효가 된 항목 제거
+                    while self._heap and self._is_stale_locked(self._heap[0]):
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                _, _, user_id, generation = heapq.heappop(self._heap)
+                access_token = self._users[user_id]["access_token"]
+            # 다음 polling 시각은 조회가 끝난 뒤 _handle에서 등록 (사용자당 동시 조회는 하나)
+            self._executor.submit(self._poll, user_id, generation, access_token)
+
+    def _poll(self, user_id, generation, access_token):
+        retry_after = 0.0
+        try:
+            status_code, player = self.fetch(access_token)
+            if status_code == 429:
+                retry_after = self.blocked_for(access_token)
+        except Exception as e:
+            logging.error(f"[ERROR] 재생 상태 조회 실패 ({user_id}): {e}")
+            status_code, player = None, None
+        self._handle(user_id, generation, status_code, player, retry_after)
+
+    def _is_stale_locked(self, entry):
+        user = self._users.get(entry[2])
+        return user is None or user["generation"] != entry[3]
+
+    def _handle(self, user_id, generation, status_code, player, retry_after=0.0):
+        trigger = None
+        with self._cond:
+            user = self._users.get(user_id)
+            if user is None or user["generation"] != generation:
+                return
+            user["polls"] += 1
+            if status_code == 401:
+                user["status"] = "token_expired"
+                logging.info(f"[LOG] 토큰 만료로 polling 중단: {user_id}")
+                return
+            if status_code == 429:
+                # 재생 상태는 알 수 없으므로 유지하고 제한이 풀린 뒤 다시 조회
+                user["status"] = "rate_limited"
+                delay = max(user["interval"], retry_after)
+                self._push_locked(user_id, time.monotonic() + delay)
+                return
+
+            playing = bool(player and player.get("is_playing"))
+            context = (player or {}).get("context") or {}
+            context_uri = context.get("uri")
+            track_id = ((player or {}).get("item") or {}).get("id")
+            changed = (context_uri, track_id) != (user["context_uri"], user["track_id"])
+            user["context_uri"] = context_uri
+            user["track_id"] = track_id
+            user["status"] = "playing" if playing else "idle"
+
+            if changed:
+                user["interval"] = self.min_interval
+            else:
+                max_interval = (
+                    self.active_max_interval if playing else self.idle_max_interval
+                )
+                user["interval"] = min(user["interval"] * self.backoff, max_interval)
+
+            if (
+                context_uri
+                and context_uri.startswith("spotify:playlist:")
+                and context_uri != user["triggered_uri"]
+            ):
+                user["triggered_uri"] = context_uri
+                user["conversions"] += 1
+                trigger = (
+                    user["on_playlist"],
+                    context_uri.split(":")[-1],
+                    user["access_token"],
+                    user["singer_name"],
+                )
+            self._push_locked(user_id, time.monotonic() + user["interval"])
+
+        if trigger is not None:
+            on_playlist, playlist_id, access_token, singer_name = trigger
+            logging.info(f"[LOG] 플레이리스트 변경 감지 ({user_id}): {playlist_id}")
+            try:
+                on_playlist(user_id, playlist_id, access_token, singer_name)
+            except Exception as e:
+                logging.error(f"[ERROR] 변환 시작 실패 ({user_id}): {e}")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_poll_scheduler():
+    """
+    프로세스 전역 PlaybackPollScheduler 반환
+    - PLAYBACK_POLL_MIN_INTERVAL, PLAYBACK_POLL_ACTIVE_MAX_INTERVAL,
+      PLAYBACK_POLL_IDLE_MAX_INTERVAL, PLAYBACK_POLL_WORKERS 환경변수로 설정
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PlaybackPollScheduler(
+                min_interval=float(os.environ.get("PLAYBACK_POLL_MIN_INTERVAL", 2)),
+                active_max_interval=float(
+                    os.environ.get("PLAYBACK_POLL_ACTIVE_MAX_INTERVAL", 10)
+                ),
+                idle_max_interval=float(
+                    os.environ.get("PLAYBACK_POLL_IDLE_MAX_INTERVAL", 60)
+                ),
+                workers=int(os.environ.get("PLAYBACK_POLL_WORKERS", 8)),
+            )
+        return _scheduler
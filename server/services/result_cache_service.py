@@ -0,0 +1,177 @@
+import os
+import hashlib
+import shlex
+import threading
+import logging
+from services.ssh_service import run_command, download_file
+from services.youtube_cache_service import normalize_track_key
+
+REMOTE_RESULT_CACHE_DIR = "/data/msj9518/repos/vcstream/rvc/result_cache"
+REMOTE_MODELS_DIR = "/data/msj9518/repos/vcstream/rvc/models"
+
+
+def get_model_version(ssh, singer_name):
+    """
+    가수 모델 버전 문자열 (pth/index 파일의 수정 시각+크기)
+    모델을 다시 학습하면 값이 바뀌므로 이전 변환 결과가 재사용되지 않음
+    :return: 버전 문자열, 모델 파일이 없으면 None
+    """
+    model_dir = f"{REMOTE_MODELS_DIR}/{singer_name}"
+    pth_path = shlex.quote(f"{model_dir}/{singer_name}_best.pth")
+    index_path = shlex.quote(f"{model_dir}/{singer_name}.index")
+    exit_status, output = run_command(ssh, f"stat -c '%Y-%s' {pth_path} {index_path}")
+    if exit_status != 0:
+        return None
+    return "/".join(output.split())
+
+
+def result_cache_key(track, singer_name, model_version):
+    """
+    (원곡, 가수 모델, 모델 버전)으로 변환 결과의 캐시 키 생성
+    원곡은 유튜브 영상 ID로 식별하고, 없으면 정규화된 (제목, 아티스트) 사용
+    """
+    if track.get("video_id"):
+        source = f"youtube:{track['video_id']}"
+    else:
+        source = normalize_track_key(track["title"], track.get("artists"))
+    raw = f"{source}\0{singer_name}\0{model_version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class RemoteResultCache:
+    """
+    GPU 서버에 저장되는 변환 결과(combined wav) 캐시
+    - 파일명이 캐시 키인 content-addressed 저장소 (<cache_dir>/<key>.wav)
+    - 조회/저장 시 mtime을 갱신하고, 전체 크기가 max_bytes를 넘으면 오래된 파일부터 삭제
+    - 적중/미스/저장/삭제 횟수 통계
+    """
+
+    def __init__(self, cache_dir=REMOTE_RESULT_CACHE_DIR, max_bytes=50 * 1024**3):
+        """
+        :param cache_dir: GPU 서버의 캐시 디렉토리
+        :param max_bytes: 캐시 최대 크기(바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def path_for(self, key):
+        return f"{self.cache_dir}/{key}.wav"
+
+    def lookup(self, ssh, keys):
+        """
+        캐시에 있는 키를 한 번의 SSH 명령으로 조회하고, 적중한 파일의 mtime 갱신
+        :return: 적중한 키 집합
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return set()
+        exit_status, output = run_command(
+            ssh, f"ls -1 {shlex.quote(self.cache_dir)} 2>/dev/null"
+        )
+        existing = {
+            name[: -len(".wav")] for name in output.split() if name.endswith(".wav")
+        }
+        hits = {key for key in keys if key in existing}
+        if hits:
+            paths = " ".join(shlex.quote(self.path_for(key)) for key in hits)
+            run_command(ssh, f"touch -c {paths}")
+        with self._lock:
+            self._stats["hits"] += len(hits)
+            self._stats["misses"] += len(keys) - len(hits)
+        logging.info(
+            f"[LOG] 변환 결과 캐시: {len(hits)}곡 적중, {len(keys) - len(hits)}곡 미스"
+        )
+        return hits
+
+    def fetch(self, ssh, key, local_path):
+        """
+        캐시된 변환 결과를 로컬로 다운로드 (임시 파일에 받은 뒤 rename)
+        """
+        tmp_path = f"{local_path}.part"
+        try:
+            download_file(ssh, self.path_for(key), tmp_path)
+            os.replace(tmp_path, local_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def store(self, ssh, entries):
+        """
+        변환이 끝난 파일을 캐시에 저장 (같은 파일시스템이면 하드링크, 아니면 복사)
+        :param entries: {key: 원격 결과 파일 경로}
+        """
+        if not entries:
+            return
+        commands = [f"mkdir -p {shlex.quote(self.cache_dir)}"]
+        for key, remote_path in entries.items():
+            src = shlex.quote(remote_path)
+            dst = shlex.quote(self.path_for(key))
+            commands.append(
+                f"if [ -f {src} ]; then ln -f {src} {dst} 2>/dev/null || cp {src} {dst}; "
+                f"echo stored; fi"
+            )
+        exit_status, output = run_command(
+            ssh, "; ".join(commands), label="result_cache_store"
+        )
+        stored = output.split().count("stored")
+        with self._lock:
+            self._stats["stores"] += stored
+        logging.info(f"[LOG] 변환 결과 캐시 저장: {stored}/{len(entries)}곡")
+        self.evict(ssh)
+
+    def evict(self, ssh):
+        """
+        캐시 전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용되지 않은 파일 삭제
+        """
+        exit_status, output = run_command(
+            ssh,
+            f"find {shlex.quote(self.cache_dir)} -maxdepth 1 -name '*.wav' "
+            "-printf '%T@ %s %p\\n' 2>/dev/null",
+        )
+        entries = []
+        for line in output.splitlines():
+            parts = line.split(" ", 2)
+            if len(parts) == 3:
+                entries.append((float(parts[0]), int(parts[1]), parts[2]))
+        total = sum(size for _, size, _ in entries)
+        victims = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            victims.append(path)
+            total -= size
+        if victims:
+            run_command(ssh, "rm -f " + " ".join(shlex.quote(p) for p in victims))
+            with self._lock:
+                self._stats["evictions"] += len(victims)
+            logging.info(f"[LOG] 변환 결과 캐시 {len(victims)}개 정리")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """
+    프로세스 전역 RemoteResultCache 반환
+    - RESULT_CACHE_DIR, RESULT_CACHE_MAX_GB 환경변수로 설정
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RemoteResultCache(
+                cache_dir=os.environ.get("RESULT_CACHE_DIR", REMOTE_RESULT_CACHE_DIR),
+                max_bytes=int(
+                    float(os.environ.get("RESULT_CACHE_MAX_GB", 50)) * 1024**3
+                ),
+            )
+        return _cache
@@ -0,0 +1,100 @@
+import os
+import math
+import wave
+from services.output_sync_service import (
+    LOCAL_OUTPUT_DIR,
+    LOCAL_SEGMENT_DIR,
+    local_output_name,
+)
+
+
+def segment_file_name(singer_name, track_name, index):
+    """
+    구간 파일의 로컬 파일명 (combine.py 출력: combined/segments/<가수>_<곡>.seg<번호>.wav)
+    """
+    return local_output_name(f"{singer_name}_{track_name}.seg{index:04d}.wav")
+
+
+def remote_segment_paths(remote_combined_dir, singer_name, segment):
+    """
+    구간 task 하나가 끝났을 때 새로 게시됐을 수 있는 원격 구간 파일 경로
+    (구간 k는 chunk k-1, k가 모두 끝나야 게시되므로 task k가 끝나면 구간 k, k+1이 후보)
+    :param segment: pipeline_service.plan_segments()의 구간 하나
+    """
+    return [
+        f"{remote_combined_dir}/segments/{singer_name}_{segment['track']}"
+        f".seg{index:04d}.wav"
+        for index in (segment["index"], segment["index"] + 1)
+        if index < segment["count"]
+    ]
+
+
+def available_segments(singer_name, track_name, count, segment_dir=LOCAL_SEGMENT_DIR):
+    """
+    앞에서부터 연속으로 동기화된 구간 수 (재생 목록에는 빈 구간 없이 이어지는 부분만 포함)
+    """
+    for index in range(count):
+        path = os.path.join(
+            segment_dir, segment_file_name(singer_name, track_name, index)
+        )
+        if not os.path.isfile(path):
+            return index
+    return count
+
+
+def wav_duration(path):
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def render_playlist(entries, complete):
+    """
+    HLS 형식(EVENT) 재생 목록 생성
+    - 변환 중에는 ENDLIST 없이 지금까지 게시된 구간만 포함 (클라이언트가 다시 요청해서 이어 받음)
+    :param entries: [(구간 URI, 길이(초))]
+    :param complete: 모든 구간이 게시됐으면 True (ENDLIST 추가)
+    """
+    target = max((math.ceil(duration) for _, duration in entries), default=1)
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{max(target, 1)}",
+        "#EXT-X-PLAYLIST-TYPE:EVENT",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+    ]
+    for uri, duration in entries:
+        lines.append(f"#EXTINF:{duration:.3f},")
+        lines.append(uri)
+    if complete:
+        lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def track_playlist(job, track_name, query=""):
+    """
+    작업의 곡 하나에 대한 재생 목록
+    - 구간 단위로 변환 중인 곡: 앞에서부터 연속으로 동기화된 구간 (segments/<번호>)
+    - 구간 없이 변환된 곡(캐시 적중, per_track/batch 모드): 결과 파일 전체를 구간 하나로 (full)
+    :param job: 작업 문서 (GET /jobs/<id>)
+    :param query: 구간 URI에 붙일 query string (urlencode된 값, 예: format=adts)
+    :return: 재생 목록 문자열, 아직 재생할 수 있는 부분이 없으면 빈 재생 목록 (곡이 없으면 None)
+    """
+    status = job["tracks"].get(track_name, {}).get("status")
+    if status is None:
+        return None
+    singer_name = job["params"]["singer_name"]
+    suffix = f"?{query}" if query else ""
+    durations = job.get("segments", {}).get(track_name)
+    if durations:
+        available = available_segments(singer_name, track_name, len(durations))
+        entries = [
+            (f"segments/{index}{suffix}", durations[index])
+            for index in range(available)
+        ]
+        return render_playlist(entries, available == len(durations))
+    path = os.path.join(
+        LOCAL_OUTPUT_DIR, local_output_name(f"{singer_name}_{track_name}.wav")
+    )
+    if status not in ("completed", "cached") or not os.path.isfile(path):
+        return render_playlist([], status == "failed")
+    return render_playlist([(f"full{suffix}", wav_duration(path))], True)
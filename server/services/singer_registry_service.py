@@ -0,0 +1,135 @@
+import os
+import json
+import threading
+import logging
+from services.event_service import publish
+
+SINGERS_FILE = os.path.join("services", "selected_singer.json")
+
+
+class SingerRegistry:
+    """
+    선택된 가수 목록 저장소 (selected_singer.json)
+    - 메모리의 이름 → 가수 정보 인덱스로 O(1) 조회
+    - 변경은 락 안에서 수행하고 즉시 파일에 기록 (임시 파일에 쓴 뒤 rename으로 교체)
+    - 조회는 변경 시 만들어 둔 목록 스냅샷을 반환하므로 락/디스크 I/O 없이 동시에 가능
+    - 추가/삭제/상태 변경은 singer 이벤트로 전달 (GET /events)
+    """
+
+    def __init__(self, path=SINGERS_FILE):
+        """
+        :param path: 가수 목록 JSON 파일 경로 ([{"name", "status"}] 형식)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = {}
+        for singer in self._load():
+            if singer.get("name"):
+                self._index[singer["name"]] = dict(singer)
+        self._snapshot = self._build_snapshot()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            logging.error(f"[ERROR] {self.path} 로드 실패, 빈 목록으로 시작: {e}")
+            return []
+
+    def _build_snapshot(self):
+        return tuple(dict(singer) for singer in self._index.values())
+
+    def _commit_locked(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self._index.values()), f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._snapshot = self._build_snapshot()
+
+    def list(self):
+        """
+        전체 가수 목록 (등록 순서)
+        """
+        return [dict(singer) for singer in self._snapshot]
+
+    def get(self, name):
+        """
+        :return: 가수 정보 dict, 없으면 None
+        """
+        singer = self._index.get(name)
+        return dict(singer) if singer is not None else None
+
+    def add(self, name, status="training"):
+        """
+        가수 추가 (이미 있으면 변경하지 않음)
+        :return: 새로 추가했으면 True
+        """
+        with self._lock:
+            if name in self._index:
+                return False
+            self._index[name] = {"name": name, "status": status}
+            self._commit_locked()
+        publish("singer", {"name": name, "status": status})
+        return True
+
+    def remove(self, name):
+        """
+        :return: 삭제했으면 True
+        """
+        with self._lock:
+            if self._index.pop(name, None) is None:
+                return False
+            self._commit_locked()
+        publish("singer", {"name": name, "status": "removed"})
+        return True
+
+    def set_status(self, names, status):
+        """
+        여러 가수의 상태를 한 번에 변경 (파일 기록도 한 번)
+        :param names: 가수 이름 목록
+        :return: 실제로 상태가 바뀐 가수 수
+        """
+        with self._lock:
+            changed = []
+            for name in names:
+                singer = self._index.get(name)
+                if singer is not None and singer.get("status") != status:
+                    singer["status"] = status
+                    changed.append(name)
+            if changed:
+                self._commit_locked()
+        for name in changed:
+            publish("singer", {"name": name, "status": status})
+        return len(changed)
+
+    def update(self, name, **fields):
+        """
+        가수 정보에 상태 외의 필드 저장 (예: 학습 Slurm job id)
+        :return: 가수가 있으면 True
+        """
+        with self._lock:
+            singer = self._index.get(name)
+            if singer is None:
+                return False
+            singer.update(fields)
+            self._commit_locked()
+            return True
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_singer_registry():
+    """
+    프로세스 전역 SingerRegistry 반환 (SINGERS_FILE 환경변수로 경로 변경 가능)
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SingerRegistry(os.environ.get("SINGERS_FILE", SINGERS_FILE))
+        return _registry
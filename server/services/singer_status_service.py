@@ -0,0 +1,145 @@
+import os
+import time
+import shlex
+import threading
+import logging
+from services.ssh_service import ssh_session, run_command
+from services.singer_registry_service import get_singer_registry
+from services.slurm_tracker_service import get_job_tracker
+
+REMOTE_MODELS_DIR = "/data/msj9518/repos/vcstream/rvc/models"
+
+
+def model_files(singer_name):
+    """
+    학습이 끝나면 생기는 모델 파일 (.pth, .index)
+    """
+    model_dir = f"{REMOTE_MODELS_DIR}/{singer_name}"
+    return (
+        f"{model_dir}/{singer_name}_best.pth",
+        f"{model_dir}/{singer_name}.index",
+    )
+
+
+class SingerStatusWatcher:
+    """
+    가수 학습 상태 갱신 (클라이언트 조회마다 SSH로 확인하지 않음)
+    - 학습 Slurm 작업(train_atoz.sh)을 SlurmJobTracker로 추적하다가 끝났을 때만 모델 파일을 확인해서
+      done(모델 있음) / failed(작업 실패 또는 모델 없음)로 변경 → singer 이벤트로 전달
+    - 학습 작업 id가 없는 가수(서버 밖에서 학습, 이전 버전에서 등록)만 check_interval마다 최대 한 번,
+      한 번의 SSH 명령으로 모두 확인
+    """
+
+    def __init__(self, registry, check_interval=300):
+        """
+        :param registry: SingerRegistry
+        :param check_interval: 학습 작업 id가 없는 가수의 최소 확인 간격(초)
+        """
+        self.registry = registry
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._watching = set()
+        self._checked_at = None
+
+    def watch(self, singer_name, job_id):
+        """
+        학습 작업 추적 시작 (서버가 재시작되어도 이어서 추적하도록 job id를 가수 정보에 저장)
+        """
+        self.registry.update(singer_name, train_job_id=job_id)
+        self._watch(singer_name, job_id)
+
+    def _watch(self, singer_name, job_id):
+        with self._lock:
+            self._watching.add(singer_name)
+        get_job_tracker().watch(job_id).add_done_callback(
+            lambda future: self._on_done(singer_name, future)
+        )
+
+    def resume(self):
+        """
+        서버 재시작 전에 학습 중이던 가수의 학습 작업을 이어서 추적
+        """
+        for singer in self.registry.list():
+            if singer.get("status") == "training" and singer.get("train_job_id"):
+                self._watch(singer["name"], singer["train_job_id"])
+
+    def _on_done(self, singer_name, future):
+        with self._lock:
+            self._watching.discard(singer_name)
+        try:
+            state = future.result()
+        except Exception as e:
+            state = f"UNKNOWN ({e})"
+        try:
+            trained = self.check([singer_name])
+        except Exception as e:
+            logging.error(f"[ERROR] 모델 파일 확인 실패 ({singer_name}): {e}")
+            return
+        if singer_name in trained:
+            self.registry.set_status([singer_name], "done")
+        else:
+            logging.error(f"[ERROR] 학습 실패 ({singer_name}): {state}")
+            self.registry.set_status([singer_name], "failed")
+
+    def check(self, names):
+        """
+        모델 파일이 모두 있는 가수를 한 번의 SSH 명령으로 조회
+        :return: 학습이 끝난 가수 이름 집합
+        """
+        if not names:
+            return set()
+        tests = []
+        for name in names:
+            pth_path, index_path = model_files(name)
+            tests.append(
+                f"test -f {shlex.quote(pth_path)} && test -f {shlex.quote(index_path)}"
+                f" && printf '%s\\n' {shlex.quote(name)}"
+            )
+        with ssh_session() as ssh:
+            _, output = run_command(
+                ssh, "; ".join(tests) + "; true", label="singer_status"
+            )
+        return set(output.splitlines()) & set(names)
+
+    def refresh(self, force=False):
+        """
+        학습 작업을 추적하지 않는 미완료 가수 상태 확인 (check_interval 이내에 다시 호출되면 생략)
+        :param force: 확인 간격과 관계없이 확인
+        :return: 새로 done이 된 가수 수
+        """
+        with self._lock:
+            names = [
+                s["name"]
+                for s in self.registry.list()
+                if s.get("status") != "done" and s["name"] not in self._watching
+            ]
+            now = time.monotonic()
+            recent = (
+                self._checked_at is not None
+                and now - self._checked_at < self.check_interval
+            )
+            if not names or (recent and not force):
+                return 0
+            self._checked_at = now
+        return self.registry.set_status(self.check(names), "done")
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_singer_status_watcher():
+    """
+    프로세스 전역 SingerStatusWatcher 반환
+    - SINGER_STATUS_CHECK_INTERVAL 환경변수로 확인 간격 설정
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = SingerStatusWatcher(
+                get_singer_registry(),
+                check_interval=float(
+                    os.environ.get("SINGER_STATUS_CHECK_INTERVAL", 300)
+                ),
+            )
+        return _watcher
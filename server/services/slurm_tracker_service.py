@@ -0,0 +1,228 @@
+import os
+import time
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from services.ssh_service import ssh_session
+from services.metrics_service import SSH_COMMAND_SECONDS, STAGE_SECONDS
+
+# 더 이상 상태가 바뀌지 않는 Slurm 작업 상태
+TERMINAL_STATES = {
+    "COMPLETED",
+    "FAILED",
+    "CANCELLED",
+    "TIMEOUT",
+    "OUT_OF_MEMORY",
+    "NODE_FAIL",
+    "PREEMPTED",
+    "BOOT_FAIL",
+    "DEADLINE",
+    "DEPENDENCY_NEVER_SATISFIED",
+}
+# squeue/sacct 어디에도 보이지 않는 작업의 최종 상태 (accounting 미사용, sacct 기록 삭제 등)
+UNKNOWN_STATE = "UNKNOWN"
+
+
+class SlurmJobTracker:
+    """
+    여러 Slurm 작업의 상태를 하나의 스레드에서 추적
+    - 감시 중인 모든 job id를 squeue/sacct 한 번의 SSH 명령으로 조회
+    - 상태 변화가 없으면 조회 주기를 점점 늘리고, 변화가 생기면 다시 짧게
+    - 상태가 바뀔 때마다 콜백 호출, 종료 상태가 되면 Future에 최종 상태 전달
+    - 감시 시작 → RUNNING(대기 시간), RUNNING → 종료(실행 시간)를 조회 주기 단위로 기록
+    - squeue/sacct 모두에서 unknown_timeout초 넘게 보이지 않는 작업은 UNKNOWN 상태로 종료
+    """
+
+    def __init__(
+        self,
+        min_interval=2,
+        max_interval=30,
+        backoff=1.5,
+        workers=4,
+        unknown_timeout=600,
+    ):
+        """
+        :param min_interval: 최소 조회 주기(초)
+        :param max_interval: 최대 조회 주기(초)
+        :param backoff: 상태 변화가 없을 때 조회 주기에 곱할 배수
+        :param workers: 콜백/Future 처리에 사용할 스레드 수
+        :param unknown_timeout: 조회 결과에 없는 작업을 UNKNOWN으로 종료하기까지의 시간(초)
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.unknown_timeout = unknown_timeout
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # job_id -> {"state", "futures", "callbacks", "watched_at", "seen_at", "started_at"}
+        self._jobs = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="slurm-callback"
+        )
+        self._thread = None
+
+    def watch(self, job_id, on_change=None):
+        """
+        job_id 감시 시작
+        :param job_id: submit_job이 반환한 Slurm job id 또는 array task id (<job id>_<index>)
+        :param on_change: on_change(job_id, old_state, new_state) 형태의 콜백 (선택)
+        :return: 종료 상태(str)로 완료되는 Future
+        """
+        future = Future()
+        if not job_id:
+            future.set_exception(ValueError("job_id가 없습니다 (작업 제출 실패)"))
+            return future
+        job_id = str(job_id)
+        with self._lock:
+            job = self._jobs.setdefault(
+                job_id,
+                {
+                    "state": None,
+                    "futures": [],
+                    "callbacks": [],
+                    "watched_at": time.monotonic(),
+                    "seen_at": time.monotonic(),
+                    "started_at": None,
+                },
+            )
+            job["futures"].append(future)
+            if on_change:
+                job["callbacks"].append(on_change)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        # 새 작업이 등록되면 즉시 한 번 조회
+        self._wakeup.set()
+        return future
+
+    def _run(self):
+        interval = self.min_interval
+        while True:
+            self._wakeup.wait(interval)
+            woken = self._wakeup.is_set()
+            self._wakeup.clear()
+            with self._lock:
+                job_ids = list(self._jobs)
+            if not job_ids:
+                with self._lock:
+                    if not self._jobs:
+                        self._thread = None
+                        return
+                continue
+            try:
+                states = self._poll(job_ids)
+            except Exception as e:
+                logging.error(f"[ERROR] Slurm 상태 조회 실패: {e}")
+                interval = min(interval * self.backoff, self.max_interval)
+                continue
+            changed = self._apply(states)
+            if changed or woken:
+                interval = self.min_interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+
+    def _poll(self, job_ids):
+        """
+        squeue(대기/실행 중) + sacct(종료) 결과를 한 번에 조회
+        (squeue -r: 대기 중인 job array task도 한 줄씩 출력)
+        :return: {job_id: state}
+        """
+        ids = ",".join(job_ids)
+        command = (
+            f"squeue -h -r -j {ids} -o '%i|%T|%r' 2>/dev/null; "
+            "echo '--SACCT--'; "
+            f"sacct -n -X -P -j {ids} -o JobID,State 2>/dev/null"
+        )
+        with ssh_session() as ssh, SSH_COMMAND_SECONDS.time(command="slurm_poll"):
+            stdin, stdout, stderr = ssh.exec_command(command)
+            output = stdout.read().decode()
+        squeue_out, _, sacct_out = output.partition("--SACCT--")
+        states = {}
+        for line in sacct_out.splitlines():
+            parts = line.strip().split("|")
+            if len(parts) >= 2 and parts[0] in job_ids:
+                # "CANCELLED by 1234" 같은 형태에서 상태만 사용
+                states[parts[0]] = parts[1].split()[0]
+        # squeue에 보이는 작업은 squeue 결과가 더 최신
+        for line in squeue_out.splitlines():
+            parts = line.strip().split("|")
+            if len(parts) >= 2 and parts[0] in job_ids:
+                state = parts[1]
+                reason = parts[2] if len(parts) > 2 else ""
+                if state == "PENDING" and reason == "DependencyNeverSatisfied":
+                    state = "DEPENDENCY_NEVER_SATISFIED"
+                states[parts[0]] = state
+        return states
+
+    def _apply(self, states):
+        changed = False
+        finished = []
+        now = time.monotonic()
+        with self._lock:
+            for job_id, job in self._jobs.items():
+                if job_id in states:
+                    job["seen_at"] = now
+                elif now - job["seen_at"] > self.unknown_timeout:
+                    # 조회 결과에서 사라진 뒤 다시 나타나지 않음 (MinJobAge 경과 + sacct 없음 등)
+                    logging.error(
+                        f"[ERROR] Slurm 작업 {job_id}가 {self.unknown_timeout:.0f}초 동안 "
+                        f"squeue/sacct에 보이지 않아 {UNKNOWN_STATE}로 종료"
+                    )
+                    states[job_id] = UNKNOWN_STATE
+            for job_id, state in states.items():
+                job = self._jobs.get(job_id)
+                if job is None or job["state"] == state:
+                    continue
+                changed = True
+                old_state = job["state"]
+                job["state"] = state
+                self._record_timing(job, state)
+                logging.info(f"[LOG] Slurm 작업 {job_id}: {old_state} → {state}")
+                for callback in job["callbacks"]:
+                    self._executor.submit(
+                        self._safe_call, callback, job_id, old_state, state
+                    )
+                if state in TERMINAL_STATES or state == UNKNOWN_STATE:
+                    finished.append((job_id, self._jobs.pop(job_id)))
+        # Future 완료 콜백(동기화 등)이 조회 스레드를 막지 않도록 executor에서 처리
+        for job_id, job in finished:
+            for future in job["futures"]:
+                self._executor.submit(future.set_result, job["state"])
+        return changed
+
+    @staticmethod
+    def _record_timing(job, state):
+        now = time.monotonic()
+        if state == "RUNNING" and job["started_at"] is None:
+            job["started_at"] = now
+            STAGE_SECONDS.observe(now - job["watched_at"], stage="slurm_queue_wait")
+        elif state in TERMINAL_STATES and job["started_at"] is not None:
+            STAGE_SECONDS.observe(now - job["started_at"], stage="slurm_run")
+
+    @staticmethod
+    def _safe_call(callback, job_id, old_state, new_state):
+        try:
+            callback(job_id, old_state, new_state)
+        except Exception as e:
+            logging.error(f"[ERROR] Slurm 상태 콜백 실패 ({job_id}): {e}")
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_job_tracker():
+    """
+    프로세스 전역 SlurmJobTracker 반환
+    - SLURM_POLL_MIN_INTERVAL, SLURM_POLL_MAX_INTERVAL 환경변수로 조회 주기 설정
+    - SLURM_UNKNOWN_TIMEOUT 환경변수로 조회 결과에 없는 작업을 UNKNOWN으로 종료하기까지의 시간(초) 설정
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = SlurmJobTracker(
+                min_interval=float(os.environ.get("SLURM_POLL_MIN_INTERVAL", 2)),
+                max_interval=float(os.environ.get("SLURM_POLL_MAX_INTERVAL", 30)),
+                unknown_timeout=float(os.environ.get("SLURM_UNKNOWN_TIMEOUT", 600)),
+            )
+        return _tracker
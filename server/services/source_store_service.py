@@ -0,0 +1,174 @@
+import os
+import shlex
+import threading
+import logging
+from services.ssh_service import run_command
+
+REMOTE_SOURCE_STORE_DIR = "/data/msj9518/repos/vcstream/rvc/source_store"
+
+
+class RemoteSourceStore:
+    """
+    GPU 서버에 저장되는 원곡 오디오(yt-dlp 다운로드 결과) 저장소
+    - objects/<sha256>.<확장자>: 내용 해시로 중복 제거된 실제 파일
+    - videos/<유튜브 영상 ID>.<다운로드 형식>: objects 파일을 가리키는 심볼릭 링크 (조회용)
+      (다운로드 형식: wav 또는 native(opus/m4a 등 원본 압축 스트림), 형식별로 따로 저장)
+    - 작업 디렉토리 input에는 하드링크(다른 파일시스템이면 reflink/복사)로 연결해서 다시 다운로드하지 않음
+    - 조회/저장 시 mtime을 갱신하고, objects 전체 크기가 max_bytes를 넘으면 오래된 파일부터 삭제
+      (삭제된 파일을 가리키는 videos 링크는 미스로 처리되고 정리 시 함께 삭제)
+    - 적중/미스/저장/중복/삭제 횟수와 절약한 다운로드/디스크 바이트 수 통계
+    """
+
+    def __init__(self, store_dir=REMOTE_SOURCE_STORE_DIR, max_bytes=20 * 1024**3):
+        """
+        :param store_dir: GPU 서버의 저장소 디렉토리
+        :param max_bytes: 저장소 최대 크기(바이트)
+        """
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "dedups": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+            "dedup_bytes_saved": 0,
+        }
+
+    @property
+    def objects_dir(self):
+        return f"{self.store_dir}/objects"
+
+    @property
+    def videos_dir(self):
+        return f"{self.store_dir}/videos"
+
+    def video_path(self, video_id, audio_format="wav"):
+        return f"{self.videos_dir}/{video_id}.{audio_format}"
+
+    def fetch_command(self, video_id, name, audio_format="wav"):
+        """
+        저장소에 video_id가 있으면 현재 디렉토리의 <name>.<확장자>에 연결하는 셸 명령
+        성공하면 셸 변수 f에 파일명을 설정하고 "source-hit <크기>" 출력 (없으면 exit status 1)
+        """
+        src = shlex.quote(self.video_path(video_id, audio_format))
+        return (
+            f"[ -f {src} ] && f={shlex.quote(name)}.$(readlink {src} | sed 's/.*\\.//') && "
+            f"touch -c {src} && "
+            f'(ln -fL {src} "$f" 2>/dev/null || cp --reflink=auto {src} "$f") && '
+            f"echo source-hit $(stat -Lc %s {src})"
+        )
+
+    def put_command(self, video_id, audio_format="wav"):
+        """
+        다운로드한 파일(셸 변수 f)을 저장소에 넣는 셸 명령
+        - 같은 내용의 파일이 이미 있으면 f를 그 파일의 하드링크로 바꾸고 "source-dedup <크기>" 출력
+        - 임시 파일에 쓴 뒤 rename하므로 동시에 같은 곡을 저장해도 다른 작업이 읽는 파일은 바뀌지 않음
+        """
+        objects = shlex.quote(self.objects_dir)
+        videos = shlex.quote(self.videos_dir)
+        video = shlex.quote(self.video_path(video_id, audio_format))
+        return (
+            f"mkdir -p {objects} {videos} && "
+            f"h=$(sha256sum < \"$f\" | cut -d' ' -f1).${{f##*.}} && o={objects}/$h && "
+            f'if [ -f "$o" ]; then touch -c "$o"; '
+            f'ln -f "$o" "$f" 2>/dev/null && echo source-dedup $(stat -c %s "$o"); '
+            f'else ln "$f" "$o" 2>/dev/null || '
+            f'(cp --reflink=auto "$f" "$o.$$" && mv -f "$o.$$" "$o"); fi && '
+            f'ln -sfn "../objects/$h" {video} && echo source-stored'
+        )
+
+    def record(self, output):
+        """
+        fetch_command/put_command 출력으로 통계 갱신
+        :return: "hit", "stored", "miss"
+        """
+        result = "miss"
+        with self._lock:
+            for line in output.splitlines():
+                parts = line.split()
+                if not parts:
+                    continue
+                if parts[0] == "source-hit":
+                    result = "hit"
+                    self._stats["hits"] += 1
+                    self._stats["bytes_saved"] += _int(parts)
+                elif parts[0] == "source-dedup":
+                    self._stats["dedups"] += 1
+                    self._stats["dedup_bytes_saved"] += _int(parts)
+                elif parts[0] == "source-stored":
+                    result = "stored"
+                    self._stats["stores"] += 1
+            if result != "hit":
+                self._stats["misses"] += 1
+        return result
+
+    def evict(self, ssh):
+        """
+        objects 전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용되지 않은 파일 삭제
+        삭제된 파일을 가리키는 videos 링크도 함께 삭제
+        """
+        exit_status, output = run_command(
+            ssh,
+            f"find {shlex.quote(self.objects_dir)} -maxdepth 1 -type f "
+            "-printf '%T@ %s %p\\n' 2>/dev/null",
+        )
+        entries = []
+        for line in output.splitlines():
+            parts = line.split(" ", 2)
+            if len(parts) == 3:
+                entries.append((float(parts[0]), int(parts[1]), parts[2]))
+        total = sum(size for _, size, _ in entries)
+        victims = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            victims.append(path)
+            total -= size
+        if victims:
+            run_command(
+                ssh,
+                "rm -f "
+                + " ".join(shlex.quote(p) for p in victims)
+                + f" && find {shlex.quote(self.videos_dir)} -maxdepth 1 -xtype l -delete",
+            )
+            with self._lock:
+                self._stats["evictions"] += len(victims)
+            logging.info(f"[LOG] 원곡 저장소 {len(victims)}개 정리")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def _int(parts):
+    try:
+        return int(parts[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_source_store():
+    """
+    프로세스 전역 RemoteSourceStore 반환
+    - SOURCE_STORE_DIR, SOURCE_STORE_MAX_GB 환경변수로 설정
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RemoteSourceStore(
+                store_dir=os.environ.get("SOURCE_STORE_DIR", REMOTE_SOURCE_STORE_DIR),
+                max_bytes=int(
+                    float(os.environ.get("SOURCE_STORE_MAX_GB", 20)) * 1024**3
+                ),
+            )
+        return _store
@@ -0,0 +1,231 @@
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from services.metrics_service import SPOTIFY_REQUEST_SECONDS, SPOTIFY_PLAYLIST_CACHE
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+
+# 플레이리스트 곡 목록 요청 시 받을 필드 (필요한 값만 받아서 응답 크기 축소)
+PLAYLIST_TRACK_FIELDS = "next,items(track(id,name,artists(name)))"
+PLAYLIST_PAGE_SIZE = 100  # Spotify API 최대값
+
+
+def endpoint_label(url):
+    """
+    메트릭 라벨로 사용할 API 경로 (ID는 {id}로 치환, 쿼리 제외)
+    예: https://api.spotify.com/v1/playlists/abc/tracks?offset=100 → /playlists/{id}/tracks
+    """
+    path = urlsplit(url).path
+    if path.startswith("/v1/"):
+        path = path[len("/v1") :]
+    parts = path.split("/")
+    for i in range(2, len(parts)):
+        if parts[i - 1] in ("playlists", "tracks", "artists", "albums", "users"):
+            parts[i] = "{id}"
+    return "/".join(parts)
+
+
+class SpotifyClient:
+    """
+    Spotify Web API 클라이언트 (thread-safe)
+    - requests.Session 연결 풀을 공유해서 TCP/TLS 연결 재사용
+    - 429 응답은 Retry-After만큼 기다린 뒤 재시도하고, 그동안 같은 토큰의 다른 요청도 대기
+      (제한은 토큰별로 관리해서 한 사용자의 429가 다른 사용자의 요청을 막지 않음)
+    - 플레이리스트 곡 목록을 snapshot_id 기준으로 캐시
+      (변경되지 않은 플레이리스트는 snapshot_id 조회 요청 한 번으로 끝남)
+    """
+
+    def __init__(
+        self,
+        pool_size=16,
+        max_retries=3,
+        max_retry_after=60,
+        cache_size=256,
+        api_url=SPOTIFY_API_URL,
+    ):
+        """
+        :param pool_size: 연결 풀 크기
+        :param max_retries: 429/5xx 재시도 횟수
+        :param max_retry_after: 한 번에 기다릴 최대 시간(초)
+        :param cache_size: 캐시할 플레이리스트 수
+        :param api_url: Web API 주소 (벤치마크용 가짜 서버 등으로 바꿀 때 지정)
+        """
+        self.api_url = api_url.rstrip("/")
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.cache_size = cache_size
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._blocked_until = {}  # access_token -> 요청을 보내지 않을 시각
+        self._playlists = OrderedDict()  # playlist_id -> (snapshot_id, tracks)
+        self._stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "playlist_cache_hits": 0,
+            "playlist_cache_misses": 0,
+        }
+
+    def get(self, url, access_token, params=None, retries=None):
+        """
+        GET 요청 (429/5xx는 재시도)
+        :param url: 전체 URL 또는 /v1 이후 경로 (예: /me/player)
+        :param retries: 재시도 횟수 (없으면 max_retries, 0이면 429도 기다리지 않고 바로 반환)
+        :return: requests.Response (재시도 후에도 실패하면 마지막 응답)
+        """
+        if url.startswith("/"):
+            url = self.api_url + url
+        if retries is None:
+            retries = self.max_retries
+        headers = {"Authorization": f"Bearer {access_token}"}
+        for attempt in range(retries + 1):
+            self._wait_if_blocked(access_token)
+            with self._lock:
+                self._stats["requests"] += 1
+            started = time.monotonic()
+            res = self._session.get(url, headers=headers, params=params, timeout=15)
+            SPOTIFY_REQUEST_SECONDS.observe(
+                time.monotonic() - started,
+                endpoint=endpoint_label(url),
+                status=res.status_code,
+            )
+            if res.status_code == 429:
+                retry_after = self._retry_after(res)
+                with self._lock:
+                    self._stats["rate_limited"] += 1
+                    self._blocked_until[access_token] = max(
+                        self._blocked_until.get(access_token, 0.0),
+                        time.monotonic() + retry_after,
+                    )
+                    self._prune_blocked_locked()
+            if attempt == retries:
+                return res
+            if res.status_code == 429:
+                logging.warning(
+                    f"[LOG] Spotify 요청 제한(429), {retry_after}초 후 재시도"
+                )
+            elif res.status_code >= 500:
+                time.sleep(2**attempt)
+            else:
+                return res
+        return res
+
+    def _retry_after(self, res):
+        try:
+            retry_after = float(res.headers.get("Retry-After", 1))
+        except ValueError:
+            retry_after = 1.0
+        return min(max(retry_after, 0.0), self.max_retry_after)
+
+    def blocked_for(self, access_token):
+        """
+        토큰이 429로 제한된 남은 시간(초), 제한이 없으면 0
+        """
+        with self._lock:
+            until = self._blocked_until.get(access_token, 0.0)
+        return max(until - time.monotonic(), 0.0)
+
+    def _wait_if_blocked(self, access_token):
+        delay = self.blocked_for(access_token)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _prune_blocked_locked(self):
+        now = time.monotonic()
+        for token in [t for t, until in self._blocked_until.items() if until <= now]:
+            del self._blocked_until[token]
+
+    def get_json(self, url, access_token, params=None):
+        """
+        GET 요청 후 JSON 반환 (200이 아니면 requests.HTTPError)
+        """
+        res = self.get(url, access_token, params=params)
+        if res.status_code != 200:
+            logging.error(f"❌ Spotify 요청 실패({res.status_code}): {res.text}")
+            raise requests.HTTPError(
+                f"Spotify API error {res.status_code}", response=res
+            )
+        return res.json()
+
+    def get_playlist_tracks(self, playlist_id, access_token):
+        """
+        플레이리스트 곡 목록 (snapshot_id가 같으면 캐시 사용)
+        :return: [{"title", "artists", "id"}] 목록
+        """
+        snapshot_id = self.get_json(
+            f"/playlists/{playlist_id}", access_token, {"fields": "snapshot_id"}
+        ).get("snapshot_id")
+        with self._lock:
+            cached = self._playlists.get(playlist_id)
+            if cached is not None and snapshot_id and cached[0] == snapshot_id:
+                self._playlists.move_to_end(playlist_id)
+                self._stats["playlist_cache_hits"] += 1
+                SPOTIFY_PLAYLIST_CACHE.inc(result="hit")
+                return [dict(track) for track in cached[1]]
+            self._stats["playlist_cache_misses"] += 1
+            SPOTIFY_PLAYLIST_CACHE.inc(result="miss")
+
+        tracks = []
+        next_url = f"/playlists/{playlist_id}/tracks"
+        params = {
+            "fields": PLAYLIST_TRACK_FIELDS,
+            "limit": PLAYLIST_PAGE_SIZE,
+            "additional_types": "track",
+        }
+        while next_url:
+            data = self.get_json(next_url, access_token, params)
+            for item in data.get("items", []):
+                track = item.get("track")
+                if not track:
+                    continue
+                title = track.get("name", "Unknown Title")
+                artists = ", ".join(
+                    [artist["name"] for artist in track.get("artists", [])]
+                )
+                tracks.append(
+                    {"title": title, "artists": artists, "id": track.get("id")}
+                )
+            # next URL에는 fields/limit 등 쿼리가 이미 포함되어 있음
+            next_url = data.get("next")
+            params = None
+
+        if snapshot_id:
+            with self._lock:
+                self._playlists[playlist_id] = (snapshot_id, tracks)
+                self._playlists.move_to_end(playlist_id)
+                while len(self._playlists) > self.cache_size:
+                    self._playlists.popitem(last=False)
+        return [dict(track) for track in tracks]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_spotify_client():
+    """
+    프로세스 전역 SpotifyClient 반환
+    - SPOTIFY_POOL_SIZE, SPOTIFY_MAX_RETRIES, SPOTIFY_PLAYLIST_CACHE_SIZE,
+      SPOTIFY_API_URL 환경변수로 설정
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SpotifyClient(
+                pool_size=int(os.environ.get("SPOTIFY_POOL_SIZE", 16)),
+                max_retries=int(os.environ.get("SPOTIFY_MAX_RETRIES", 3)),
+                cache_size=int(os.environ.get("SPOTIFY_PLAYLIST_CACHE_SIZE", 256)),
+                api_url=os.environ.get("SPOTIFY_API_URL", SPOTIFY_API_URL),
+            )
+        return _client
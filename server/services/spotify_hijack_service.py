@@ -1,9 +1,21 @@
 import os
 import json
-import requests
+import posixpath
+import shlex
+import time
 import logging
-from .download_song_service import download_audio_as_wav, get_youtube_url
-from services.ssh_service import connect_ssh
+from concurrent.futures import ThreadPoolExecutor
+from .download_song_service import (
+    download_audio,
+    get_download_audio_format,
+    get_youtube_url,
+    resolve_youtube_ids,
+    youtube_watch_url,
+)
+from services.ssh_service import ssh_session, run_command, get_ssh_pool
+from services.spotify_client_service import get_spotify_client
+from services.metrics_service import STAGE_SECONDS, STAGE_FAILURES
+from services.source_store_service import get_source_store
 
 PLAYLIST_DIR = os.path.join("input", "playlist")
 SONGS_DIR = os.path.join("input", "songs")
@@ -41,56 +53,186 @@ class SpotifyHijackingService:
         for title, artist in song_list:
             url = get_youtube_url(title, artist)
             if url:
-                download_audio_as_wav(url, title, artist, self.output_dir)
+                download_audio(url, title, artist, self.output_dir)
 
 
 def get_playlist_tracks_with_token(playlist_id, access_token):
-    url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    tracks = []
-    next_url = url
-    while next_url:
-        res = requests.get(next_url, headers=headers)
-        if res.status_code != 200:
-            logging.error(f"❌ Spotify 요청 실패: {res.text}")
-            break
-        data = res.json()
-        for item in data["items"]:
-            track = item.get("track")
-            if not track:
-                continue
-            title = track.get("name", "Unknown Title")
-            artists = ", ".join([artist["name"] for artist in track.get("artists", [])])
-            tracks.append({"title": title, "artists": artists})
-        next_url = data.get("next")
-    return tracks
+    """
+    플레이리스트 곡 목록 조회 (snapshot_id가 바뀌지 않았으면 캐시 사용)
+    :return: [{"title", "artists", "id"}] 목록
+    """
+    return get_spotify_client().get_playlist_tracks(playlist_id, access_token)
 
 
 def download_playlist_to_gpu_via_ssh(
-    playlist_id, access_token, output_dir="/data/msj9518/repos/vcstream/rvc/input"
+    playlist_id,
+    access_token,
+    output_dir="/data/msj9518/repos/vcstream/rvc/input",
+    parallelism=None,
+    tracks=None,
 ):
     """
     playlist_id와 access_token을 받아, 해당 플레이리스트의 모든 곡을 GPU 서버 input 디렉토리에 SSH로 접속해 다운로드
+    - 유튜브 검색 캐시로 영상 ID를 한 번에 조회하고, 캐시된 영상은 검색 없이 바로 다운로드
+    - 하나의 SSH 연결 위에서 여러 채널로 yt-dlp를 동시에 실행
+    - 원곡 저장소에 있는 영상은 다운로드하지 않고 하드링크로 연결, 새로 받은 곡은 저장소에 추가
+    - 실제로 생성된 파일 목록을 output_dir/manifest.json에 기록
+    :param parallelism: 동시 다운로드 수 (기본값: 환경변수 YTDLP_PARALLELISM 또는 4)
+    :param tracks: 다운로드할 곡 목록 (주어지면 Spotify 조회를 생략하고 이 곡들만 다운로드)
+    :return: 다운로드에 성공한 파일 경로 목록
     """
-    tracks = get_playlist_tracks_with_token(playlist_id, access_token)
-    ssh = connect_ssh()
-    downloaded_files = []
+    if tracks is None:
+        tracks = get_playlist_tracks_with_token(playlist_id, access_token)
+    tracks = resolve_youtube_ids(tracks)
+    if parallelism is None:
+        parallelism = int(os.environ.get("YTDLP_PARALLELISM", 4))
+    with ssh_session() as ssh:
+        results = download_tracks_concurrently(ssh, tracks, output_dir, parallelism)
+        write_download_manifest(ssh, output_dir, results)
+        try:
+            get_source_store().evict(ssh)
+        except Exception as e:
+            logging.error(f"[ERROR] 원곡 저장소 정리 실패: {e}")
+    return list(dict.fromkeys(r["path"] for r in results if r["ok"]))
+
+
+def download_tracks_concurrently(ssh, tracks, output_dir, parallelism):
+    """
+    최대 parallelism개의 yt-dlp를 동시에 실행해 곡들을 다운로드
+    - 파일명(safe_track_name)이 같은 곡은 한 번만 다운로드 (같은 파일을 동시에 쓰지 않도록)
+    :param ssh: 풀에서 대여한 SSHClient (채널 다중화로 공유)
+    :param tracks: [{"title", "artists", "video_id"(선택)}] 목록
+    :return: 곡별 결과 [{"title", "artists", "video_id", "path", "ok", "exit_status", "elapsed", "error", "source"}]
+        (tracks와 같은 순서, source: 원곡 저장소 적중이면 "hit", 다운로드 후 저장했으면 "stored")
+    """
+    started = time.monotonic()
+    unique = {}
     for track in tracks:
-        title = track["title"]
-        artists = track["artists"]
-        query = f"{title} {artists} lyrics"
-        safe_title = f"{title} - {artists}".replace("/", "_").replace("\\", "_")
-        output_path = f"{output_dir}/{safe_title}.wav"
-        yt_dlp_cmd = (
-            f"cd {output_dir} && "
-            "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
-            f'yt-dlp -x --audio-format wav "ytsearch1:{query}" -o "{safe_title}.%(ext)s"'
+        unique.setdefault(safe_track_name(track), track)
+    with ThreadPoolExecutor(max_workers=max(1, parallelism)) as executor:
+        downloaded = dict(
+            zip(
+                unique,
+                executor.map(
+                    lambda t: _download_track(ssh, t, output_dir), unique.values()
+                ),
+            )
+        )
+    results = [
+        dict(
+            downloaded[safe_track_name(track)],
+            title=track["title"],
+            artists=track["artists"],
         )
-        stdin, stdout, stderr = ssh.exec_command(yt_dlp_cmd)
-        stdout.channel.recv_exit_status()  # 명령 완료 대기
-        downloaded_files.append(output_path)
-    ssh.close()
-    return downloaded_files
+        for track in tracks
+    ]
+    ok_count = sum(1 for r in results if r["ok"])
+    hit_count = sum(1 for r in results if r["ok"] and r["source"] == "hit")
+    logging.info(
+        f"[LOG] 플레이리스트 다운로드 완료: {ok_count}/{len(results)}곡 성공 "
+        f"(원곡 저장소 {hit_count}곡 재사용), "
+        f"{time.monotonic() - started:.1f}초 (동시 {parallelism}개)"
+    )
+    return results
+
+
+def safe_track_name(track):
+    """
+    GPU 서버에 저장되는 곡 파일명 (확장자 제외, 이후 단계의 파일명 접두어로도 사용)
+    """
+    return f"{track['title']} - {track['artists']}".replace("/", "_").replace("\\", "_")
+
+
+def _download_track(ssh, track, output_dir):
+    title = track["title"]
+    artists = track["artists"]
+    safe_title = safe_track_name(track)
+    audio_format = get_download_audio_format()
+    if track.get("video_id"):
+        source = youtube_watch_url(track["video_id"])
+    else:
+        # 캐시 조회/검색이 실패한 곡은 GPU 서버에서 직접 검색
+        source = f"ytsearch1:{title} {artists} lyrics"
+    # native면 원본 압축 스트림(opus/m4a 등)을 그대로, wav면 WAV로 변환해서 저장
+    # 최종 파일명은 yt-dlp가 출력한 경로(확장자가 형식에 따라 다름)를 셸 변수 f로 받음
+    format_options = "-x" if audio_format == "native" else "-x --audio-format wav"
+    download_cmd = (
+        "source /data/msj9518/anaconda3/etc/profile.d/conda.sh && conda activate rvc && "
+        f"f=$(yt-dlp {format_options} {shlex.quote(source)} "
+        f"-o {shlex.quote(safe_title + '.%(ext)s')} --print after_move:filepath)"
+    )
+    store = get_source_store()
+    if track.get("video_id"):
+        # 원곡 저장소에 있으면 연결만, 없으면 다운로드 후 저장 (저장 실패는 다운로드 실패로 보지 않음)
+        video_id = track["video_id"]
+        download_cmd = (
+            f"{store.fetch_command(video_id, safe_title, audio_format)} || "
+            f"{{ {download_cmd} && {{ {store.put_command(video_id, audio_format)} || true; }}; }}"
+        )
+    # 파일이 실제로 생성된 경우에만 exit status 0
+    yt_dlp_cmd = (
+        f"cd {shlex.quote(output_dir)} && {{ {download_cmd}; }} && "
+        'test -s "$f" && echo "downloaded:$f"'
+    )
+    result = {
+        "title": title,
+        "artists": artists,
+        "video_id": track.get("video_id"),
+        "path": None,
+        "ok": False,
+        "exit_status": None,
+        "elapsed": None,
+        "error": None,
+        "source": None,
+    }
+    if "video_id" in track and track["video_id"] is None:
+        result["error"] = "유튜브 검색 결과 없음"
+        logging.error(f"[ERROR] 다운로드 건너뜀: {safe_title} - {result['error']}")
+        return result
+    started = time.monotonic()
+    try:
+        exit_status, output = run_command(ssh, yt_dlp_cmd, label="yt-dlp")
+        result["exit_status"] = exit_status
+        landed = [
+            line[len("downloaded:") :]
+            for line in output.splitlines()
+            if line.startswith("downloaded:")
+        ]
+        result["ok"] = exit_status == 0 and bool(landed)
+        if result["ok"]:
+            # yt-dlp(--print after_move:filepath)는 절대 경로, 원곡 저장소 적중은 파일명만 출력
+            result["path"] = posixpath.join(output_dir, posixpath.basename(landed[-1]))
+        if result["ok"] and track.get("video_id"):
+            result["source"] = store.record(output)
+        if not result["ok"]:
+            result["error"] = output.strip().splitlines()[-1] if output.strip() else ""
+    except Exception as e:
+        result["error"] = str(e)
+    result["elapsed"] = round(time.monotonic() - started, 2)
+    STAGE_SECONDS.observe(result["elapsed"], stage="ytdlp_download")
+    if not result["ok"]:
+        STAGE_FAILURES.inc(stage="ytdlp_download")
+    if result["ok"] and result["source"] == "hit":
+        logging.info(f"[LOG] 원곡 저장소 재사용: {safe_title} ({result['elapsed']}초)")
+    elif result["ok"]:
+        logging.info(f"[LOG] 다운로드 성공: {safe_title} ({result['elapsed']}초)")
+    else:
+        logging.error(f"[ERROR] 다운로드 실패: {safe_title} - {result['error']}")
+    return result
+
+
+def write_download_manifest(ssh, output_dir, results):
+    """
+    실제로 다운로드된 파일과 실패한 곡을 output_dir/manifest.json에 기록
+    곡 단위 파이프라인(job array)용으로 성공한 곡 이름을 한 줄에 하나씩 output_dir/tracks.txt에 기록
+    """
+    files = list(dict.fromkeys(os.path.basename(r["path"]) for r in results if r["ok"]))
+    manifest = {"files": files, "tracks": results}
+    sftp = get_ssh_pool().get_sftp(ssh)
+    with sftp.open(f"{output_dir}/manifest.json", "w") as f:
+        f.write(json.dumps(manifest, ensure_ascii=False, indent=2))
+    with sftp.open(f"{output_dir}/tracks.txt", "w") as f:
+        f.write("".join(f"{os.path.splitext(name)[0]}\n" for name in files))
 
 
 # 사용 예시
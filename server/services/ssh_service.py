@@ -1,35 +1,276 @@
 import os
+import atexit
+import socket
+import threading
+from contextlib import contextmanager
 import paramiko
 import time
 import logging
 import re
+from services.metrics_service import (
+    SSH_COMMAND_SECONDS,
+    SSH_COMMAND_FAILURES,
+    TRANSFER_BYTES,
+)
 
 logging.basicConfig(level=logging.INFO)
 
 
+class SSHConnectionPool:
+    """
+    GPU 서버 SSH 연결 풀 (thread-safe)
+    - 반납된 연결을 재사용해 TCP 연결/키 교환/비밀번호 인증 비용을 한 번만 지불
+    - Transport keepalive 전송, 대여 시 health check
+    - 최대 연결 수 제한(초과 요청은 대기), 유휴 연결 자동 정리
+    - 연결마다 SFTP 채널을 캐시해서 파일 전송마다 서브시스템을 새로 열지 않음
+    """
+
+    def __init__(
+        self,
+        max_size=8,
+        idle_timeout=300,
+        keepalive_interval=30,
+        acquire_timeout=60,
+        sftp_window_size=None,
+    ):
+        """
+        :param max_size: 동시에 유지할 최대 SSH 연결 수 (대여 중 + 유휴)
+        :param idle_timeout: 유휴 연결을 닫기까지의 시간(초)
+        :param keepalive_interval: Transport keepalive 전송 주기(초)
+        :param acquire_timeout: 풀이 가득 찼을 때 연결을 기다리는 최대 시간(초)
+        :param sftp_window_size: SFTP 채널 윈도우 크기(바이트, None이면 paramiko 기본값)
+            클수록 왕복 지연이 큰 회선에서 대용량 파일 전송이 빨라짐
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.acquire_timeout = acquire_timeout
+        self.sftp_window_size = sftp_window_size
+        self._cond = threading.Condition()
+        self._idle = []  # [(ssh, 반납 시각)], 마지막 원소가 가장 최근
+        self._sftp = {}  # ssh -> 캐시된 SFTPClient
+        self._total = 0  # 대여 중 + 유휴 + 생성 중인 연결 수
+        self._reaper = None
+        self._closed = False
+
+    def _new_client(self):
+        host = os.environ.get("SSH_HOST")
+        username = os.environ.get("SSH_USER")
+        password = os.environ.get("SSH_PASSWORD")
+        port = int(os.environ.get("SSH_PORT", 22))
+
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        ssh.connect(host, port=port, username=username, password=password)
+        ssh.get_transport().set_keepalive(self.keepalive_interval)
+        logging.info(f"[LOG] SSH 연결 생성: {host}:{port} (총 {self._total}개)")
+        return ssh
+
+    @staticmethod
+    def is_healthy(ssh):
+        """
+        Transport가 살아 있고 패킷 전송이 가능한지 확인
+        """
+        transport = ssh.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def acquire(self):
+        """
+        풀에서 SSH 연결을 대여 (유휴 연결이 없고 여유가 있으면 새로 생성)
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            ssh = None
+            with self._cond:
+                while True:
+                    self._evict_idle_locked()
+                    if self._idle:
+                        ssh, _ = self._idle.pop()
+                        break
+                    if self._total < self.max_size:
+                        self._total += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"SSH 연결 풀 대기 시간 초과 (max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+            if ssh is None:
+                break
+            # health check는 네트워크 왕복이 필요하므로 락 밖에서 수행
+            if self.is_healthy(ssh):
+                return ssh
+            self._discard(ssh)
+        # 연결 생성은 오래 걸리므로 락 밖에서 수행
+        try:
+            ssh = self._new_client()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        self._ensure_reaper()
+        return ssh
+
+    def release(self, ssh, discard=False):
+        """
+        대여한 연결을 풀에 반납 (끊어졌거나 discard=True면 닫고 버림)
+        """
+        # health check/연결 종료는 락 밖에서 수행 (멈춘 Transport가 다른 대여/반납을 막지 않도록)
+        if discard or not self.is_healthy(ssh):
+            self._discard(ssh)
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append((ssh, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(ssh)
+
+    def get_sftp(self, ssh):
+        """
+        연결에 캐시된 SFTP 채널을 반환 (없거나 닫혔으면 새로 열어서 캐시)
+        """
+        with self._cond:
+            sftp = self._sftp.get(ssh)
+        if sftp is not None and not sftp.get_channel().closed:
+            return sftp
+        sftp = paramiko.SFTPClient.from_transport(
+            ssh.get_transport(), window_size=self.sftp_window_size
+        )
+        with self._cond:
+            self._sftp[ssh] = sftp
+        return sftp
+
+    def close_all(self):
+        """
+        유휴 연결을 모두 닫고, 이후 반납되는 연결도 닫도록 설정
+        """
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                ssh, _ = self._idle.pop()
+                self._discard_locked(ssh)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "total": self._total,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+            }
+
+    @staticmethod
+    def _close(ssh, sftp):
+        try:
+            if sftp is not None:
+                sftp.close()
+            ssh.close()
+        except Exception as e:
+            logging.warning(f"[LOG] SSH 연결 종료 중 오류(무시): {e}")
+
+    def _discard(self, ssh):
+        with self._cond:
+            sftp = self._sftp.pop(ssh, None)
+        self._close(ssh, sftp)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _discard_locked(self, ssh):
+        self._close(ssh, self._sftp.pop(ssh, None))
+        self._total -= 1
+
+    def _evict_idle_locked(self):
+        now = time.monotonic()
+        # 오래된 연결이 리스트 앞쪽에 있음
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            ssh, _ = self._idle.pop(0)
+            logging.info("[LOG] 유휴 SSH 연결 정리")
+            self._discard_locked(ssh)
+
+    def _ensure_reaper(self):
+        with self._cond:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        # 요청이 없는 동안에도 유휴 연결이 남지 않도록 주기적으로 정리
+        while not self._closed:
+            time.sleep(max(self.idle_timeout / 2, 1))
+            with self._cond:
+                self._evict_idle_locked()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ssh_pool():
+    """
+    프로세스 전역 SSH 연결 풀 반환 (최초 호출 시 환경변수로 설정)
+    - SSH_POOL_MAX_SIZE, SSH_POOL_IDLE_TIMEOUT, SSH_KEEPALIVE_INTERVAL, SSH_POOL_ACQUIRE_TIMEOUT,
+      SFTP_WINDOW_SIZE
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SSHConnectionPool(
+                max_size=int(os.environ.get("SSH_POOL_MAX_SIZE", 8)),
+                idle_timeout=float(os.environ.get("SSH_POOL_IDLE_TIMEOUT", 300)),
+                keepalive_interval=int(os.environ.get("SSH_KEEPALIVE_INTERVAL", 30)),
+                acquire_timeout=float(os.environ.get("SSH_POOL_ACQUIRE_TIMEOUT", 60)),
+                sftp_window_size=int(os.environ.get("SFTP_WINDOW_SIZE", 64 * 1024**2)),
+            )
+            atexit.register(_pool.close_all)
+        return _pool
+
+
 def connect_ssh():
     """
-    SSH 연결을 생성하여 반환
+    SSH 연결을 풀에서 대여하여 반환 (사용 후 close_ssh로 반납)
     환경변수에서 접속 정보(호스트, 유저, 비밀번호, 포트) 사용
     """
-    host = os.environ.get("SSH_HOST")
-    username = os.environ.get("SSH_USER")
-    password = os.environ.get("SSH_PASSWORD")
-    port = int(os.environ.get("SSH_PORT", 22))
+    return get_ssh_pool().acquire()
 
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect(host, port=port, username=username, password=password)
-    return ssh
+
+@contextmanager
+def ssh_session():
+    """
+    with 블록 동안 풀의 SSH 연결을 대여하고, 블록이 끝나면 반납
+    연결 오류로 끝난 경우에는 연결을 버림
+    """
+    pool = get_ssh_pool()
+    ssh = pool.acquire()
+    try:
+        yield ssh
+    except (paramiko.SSHException, socket.error):
+        pool.release(ssh, discard=True)
+        raise
+    except BaseException:
+        pool.release(ssh)
+        raise
+    else:
+        pool.release(ssh)
 
 
 def upload_file(ssh, local_path, remote_path):
     """
     로컬 파일을 SSH를 통해 원격 서버로 업로드
     """
-    sftp = ssh.open_sftp()
+    sftp = get_ssh_pool().get_sftp(ssh)
     sftp.put(local_path, remote_path)
-    sftp.close()
+    TRANSFER_BYTES.inc(os.path.getsize(local_path), direction="upload")
 
 
 def submit_job(ssh, command):
@@ -39,9 +280,10 @@ def submit_job(ssh, command):
     :return: Slurm 제출 결과 메시지와 job id
     """
     logging.info(f"[LOG] SSH에서 Slurm 작업 제출: {command}")
-    stdin, stdout, stderr = ssh.exec_command(command)
-    job_submission_output = stdout.read().decode().strip()
-    error_output = stderr.read().decode().strip()
+    with SSH_COMMAND_SECONDS.time(command="sbatch"):
+        stdin, stdout, stderr = ssh.exec_command(command)
+        job_submission_output = stdout.read().decode().strip()
+        error_output = stderr.read().decode().strip()
     logging.info(f"[LOG] Slurm 제출 결과: {job_submission_output}")
     if error_output and "AURORA: Job submitted" not in error_output:
         logging.error(f"[ERROR] Slurm 제출 에러: {error_output}")
@@ -50,9 +292,49 @@ def submit_job(ssh, command):
     # Slurm job id 추출
     match = re.search(r"Submitted batch job (\d+)", job_submission_output)
     job_id = match.group(1) if match else None
+    if job_id is None:
+        SSH_COMMAND_FAILURES.inc(command="sbatch")
     return job_id
 
 
+def command_label(command):
+    """
+    메트릭 라벨로 사용할 명령 이름 (앞쪽의 cd/source/conda activate 등은 건너뜀)
+    예: "cd /dir && yt-dlp ..." → "yt-dlp"
+    """
+    for part in re.split(r"&&|\|\||;", command):
+        tokens = part.split()
+        if tokens and tokens[0] not in ("cd", "source", "conda"):
+            return os.path.basename(tokens[0])
+    return "unknown"
+
+
+def run_command(ssh, command, label=None):
+    """
+    연결의 Transport에 새 채널을 열어 명령을 실행하고 종료까지 대기
+    채널 단위로 동작하므로 여러 스레드가 하나의 SSH 연결에서 동시에 호출 가능
+    :param command: 실행할 전체 명령어
+    :param label: 메트릭 라벨 (없으면 명령어에서 추출)
+    :return: (exit status, stdout+stderr 출력)
+    """
+    label = label or command_label(command)
+    exit_status = None
+    try:
+        with SSH_COMMAND_SECONDS.time(command=label):
+            channel = ssh.get_transport().open_session()
+            try:
+                channel.set_combine_stderr(True)
+                channel.exec_command(command)
+                output = channel.makefile("rb").read().decode(errors="replace")
+                exit_status = channel.recv_exit_status()
+            finally:
+                channel.close()
+    finally:
+        if exit_status != 0:
+            SSH_COMMAND_FAILURES.inc(command=label)
+    return exit_status, output
+
+
 def wait_for_job_done(ssh, output_path, check_interval=5):
     """
     Slurm 작업이 완료될 때까지(결과 파일이 생성될 때까지) 대기
@@ -83,18 +365,18 @@ def download_file(
     원격 서버에서 파일을 다운로드하고, 필요시 원격 파일 삭제
     """
     logging.info(f"[LOG] 다운로드 시도: {remote_path} → {local_path}")
-    sftp = ssh.open_sftp()
+    sftp = get_ssh_pool().get_sftp(ssh)
     sftp.get(remote_path, local_path)
+    TRANSFER_BYTES.inc(os.path.getsize(local_path), direction="download")
     if remote_input_path != "none":
         sftp.remove(remote_input_path)
     if remote_output_path != "none":
         sftp.remove(remote_output_path)
-    sftp.close()
     logging.info(f"[LOG] 다운로드 완료: {local_path}")
 
 
 def close_ssh(ssh):
     """
-    SSH 연결 종료
+    SSH 연결을 풀에 반납 (끊어진 연결은 닫고 버림)
     """
-    ssh.close()
+    get_ssh_pool().release(ssh)
@@ -0,0 +1,146 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import logging
+
+CACHE_DIR = "cache"
+
+
+def normalize_track_key(title, artists=None):
+    """
+    (곡 제목, 아티스트)를 대소문자/공백/유니코드 표기 차이에 무관한 캐시 키로 변환
+    """
+    parts = []
+    for part in (title, artists or ""):
+        part = unicodedata.normalize("NFKC", part).casefold()
+        parts.append(re.sub(r"\s+", " ", part).strip())
+    return "query:" + "|".join(parts)
+
+
+def track_cache_keys(track):
+    """
+    곡 정보로 조회할 캐시 키 목록 (Spotify track id 키가 있으면 우선)
+    :param track: {"title", "artists", "id"(선택)} 형태의 dict
+    """
+    keys = []
+    if track.get("id"):
+        keys.append(f"spotify:{track['id']}")
+    keys.append(normalize_track_key(track["title"], track.get("artists")))
+    return keys
+
+
+class YoutubeResolutionCache:
+    """
+    곡 → 유튜브 영상 ID 검색 결과를 저장하는 SQLite 캐시
+    - 검색 결과 없음도 저장(negative caching, 더 짧은 TTL)
+    - TTL이 지난 항목은 무시, 최대 개수를 넘으면 가장 오래 조회되지 않은 항목부터 삭제(LRU)
+    - get_many/put_many로 플레이리스트 전체를 한 번에 조회/저장
+    """
+
+    def __init__(
+        self, path, ttl=30 * 24 * 3600, negative_ttl=24 * 3600, max_entries=50000
+    ):
+        """
+        :param path: SQLite 파일 경로
+        :param ttl: 검색 결과 유효 시간(초)
+        :param negative_ttl: "검색 결과 없음" 유효 시간(초)
+        :param max_entries: 최대 저장 항목 수
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS youtube_cache ("
+            "key TEXT PRIMARY KEY, video_id TEXT, resolved_at REAL, last_access REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_youtube_cache_access "
+            "ON youtube_cache(last_access)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys):
+        """
+        유효한 캐시 항목을 한 번에 조회
+        :return: {key: video_id} (검색 결과 없음으로 저장된 키는 값이 None, 캐시에 없는 키는 제외)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = self._conn.execute(
+                    "SELECT key, video_id, resolved_at FROM youtube_cache "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, video_id, resolved_at in rows:
+                    ttl = self.ttl if video_id else self.negative_ttl
+                    if now - resolved_at <= ttl:
+                        found[key] = video_id
+            if found:
+                self._conn.executemany(
+                    "UPDATE youtube_cache SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items):
+        """
+        검색 결과를 저장 (video_id가 None이면 "검색 결과 없음"으로 저장)
+        :param items: {key: video_id 또는 None}
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO youtube_cache "
+                "(key, video_id, resolved_at, last_access) VALUES (?, ?, ?, ?)",
+                [(key, video_id, now, now) for key, video_id in items.items()],
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM youtube_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM youtube_cache WHERE key IN ("
+                "SELECT key FROM youtube_cache ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+            logging.info(f"[LOG] 유튜브 검색 캐시 {overflow}개 정리(LRU)")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_youtube_cache():
+    """
+    프로세스 전역 YoutubeResolutionCache 반환
+    - YOUTUBE_CACHE_PATH, YOUTUBE_CACHE_MAX_ENTRIES 환경변수로 설정
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = YoutubeResolutionCache(
+                os.environ.get(
+                    "YOUTUBE_CACHE_PATH", os.path.join(CACHE_DIR, "youtube.sqlite3")
+                ),
+                max_entries=int(os.environ.get("YOUTUBE_CACHE_MAX_ENTRIES", 50000)),
+            )
+        return _cache
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# server/ 디렉토리 기준 import (services.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
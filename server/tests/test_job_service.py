@@ -0,0 +1,76 @@
+import time
+import threading
+from services import job_service
+from services.job_service import JobManager, JobStore
+
+
+def make_manager(tmp_path):
+    return JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), workers=2)
+
+
+def wait_for_status(manager, job_id, statuses, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        doc = manager.get(job_id)
+        if doc["status"] in statuses:
+            return doc
+        time.sleep(0.01)
+    raise AssertionError(f"작업 {job_id}가 {statuses} 상태가 되지 않음")
+
+
+def test_submit_returns_immediately_and_records_progress(tmp_path, monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        job_service, "publish", lambda event, data: events.append((event, data))
+    )
+    manager = make_manager(tmp_path)
+    release = threading.Event()
+
+    def run(job):
+        job.set_stage("downloading")
+        job.set_tracks(["A", "B"])
+        release.wait(3)
+        job.update_tracks(["A"], "completed")
+        job.complete({"ok": True})
+
+    job_id = manager.submit("convert_playlist", {"singer": "IU"}, run)
+    assert manager.get(job_id)["status"] in ("queued", "running")
+    release.set()
+    doc = wait_for_status(manager, job_id, {"completed"})
+    assert doc["result"] == {"ok": True}
+    assert doc["tracks"]["A"]["status"] == "completed"
+    assert doc["tracks"]["B"]["status"] == "pending"
+    assert "seconds" in doc["timings"]["downloading"]
+    assert ("track", {"job_id": job_id, "track": "A", "status": "completed"}) in events
+
+    # 다른 관리자(서버 재시작)에서도 저장소로 조회 가능
+    assert make_manager(tmp_path).get(job_id)["status"] == "completed"
+
+
+def test_exception_fails_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_service, "publish", lambda event, data: None)
+    manager = make_manager(tmp_path)
+
+    def run(job):
+        raise RuntimeError("boom")
+
+    job_id = manager.submit("convert", {}, run)
+    doc = wait_for_status(manager, job_id, {"failed"})
+    assert doc["error"] == "boom"
+
+
+def test_recover_resumes_or_fails_unfinished_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_service, "publish", lambda event, data: None)
+    manager = make_manager(tmp_path)
+    started = threading.Event()
+    ids = [
+        manager.submit("convert", {"n": n}, lambda job: started.set()) for n in range(2)
+    ]
+    for job_id in ids:
+        wait_for_status(manager, job_id, {"queued"})
+    started.wait(3)
+
+    restarted = make_manager(tmp_path)
+    restarted.recover(lambda job: job.doc["params"]["n"] == 0)
+    assert restarted.get(ids[0])["status"] == "queued"
+    assert restarted.get(ids[1])["status"] == "failed"
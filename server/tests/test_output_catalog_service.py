@@ -0,0 +1,99 @@
+import os
+import threading
+from services.output_catalog_service import OutputCatalog
+
+
+def make_catalog(tmp_path, singers=None):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir(exist_ok=True)
+    return OutputCatalog(
+        output_dir=str(output_dir),
+        path=str(tmp_path / "catalog.json"),
+        singers=singers,
+    )
+
+
+def write_output(tmp_path, name, mtime):
+    path = tmp_path / "output" / name
+    path.write_bytes(b"x" * 10)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def count_saves(catalog):
+    saves = []
+    original = catalog._save_locked
+
+    def save_locked():
+        saves.append(1)
+        original()
+
+    catalog._save_locked = save_locked
+    return saves
+
+
+def test_page_newest_first_with_cursor_and_singer(tmp_path):
+    catalog = make_catalog(tmp_path)
+    for i, singer in enumerate(["IU", "IU", "Taeyeon", "IU"]):
+        catalog.add(write_output(tmp_path, f"{singer}_song{i}_-_A.wav", 1000 + i))
+
+    everything, next_cursor, _ = catalog.page(limit=None)
+    assert [item["file"] for item in everything] == [
+        "IU_song3_-_A.wav",
+        "Taeyeon_song2_-_A.wav",
+        "IU_song1_-_A.wav",
+        "IU_song0_-_A.wav",
+    ]
+    assert next_cursor is None
+
+    first, cursor, _ = catalog.page(singer="IU", limit=2)
+    second, last_cursor, _ = catalog.page(singer="IU", cursor=cursor, limit=2)
+    assert [item["file"] for item in first + second] == [
+        "IU_song3_-_A.wav",
+        "IU_song1_-_A.wav",
+        "IU_song0_-_A.wav",
+    ]
+    assert last_cursor is None
+
+
+def test_register_many_saves_once_and_survives_restart(tmp_path):
+    catalog = make_catalog(tmp_path)
+    saves = count_saves(catalog)
+    catalog.register_many(
+        [(f"IU_song{i}_-_A.wav", "IU", f"song {i}", "A") for i in range(20)]
+    )
+    assert len(saves) == 1
+
+    write_output(tmp_path, "IU_song0_-_A.wav", 1000)
+    restarted = make_catalog(tmp_path)
+    items, _, _ = restarted.page(limit=None)
+    assert [(item["singer"], item["title"]) for item in items] == [("IU", "song 0")]
+
+
+def test_add_without_save_is_visible_until_save(tmp_path):
+    catalog = make_catalog(tmp_path)
+    saves = count_saves(catalog)
+    version = catalog.version
+    catalog.add(write_output(tmp_path, "IU_song_-_A.wav", 1000), save=False)
+    assert len(catalog) == 1 and catalog.version != version
+    assert saves == []
+    catalog.save()
+    catalog.save()
+    assert len(saves) == 1
+
+
+def test_singer_names_resolved_outside_catalog_lock(tmp_path):
+    catalog = None
+
+    def singers():
+        # 가수 목록 조회 중에 다른 스레드가 catalog를 읽을 수 있어야 함
+        reader = threading.Thread(target=lambda: catalog.page(limit=None))
+        reader.start()
+        reader.join(timeout=2)
+        assert not reader.is_alive()
+        return ["New Jeans"]
+
+    catalog = make_catalog(tmp_path, singers=singers)
+    catalog.add(write_output(tmp_path, "New_Jeans_Super_Shy_-_NJ.wav", 1000))
+    items, _, _ = catalog.page(limit=None)
+    assert (items[0]["singer"], items[0]["title"]) == ("New Jeans", "Super Shy")
@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+import pytest
+from services.output_stream_service import RenditionCache, parse_bitrate
+
+
+def make_source(tmp_path):
+    src = tmp_path / "song.wav"
+    src.write_bytes(b"RIFF" + b"\0" * 100)
+    return str(src)
+
+
+def test_parse_bitrate_clamps_and_defaults():
+    assert parse_bitrate("500", 128) == 320
+    assert parse_bitrate("8", 128) == 32
+    assert parse_bitrate("abc", 128) == 128
+    assert parse_bitrate(None, 96) == 96
+
+
+def test_failed_transcode_does_not_leak_key_lock(tmp_path, monkeypatch):
+    cache = RenditionCache(cache_dir=str(tmp_path / "cache"))
+
+    def fail(src_path, out_path, fmt, bitrate):
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다.")
+
+    monkeypatch.setattr(cache, "_transcode", fail)
+    with pytest.raises(RuntimeError):
+        cache.get(make_source(tmp_path), "mp3", 160)
+    assert cache._key_locks == {}
+
+
+def test_concurrent_requests_transcode_once(tmp_path, monkeypatch):
+    cache = RenditionCache(cache_dir=str(tmp_path / "cache"))
+    calls = []
+
+    def transcode(src_path, out_path, fmt, bitrate):
+        calls.append(out_path)
+        time.sleep(0.1)
+        with open(out_path, "wb") as f:
+            f.write(b"encoded")
+
+    monkeypatch.setattr(cache, "_transcode", transcode)
+    src = make_source(tmp_path)
+    paths = []
+    threads = [
+        threading.Thread(target=lambda: paths.append(cache.get(src, "adts", 128)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(set(paths)) == 1 and paths[0].endswith(".aac")
+    assert cache._key_locks == {}
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = RenditionCache(cache_dir=str(tmp_path / "cache"), max_bytes=10)
+    for i, name in enumerate(("old.mp3", "new.mp3")):
+        path = tmp_path / "cache" / name
+        path.write_bytes(b"x" * 8)
+        t = time.time() - 100 + i
+        os.utime(path, (t, t))
+    cache.evict()
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == ["new.mp3"]
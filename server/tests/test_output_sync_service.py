@@ -0,0 +1,100 @@
+import os
+import json
+import shutil
+from contextlib import contextmanager
+from services import output_sync_service
+from services.output_sync_service import OutputSyncer
+
+
+class FakeSFTP:
+    def get(self, remote_path, local_path):
+        shutil.copy(remote_path, local_path)
+
+
+class FakePool:
+    def get_sftp(self, ssh):
+        return FakeSFTP()
+
+
+@contextmanager
+def fake_session():
+    yield None
+
+
+class LocalSyncer(OutputSyncer):
+    """
+    원격 디렉토리 대신 로컬 디렉토리를 조회 (크기, 수정 시각)
+    """
+
+    saves = 0
+
+    def list_remote(self, ssh, remote_dir, files=None):
+        remote = {}
+        for name in sorted(os.listdir(remote_dir)):
+            path = os.path.join(remote_dir, name)
+            st = os.stat(path)
+            remote[path] = (st.st_size, str(st.st_mtime))
+        return remote
+
+    def _save_manifest_locked(self):
+        self.saves += 1
+        super()._save_manifest_locked()
+
+
+def make_syncer(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_sync_service, "ssh_session", fake_session)
+    monkeypatch.setattr(output_sync_service, "get_ssh_pool", lambda: FakePool())
+    monkeypatch.setattr(output_sync_service, "publish", lambda event, data: None)
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    syncer = LocalSyncer(
+        local_dir=str(tmp_path / "output"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        workers=4,
+    )
+    return syncer, remote
+
+
+def test_sync_transfers_new_files_and_saves_manifest_once(tmp_path, monkeypatch):
+    syncer, remote = make_syncer(tmp_path, monkeypatch)
+    for i in range(5):
+        (remote / f"song {i}.wav").write_bytes(b"x" * (i + 1))
+    stats = syncer.sync(str(remote))
+    assert (stats["transferred"], stats["skipped"], stats["failed"]) == (5, 0, 0)
+    assert syncer.saves == 1
+    assert sorted(os.listdir(tmp_path / "output")) == [
+        f"song_{i}.wav" for i in range(5)
+    ]
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["song_4.wav"]["size"] == 5
+
+    # 바뀐 파일이 없으면 전송/저장하지 않음
+    stats = syncer.sync(str(remote))
+    assert (stats["transferred"], stats["skipped"]) == (0, 5)
+    assert syncer.saves == 1
+
+    (remote / "song 0.wav").write_bytes(b"changed")
+    stats = syncer.sync(str(remote))
+    assert stats["transferred"] == 1
+    assert (tmp_path / "output" / "song_0.wav").read_bytes() == b"changed"
+
+
+def test_failed_transfer_keeps_other_files(tmp_path, monkeypatch):
+    syncer, remote = make_syncer(tmp_path, monkeypatch)
+    (remote / "good.wav").write_bytes(b"good")
+    (remote / "bad.wav").write_bytes(b"bad")
+    listed = syncer.list_remote(None, str(remote))
+    # 조회 후 전송 전에 크기가 바뀐 파일은 크기 불일치로 실패
+    monkeypatch.setattr(
+        syncer,
+        "list_remote",
+        lambda ssh, remote_dir, files=None: {
+            path: ((size + 1) if path.endswith("bad.wav") else size, mtime)
+            for path, (size, mtime) in listed.items()
+        },
+    )
+    stats = syncer.sync(str(remote))
+    assert (stats["transferred"], stats["failed"]) == (1, 1)
+    assert os.listdir(tmp_path / "output") == ["good.wav"]
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert list(manifest) == ["good.wav"]
@@ -0,0 +1,70 @@
+import itertools
+from services import pipeline_service
+from services.pipeline_service import (
+    sbatch_command,
+    submit_conversion_jobs,
+    get_segment_settings,
+    workspace_dir,
+)
+
+
+def fake_submit(monkeypatch):
+    commands = []
+    ids = itertools.count(100)
+
+    def submit_job(ssh, command):
+        commands.append(command)
+        return str(next(ids))
+
+    monkeypatch.setattr(pipeline_service, "submit_job", submit_job)
+    return commands
+
+
+def test_sbatch_command_options():
+    command = sbatch_command(
+        "/work",
+        "separate.sh",
+        "'IU'",
+        dependency="aftercorr:1",
+        array_size=3,
+        array_start=2,
+        options=["--partition=cpu"],
+    )
+    assert command.startswith("cd /work && ")
+    assert command.endswith(
+        "sbatch --partition=cpu --array=2-4 --dependency=aftercorr:1 "
+        f"{pipeline_service.REMOTE_RUN_DIR}/separate.sh 'IU'"
+    )
+
+
+def test_per_track_jobs_fused(monkeypatch):
+    monkeypatch.delenv("CPU_STAGE_PLACEMENT", raising=False)
+    commands = fake_submit(monkeypatch)
+    workspace = workspace_dir("job1")
+    jobs = submit_conversion_jobs(None, "IU", track_count=4, workspace=workspace)
+    assert jobs == {"separate": "100", "batch_infer": "101", "combine": "101"}
+    assert len(commands) == 2
+    assert all("--array=0-3" in c for c in commands)
+    assert all(f"VCSTREAM_WORKSPACE={workspace}" in c for c in commands)
+    assert "--dependency=aftercorr:100" in commands[1]
+    assert commands[1].endswith("batch_infer.sh 'IU' --combine")
+
+
+def test_batch_jobs_on_cpu_partition(monkeypatch):
+    monkeypatch.setenv("CPU_STAGE_PLACEMENT", "cpu_partition")
+    monkeypatch.setenv("SLURM_CPU_PARTITION", "small")
+    commands = fake_submit(monkeypatch)
+    jobs = submit_conversion_jobs(None, "IU")
+    assert jobs == {"separate": "100", "batch_infer": "101", "combine": "102"}
+    assert not any("--array" in c or "VCSTREAM_WORKSPACE" in c for c in commands)
+    assert "--dependency=afterok:100" in commands[1]
+    assert "--partition=small" in commands[2]
+    assert "--dependency=afterok:101" in commands[2]
+
+
+def test_segment_overlap_is_clamped(monkeypatch):
+    monkeypatch.setenv("SEGMENT_SECONDS", "8")
+    monkeypatch.setenv("SEGMENT_OVERLAP_SECONDS", "6")
+    assert get_segment_settings() == (8.0, 4.0)
+    monkeypatch.setenv("SEGMENT_OVERLAP_SECONDS", "-1")
+    assert get_segment_settings() == (8.0, 0.0)
@@ -0,0 +1,91 @@
+import time
+import threading
+from services.playback_scheduler_service import PlaybackPollScheduler
+
+PLAYING = {
+    "is_playing": True,
+    "context": {"uri": "spotify:playlist:abc"},
+    "item": {"id": "t1"},
+}
+
+
+def wait_until(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_slow_fetch_does_not_delay_other_users():
+    release = threading.Event()
+
+    def fetch(access_token):
+        if access_token == "slow":
+            release.wait(3)
+        return 200, {"is_playing": False}
+
+    scheduler = PlaybackPollScheduler(
+        min_interval=0.02, active_max_interval=0.02, idle_max_interval=0.02, workers=4
+    )
+    scheduler.fetch = fetch
+    scheduler.register("slow", "slow", "IU", lambda *args: None)
+    scheduler.register("fast", "fast", "IU", lambda *args: None)
+    try:
+        assert wait_until(lambda: scheduler.status()["fast"]["polls"] >= 5)
+        # 느린 사용자는 조회가 끝나지 않았으므로 중복 조회 없음
+        assert scheduler.status()["slow"]["polls"] == 0
+    finally:
+        release.set()
+        scheduler.unregister("slow")
+        scheduler.unregister("fast")
+
+
+def test_rate_limited_user_waits_for_retry_after():
+    def fetch(access_token):
+        if access_token == "limited":
+            return 429, None
+        return 200, {"is_playing": False}
+
+    scheduler = PlaybackPollScheduler(
+        min_interval=0.02,
+        active_max_interval=0.02,
+        idle_max_interval=0.02,
+        fetch=fetch,
+        blocked_for=lambda token: 0.5 if token == "limited" else 0.0,
+    )
+    scheduler.register("limited", "limited", "IU", lambda *args: None)
+    scheduler.register("other", "other", "IU", lambda *args: None)
+    try:
+        assert wait_until(lambda: scheduler.status()["other"]["polls"] >= 5)
+        status = scheduler.status()["limited"]
+        assert status["polls"] == 1 and status["status"] == "rate_limited"
+    finally:
+        scheduler.unregister("limited")
+        scheduler.unregister("other")
+
+
+def test_playlist_change_triggers_conversion_once():
+    triggered = []
+    scheduler = PlaybackPollScheduler(
+        min_interval=0.02,
+        active_max_interval=0.02,
+        fetch=lambda token: (200, PLAYING),
+    )
+    scheduler.register("user", "token", "IU", lambda *args: triggered.append(args))
+    try:
+        assert wait_until(lambda: scheduler.status()["user"]["polls"] >= 5)
+        assert triggered == [("user", "abc", "token", "IU")]
+    finally:
+        scheduler.unregister("user")
+
+
+def test_expired_token_stops_polling():
+    scheduler = PlaybackPollScheduler(
+        min_interval=0.02, fetch=lambda token: (401, None)
+    )
+    scheduler.register("user", "token", "IU", lambda *args: None)
+    assert wait_until(lambda: scheduler.status()["user"]["status"] == "token_expired")
+    time.sleep(0.1)
+    assert scheduler.status()["user"]["polls"] == 1
@@ -0,0 +1,46 @@
+import json
+from services import singer_registry_service
+from services.singer_registry_service import SingerRegistry
+
+
+def test_changes_are_written_through(tmp_path, monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        singer_registry_service, "publish", lambda event, data: events.append(data)
+    )
+    path = tmp_path / "selected_singer.json"
+    registry = SingerRegistry(str(path))
+    assert registry.add("IU")
+    assert not registry.add("IU")
+    assert registry.add("Taeyeon")
+    assert registry.set_status(["IU", "Taeyeon", "Unknown"], "completed") == 2
+    assert registry.set_status(["IU"], "completed") == 0
+    assert registry.update("IU", train_job_id="123")
+    assert registry.remove("Taeyeon")
+    assert not registry.remove("Taeyeon")
+
+    expected = [{"name": "IU", "status": "completed", "train_job_id": "123"}]
+    assert json.loads(path.read_text(encoding="utf-8")) == expected
+    assert SingerRegistry(str(path)).list() == expected
+    assert [e["status"] for e in events] == [
+        "training",
+        "training",
+        "completed",
+        "completed",
+        "removed",
+    ]
+
+
+def test_list_returns_copies(tmp_path, monkeypatch):
+    monkeypatch.setattr(singer_registry_service, "publish", lambda event, data: None)
+    registry = SingerRegistry(str(tmp_path / "selected_singer.json"))
+    registry.add("IU")
+    registry.list()[0]["status"] = "tampered"
+    registry.get("IU")["status"] = "tampered"
+    assert registry.get("IU")["status"] == "training"
+
+
+def test_broken_file_starts_empty(tmp_path):
+    path = tmp_path / "selected_singer.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert SingerRegistry(str(path)).list() == []
@@ -0,0 +1,38 @@
+import time
+from services.slurm_tracker_service import SlurmJobTracker, UNKNOWN_STATE
+
+
+class FakeTracker(SlurmJobTracker):
+    """
+    SSH 대신 polls 목록의 결과를 차례로 반환 (마지막 결과는 계속 반복)
+    """
+
+    def __init__(self, polls, **kwargs):
+        super().__init__(**kwargs)
+        self.polls = list(polls)
+
+    def _poll(self, job_ids):
+        states = self.polls.pop(0) if len(self.polls) > 1 else self.polls[0]
+        return {job_id: state for job_id, state in states.items() if job_id in job_ids}
+
+
+def test_missing_job_resolves_unknown_after_timeout():
+    tracker = FakeTracker(
+        [{}], min_interval=0.05, max_interval=0.05, unknown_timeout=0.3
+    )
+    changes = []
+    future = tracker.watch("1", on_change=lambda *args: changes.append(args))
+    assert future.result(timeout=3) == UNKNOWN_STATE
+    assert "1" not in tracker._jobs
+    time.sleep(0.1)
+    assert changes == [("1", None, UNKNOWN_STATE)]
+
+
+def test_seen_job_is_not_timed_out():
+    # RUNNING으로 보이는 동안은 timeout이 지나도 종료하지 않음
+    polls = [{"1": "RUNNING"}] * 10 + [{"1": "COMPLETED"}]
+    tracker = FakeTracker(
+        polls, min_interval=0.05, max_interval=0.05, unknown_timeout=0.2
+    )
+    future = tracker.watch("1")
+    assert future.result(timeout=3) == "COMPLETED"
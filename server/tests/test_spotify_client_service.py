@@ -0,0 +1,93 @@
+import time
+from services.spotify_client_service import SpotifyClient, endpoint_label
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data or {}
+        self.headers = headers or {}
+        self.text = ""
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        token = headers["Authorization"].split()[-1]
+        self.calls.append((url, token))
+        return self.handler(url, token, params)
+
+
+def make_client(handler):
+    client = SpotifyClient(api_url="http://spotify.test/v1")
+    client._session = FakeSession(handler)
+    return client
+
+
+def test_endpoint_label_replaces_ids():
+    assert (
+        endpoint_label("https://api.spotify.com/v1/playlists/abc/tracks?offset=100")
+        == "/playlists/{id}/tracks"
+    )
+
+
+def test_rate_limit_is_per_token():
+    def handler(url, token, params):
+        if token == "limited":
+            return FakeResponse(429, headers={"Retry-After": "30"})
+        return FakeResponse(200, {"ok": True})
+
+    client = make_client(handler)
+    assert client.get("/me/player", "limited", retries=0).status_code == 429
+    assert client.blocked_for("limited") > 25
+    # 다른 토큰은 기다리지 않음
+    started = time.monotonic()
+    assert client.get("/me/player", "other").status_code == 200
+    assert time.monotonic() - started < 1
+    assert client.blocked_for("other") == 0
+    assert client.stats()["rate_limited"] == 1
+
+
+def test_retry_after_429():
+    responses = [FakeResponse(429, headers={"Retry-After": "0.05"})]
+
+    def handler(url, token, params):
+        return responses.pop(0) if responses else FakeResponse(200, {"ok": True})
+
+    client = make_client(handler)
+    assert client.get_json("/me/player", "token") == {"ok": True}
+    assert len(client._session.calls) == 2
+
+
+def test_playlist_tracks_cached_by_snapshot():
+    snapshot = {"id": "s1"}
+
+    def handler(url, token, params):
+        if url.endswith("/playlists/p1"):
+            return FakeResponse(200, {"snapshot_id": snapshot["id"]})
+        return FakeResponse(
+            200,
+            {
+                "items": [
+                    {"track": {"id": "t1", "name": "Song", "artists": [{"name": "A"}]}}
+                ],
+                "next": None,
+            },
+        )
+
+    client = make_client(handler)
+    expected = [{"title": "Song", "artists": "A", "id": "t1"}]
+    assert client.get_playlist_tracks("p1", "token") == expected
+    assert client.get_playlist_tracks("p1", "token") == expected
+    # 두 번째는 snapshot_id 조회 한 번으로 끝남
+    assert len(client._session.calls) == 3
+    snapshot["id"] = "s2"
+    client.get_playlist_tracks("p1", "token")
+    assert len(client._session.calls) == 5
+    assert client.stats()["playlist_cache_hits"] == 1
@@ -0,0 +1,59 @@
+import io
+import threading
+from services import spotify_hijack_service as hijack
+
+
+class FakeSFTP:
+    def __init__(self):
+        self.files = {}
+
+    def open(self, path, mode):
+        sftp = self
+
+        class Handle(io.StringIO):
+            def close(self):
+                sftp.files[path] = self.getvalue()
+                super().close()
+
+        return Handle()
+
+
+class FakePool:
+    def __init__(self):
+        self.sftp = FakeSFTP()
+
+    def get_sftp(self, ssh):
+        return self.sftp
+
+
+def test_same_file_name_is_downloaded_once(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_download(ssh, track, output_dir):
+        with lock:
+            calls.append(hijack.safe_track_name(track))
+        return {
+            "title": track["title"],
+            "artists": track["artists"],
+            "path": f"{output_dir}/{hijack.safe_track_name(track)}.m4a",
+            "ok": True,
+            "source": None,
+        }
+
+    monkeypatch.setattr(hijack, "_download_track", fake_download)
+    tracks = [
+        {"title": "A/B", "artists": "X"},
+        {"title": "Song", "artists": "Y"},
+        {"title": "A_B", "artists": "X"},  # safe_track_name이 첫 곡과 같음
+        {"title": "Song", "artists": "Y"},
+    ]
+    results = hijack.download_tracks_concurrently(None, tracks, "/in", 4)
+    assert sorted(calls) == ["A_B - X", "Song - Y"]
+    assert [r["title"] for r in results] == ["A/B", "Song", "A_B", "Song"]
+    assert results[0]["path"] == results[2]["path"] == "/in/A_B - X.m4a"
+
+    pool = FakePool()
+    monkeypatch.setattr(hijack, "get_ssh_pool", lambda: pool)
+    hijack.write_download_manifest(None, "/in", results)
+    assert pool.sftp.files["/in/tracks.txt"] == "A_B - X\nSong - Y\n"
@@ -0,0 +1,75 @@
+import threading
+import pytest
+from services.ssh_service import SSHConnectionPool
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+        self.stall = None  # 설정하면 send_ignore가 이 Event를 기다림 (멈춘 연결)
+
+    def is_active(self):
+        return self.active
+
+    def send_ignore(self):
+        if self.stall is not None:
+            self.stall.wait()
+
+
+class FakeSSH:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+
+
+class FakePool(SSHConnectionPool):
+    def _new_client(self):
+        return FakeSSH()
+
+
+def test_released_connection_is_reused():
+    pool = FakePool(max_size=2)
+    ssh = pool.acquire()
+    pool.release(ssh)
+    assert pool.acquire() is ssh
+    assert pool.stats()["total"] == 1
+
+
+def test_broken_idle_connection_is_replaced():
+    pool = FakePool(max_size=1)
+    ssh = pool.acquire()
+    pool.release(ssh)
+    ssh.transport.active = False
+    other = pool.acquire()
+    assert other is not ssh and ssh.closed
+    assert pool.stats()["total"] == 1
+
+
+def test_acquire_times_out_when_pool_is_full():
+    pool = FakePool(max_size=1, acquire_timeout=0.1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+
+def test_stalled_health_check_does_not_block_pool():
+    pool = FakePool(max_size=2, acquire_timeout=1)
+    stalled = pool.acquire()
+    stalled.transport.stall = threading.Event()
+    releasing = threading.Thread(target=pool.release, args=(stalled,))
+    releasing.start()
+    try:
+        # 반납 중인 연결의 health check가 멈춰 있어도 다른 대여/반납은 진행
+        other = pool.acquire()
+        pool.release(other)
+        assert pool.stats()["idle"] == 1
+    finally:
+        stalled.transport.stall.set()
+        releasing.join(timeout=1)
+    assert pool.stats() == {"total": 2, "idle": 2, "max_size": 2}